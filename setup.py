@@ -17,6 +17,7 @@ setup(
     ],
     python_requires=">=3.6",
     install_requires=[
+        "numpy",
         "pandas",
         "tqdm",
         "networkx>=3.0",
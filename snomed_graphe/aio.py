@@ -0,0 +1,259 @@
+import asyncio
+import snomed_graphe.component as sct
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from snomed_graphe.graphe import SnomedGraph
+from snomed_graphe.sctid import SCTID
+from typing import Any, Dict, Iterable, List, Optional, Self, Tuple, Union
+
+# Graphe partagé par les processus de requête (initialisé par `_init_worker`)
+_WORKER: Dict[str, Any] = {}
+
+
+class _Flight():
+    """
+    Une requête en cours, partagée par les appels identiques qui l'attendent.
+    """
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.waiters = 0
+
+
+class AsyncSnomedGraph():
+    """
+    Une façade asyncio d'un SnomedGraph, pour l'interroger depuis une boucle d'événements
+    (FastAPI, aiohttp, ...) sans la bloquer.
+
+    Les requêtes coûteuses (parcours, chemins, recherches) sont exécutées dans un pool de
+    threads ou de processus. Les appels identiques simultanés sont fusionnés : une seule
+    exécution, dont le résultat est partagé (single-flight). Un appel annulé ou expiré
+    (`timeout`) ne concerne que son appelant ; l'exécution n'est abandonnée que si plus aucun
+    appel ne l'attend, et seulement si elle n'a pas commencé. Les accès rapides
+    (`get_concept_details`, `get_full_concept`) restent exécutés directement dans la boucle.
+    """
+    def __init__(self, graph: SnomedGraph, executor: Union[str, Executor] = "thread",
+                 max_workers: Optional[int] = None, timeout: Optional[float] = None) -> None:
+        """
+        Crée la façade.
+
+        Args:
+            graph: Graphe interrogé.
+            executor: Pool d'exécution des requêtes : "thread" (par défaut, partage le graphe
+                mais reste limité par le GIL), "process" (une copie du graphe par processus,
+                transmise une seule fois) ou un Executor existant, qui n'est alors pas fermé
+                par `close`.
+            max_workers: Nombre de threads ou de processus du pool créé.
+            timeout: Délai maximal par défaut d'une requête, en secondes (aucun si None).
+        """
+        self.graph = graph
+        self.timeout = timeout
+        self._owned = not isinstance(executor, Executor)
+        if executor == "thread":
+            executor = ThreadPoolExecutor(max_workers, thread_name_prefix="snomed_graphe")
+        elif executor == "process":
+            executor = ProcessPoolExecutor(max_workers, initializer=_init_worker,
+                                           initargs=(graph,))
+        elif not isinstance(executor, Executor):
+            raise ValueError("L'exécuteur ne peut être que 'thread', 'process' ou un Executor.")
+        self.executor = executor
+        self._processes = isinstance(executor, ProcessPoolExecutor)
+        self._flights: Dict[str, _Flight] = {}
+        self.calls = 0
+        self.merged = 0
+
+    def __repr__(self) -> str:
+        return f"AsyncSnomedGraph({self.graph!r} {len(self._flights)} requêtes en cours)"
+
+    def __contains__(self, item: SCTID) -> bool:
+        return item in self.graph
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Ferme le pool créé par la façade, en abandonnant les requêtes qui n'ont pas commencé.
+        """
+        if self._owned:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, method: str, args: Tuple = (), kwargs: Optional[Dict[str, Any]] = None,
+                  timeout: Optional[float] = None) -> Any:
+        """
+        Exécute une méthode du SnomedGraph dans le pool, en partageant l'exécution avec les
+        appels identiques en cours.
+
+        Args:
+            method: Nom de la méthode de SnomedGraph.
+            args: Arguments positionnels de la méthode.
+            kwargs: Arguments nommés de la méthode.
+            timeout: Délai maximal en secondes (délai par défaut de la façade si None).
+
+        Returns:
+            Résultat de la méthode.
+
+        Raises:
+            TimeoutError: Le délai est dépassé.
+            asyncio.CancelledError: L'appel est annulé.
+        """
+        if not callable(getattr(self.graph, method, None)) or method.startswith("_"):
+            raise ValueError(f"Méthode inconnue : {method}")
+        kwargs = kwargs or {}
+        key = repr((method, args, sorted(kwargs.items())))
+        timeout = self.timeout if timeout is None else timeout
+
+        self.calls += 1
+        flight = self._flights.get(key)
+        if flight is None:
+            if self._processes:
+                job = partial(_call, method, args, kwargs)
+            else:
+                job = partial(getattr(self.graph, method), *args, **kwargs)
+            flight = _Flight(asyncio.get_running_loop().run_in_executor(self.executor, job))
+            self._flights[key] = flight
+            flight.future.add_done_callback(partial(self._land, key, flight))
+        else:
+            self.merged += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight.future), timeout)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.future.done():
+                # Plus personne n'attend : la requête est abandonnée si elle n'a pas commencé
+                flight.future.cancel()
+                self._land(key, flight)
+
+    def _land(self, key: str, flight: _Flight, *args: Any) -> None:
+        """Retire une requête terminée ou abandonnée des requêtes en cours.
+
+        Args:
+            key: Clé des appels identiques.
+            flight: Requête terminée.
+        """
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if flight.future.done() and not flight.future.cancelled():
+            # L'erreur éventuelle est marquée comme lue, les appelants ayant pu abandonner
+            flight.future.exception()
+
+    ###############################
+    # Accès rapides, sans le pool #
+    ###############################
+    async def get_concept_details(self, sctid: SCTID) -> sct.ConceptDetails:
+        """
+        Version asynchrone de `SnomedGraph.get_concept_details`, exécutée directement.
+        """
+        return self.graph.get_concept_details(sctid)
+
+    async def get_full_concept(self, sctid: SCTID) -> sct.Concept:
+        """
+        Version asynchrone de `SnomedGraph.get_full_concept`, exécutée directement : parents,
+        enfants et relations ne sont calculés qu'au premier accès.
+        """
+        return self.graph.get_full_concept(sctid)
+
+    ###################################
+    # Requêtes exécutées dans le pool #
+    ###################################
+    async def get_full_concepts(self, sctids: Iterable[SCTID],
+                                timeout: Optional[float] = None) -> List[sct.Concept]:
+        """
+        Version asynchrone de `SnomedGraph.get_full_concepts`.
+        """
+        return await self.run("get_full_concepts", (list(sctids),), timeout=timeout)
+
+    async def get_parents(self, sctid: SCTID,
+                          timeout: Optional[float] = None) -> List[sct.ConceptDetails]:
+        """
+        Version asynchrone de `SnomedGraph.get_parents`.
+        """
+        return await self.run("get_parents", (sctid,), timeout=timeout)
+
+    async def get_children(self, sctid: SCTID,
+                           timeout: Optional[float] = None) -> List[sct.ConceptDetails]:
+        """
+        Version asynchrone de `SnomedGraph.get_children`.
+        """
+        return await self.run("get_children", (sctid,), timeout=timeout)
+
+    async def get_ancestors(self, sctid: SCTID, degree: int = 999999,
+                            timeout: Optional[float] = None) -> List[sct.ConceptDetails]:
+        """
+        Version asynchrone de `SnomedGraph.get_ancestors`.
+        """
+        return await self.run("get_ancestors", (sctid, degree), timeout=timeout)
+
+    async def get_descendants(self, sctid: SCTID, degree: int = 999999,
+                              timeout: Optional[float] = None) -> List[sct.ConceptDetails]:
+        """
+        Version asynchrone de `SnomedGraph.get_descendants`.
+        """
+        return await self.run("get_descendants", (sctid, degree), timeout=timeout)
+
+    async def get_neighbors(self, sctid: SCTID, degree: int = 1,
+                            timeout: Optional[float] = None) -> List[sct.ConceptDetails]:
+        """
+        Version asynchrone de `SnomedGraph.get_neighbors`.
+        """
+        return await self.run("get_neighbors", (sctid, degree), timeout=timeout)
+
+    async def path(self, src: SCTID, tgt: SCTID,
+                   timeout: Optional[float] = None) -> List[sct.ConceptDetails]:
+        """
+        Version asynchrone de `SnomedGraph.path`.
+        """
+        return await self.run("path", (src, tgt), timeout=timeout)
+
+    async def hierarchical_path(self, src: SCTID, tgt: SCTID,
+                                timeout: Optional[float] = None) -> List[sct.ConceptDetails]:
+        """
+        Version asynchrone de `SnomedGraph.hierarchical_path`.
+        """
+        return await self.run("hierarchical_path", (src, tgt), timeout=timeout)
+
+    async def hierarchical_path_to_root(self, sctid: SCTID, timeout: Optional[float] = None
+                                        ) -> List[sct.ConceptDetails]:
+        """
+        Version asynchrone de `SnomedGraph.hierarchical_path_to_root`.
+        """
+        return await self.run("hierarchical_path_to_root", (sctid,), timeout=timeout)
+
+    async def search_in_desc(self, term: str, timeout: Optional[float] = None,
+                             **filters: Any) -> List[str]:
+        """
+        Version asynchrone de `SnomedGraph.search_in_desc`, dont elle accepte les filtres.
+        """
+        return await self.run("search_in_desc", (term,), filters, timeout=timeout)
+
+    async def search_tokens(self, query: str, timeout: Optional[float] = None,
+                            **filters: Any) -> List[str]:
+        """
+        Version asynchrone de `SnomedGraph.search_tokens`, dont elle accepte les filtres.
+        """
+        return await self.run("search_tokens", (query,), filters, timeout=timeout)
+
+    async def ecl(self, expression: str, timeout: Optional[float] = None) -> List[str]:
+        """
+        Version asynchrone de `SnomedGraph.ecl`.
+        """
+        return await self.run("ecl", (expression,), timeout=timeout)
+
+
+def _init_worker(graph: SnomedGraph) -> None:
+    """
+    Initialise le graphe d'un processus de requête, transmis une seule fois par processus.
+    """
+    _WORKER["graph"] = graph
+
+
+def _call(method: str, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+    """
+    Exécute une méthode du graphe d'un processus de requête.
+    """
+    return getattr(_WORKER["graph"], method)(*args, **kwargs)
@@ -0,0 +1,171 @@
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+
+from bisect import bisect_left
+from snomed_graphe.text import find_words, fold
+from typing import Any, Dict, Generator, Iterable, List, Self, Tuple
+
+# Annotateur partagé par les processus d'annotation (initialisé par `_init_worker`)
+_WORKER: Dict[str, Any] = {}
+
+
+class Mention():
+    """
+    Une mention de concept(s) SNOMED CT dans un texte.
+    """
+    def __init__(self, start: int, end: int, text: str, concepts: List[Tuple[str, str]]) -> None:
+        """
+        Crée une mention.
+
+        Args:
+            start: Position du premier caractère de la mention dans le texte.
+            end: Position suivant le dernier caractère de la mention.
+            text: Texte de la mention.
+            concepts: Couples (SCTID, acceptabilité) des descriptions correspondant à la mention.
+        """
+        self.start = start
+        self.end = end
+        self.text = text
+        self.concepts = concepts
+
+    def __eq__(self, other) -> bool:
+        return ((self.start, self.end, self.text, self.concepts)
+                == (other.start, other.end, other.text, other.concepts))
+
+    def __repr__(self) -> str:
+        return f"Mention({self.start}:{self.end} |{self.text}| {self.concepts})"
+
+
+class Annotator():
+    """
+    Un annotateur repérant les mentions de concepts dans des textes libres à partir d'un
+    dictionnaire de descriptions.
+
+    Les descriptions sont normalisées (`fold`, sans ponctuation) puis triées : à chaque mot du
+    texte, la suite de mots qui le suit est prolongée tant que des descriptions commencent par
+    elle, leur plage étant resserrée par dichotomie. La plus longue description trouvée est
+    retenue et l'analyse reprend après elle.
+    """
+    def __init__(self, keys: List[str], ptr: np.ndarray, concepts: np.ndarray,
+                 acceptability: np.ndarray) -> None:
+        """
+        Crée un annotateur à partir de tableaux déjà construits.
+
+        Args:
+            keys: Descriptions normalisées distinctes, triées.
+            ptr: Pointeurs des concepts de chaque description normalisée.
+            concepts: SCTID des concepts, regroupés par description normalisée.
+            acceptability: Acceptabilité de chaque description ("PREF" ou "ACCEPT").
+        """
+        self.keys = keys
+        self.ptr = ptr
+        self.concepts = concepts
+        self.acceptability = acceptability
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __repr__(self) -> str:
+        return f"Annotator({len(self.keys)} descriptions)"
+
+    @classmethod
+    def from_descriptions(cls, desc: pd.DataFrame) -> Self:
+        """
+        Construit l'annotateur d'une table de descriptions.
+
+        Args:
+            desc: DataFrame contenant les colonnes `conceptId`, `term` et `acceptability`.
+
+        Returns:
+            Un objet Annotator.
+        """
+        desc = desc.loc[desc.loc[:, "term"].notna()]
+        entries = pd.DataFrame({
+            "key": [fold(t, punctuation=False) for t in desc.loc[:, "term"]],
+            "conceptId": desc.loc[:, "conceptId"].to_numpy(dtype=object),
+            "acceptability": desc.loc[:, "acceptability"].astype(str).to_numpy(dtype=object)
+        })
+        entries = entries.loc[entries.loc[:, "key"] != ""].drop_duplicates()
+        entries = entries.sort_values(["key", "acceptability", "conceptId"],
+                                      ascending=[True, False, True], kind="stable")
+
+        codes, keys = pd.factorize(entries.loc[:, "key"], sort=True)
+        ptr = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(keys)), out=ptr[1:])
+        return cls(list(keys), ptr, entries.loc[:, "conceptId"].to_numpy(dtype=object),
+                   entries.loc[:, "acceptability"].to_numpy(dtype=object))
+
+    def annotate(self, text: str) -> List[Mention]:
+        """
+        Repère les mentions de concepts d'un texte, de gauche à droite, en préférant la plus
+        longue description possible.
+
+        Args:
+            text: Texte à annoter.
+
+        Returns:
+            Liste des mentions, dans l'ordre du texte.
+        """
+        words = list(find_words(text))
+        tokens = [fold(w.group()) for w in words]
+        keys = self.keys
+        mentions = []
+        i = 0
+        while i < len(tokens):
+            lo, hi = 0, len(keys)
+            best, best_end = -1, i
+            candidate = ""
+            for j in range(i, len(tokens)):
+                candidate = tokens[j] if j == i else f"{candidate} {tokens[j]}"
+                lo = bisect_left(keys, candidate, lo, hi)
+                hi = bisect_left(keys, candidate + "\U0010ffff", lo, hi)
+                if lo == hi:
+                    break
+                if keys[lo] == candidate:
+                    best, best_end = lo, j
+
+            if best < 0:
+                i += 1
+                continue
+            start, end = words[i].start(), words[best_end].end()
+            concepts = list(zip(self.concepts[self.ptr[best]:self.ptr[best + 1]],
+                                self.acceptability[self.ptr[best]:self.ptr[best + 1]]))
+            mentions.append(Mention(start, end, text[start:end], concepts))
+            i = best_end + 1
+        return mentions
+
+    def annotate_stream(self, texts: Iterable[str], processes: int = 1,
+                        chunk_size: int = 100) -> Generator[List[Mention], None, None]:
+        """
+        Annote des textes au fil de l'eau, dans leur ordre, éventuellement dans plusieurs
+        processus.
+
+        Args:
+            texts: Textes à annoter (éventuellement un générateur).
+            processes: Nombre de processus d'annotation.
+            chunk_size: Nombre de textes transmis à la fois à un processus.
+
+        Returns:
+            Générateur des mentions de chaque texte.
+        """
+        if processes == 1:
+            yield from map(self.annotate, texts)
+            return
+
+        with mp.Pool(processes, initializer=_init_worker, initargs=(self,)) as pool:
+            yield from pool.imap(_annotate, texts, chunksize=chunk_size)
+
+
+def _init_worker(annotator: Annotator) -> None:
+    """
+    Initialise l'annotateur d'un processus, transmis une seule fois par processus.
+    """
+    _WORKER.update(annotator=annotator)
+
+
+def _annotate(text: str) -> List[Mention]:
+    """
+    Annote un texte avec l'annotateur du processus.
+    """
+    return _WORKER["annotator"].annotate(text)
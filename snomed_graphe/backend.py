@@ -0,0 +1,465 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from snomed_graphe.csr import CSRGraph
+from snomed_graphe.memory import deep_nbytes, graph_nbytes
+from snomed_graphe.sctid import IS_A, SCTID, is_int_keyed, to_key
+from snomed_graphe.terms import NodeTerms, TermTable, compact_nodes
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Self, Tuple, Union
+
+
+class NetworkXBackend():
+    """
+    Stockage d'un graphe SNOMED CT dans un DiGraph NetworkX (moteur par défaut), accompagné de
+    sa copie non orientée pour le calcul des chemins.
+    """
+    name = "networkx"
+
+    def __init__(self, g: nx.DiGraph) -> None:
+        """
+        Crée le moteur d'un DiGraph.
+
+        Args:
+            g: Un DiGraph créé par `from_rf2` ou `from_serialized`.
+        """
+        self.g = g
+        self.undir = nx.to_undirected(g)
+        self._is_a = to_key(IS_A, is_int_keyed(g.nodes))
+
+    def __contains__(self, sctid: SCTID) -> bool:
+        return sctid in self.g
+
+    def __len__(self) -> int:
+        return self.g.number_of_nodes()
+
+    def number_of_edges(self) -> int:
+        return self.g.number_of_edges()
+
+    def nodes(self) -> Iterable[SCTID]:
+        """
+        Renvoie les SCTID des concepts, dans l'ordre du graphe.
+        """
+        return self.g.nodes
+
+    def node(self, sctid: SCTID) -> Mapping[str, Any]:
+        """
+        Renvoie les attributs d'un concept (FSN, PT, SYN).
+        """
+        return self.g.nodes[sctid]
+
+    def node_items(self) -> Iterable[Tuple[SCTID, Mapping[str, Any]]]:
+        """
+        Renvoie les couples (SCTID, attributs) des concepts, dans l'ordre du graphe.
+        """
+        return self.g.nodes(data=True)
+
+    def successors(self, sctid: SCTID) -> Iterator[Tuple[SCTID, Any, SCTID]]:
+        """
+        Renvoie les relations sortantes d'un concept.
+
+        Args:
+            sctid: Identifiant valide d'un concept SNOMED CT.
+
+        Returns:
+            Itérateur des triplets (cible, groupe, attribut).
+        """
+        return ((t, d["group"], d["attribute"]) for t, d in self.g.succ[sctid].items())
+
+    def predecessors(self, sctid: SCTID) -> Iterator[Tuple[SCTID, Any, SCTID]]:
+        """
+        Renvoie les relations entrantes d'un concept.
+
+        Args:
+            sctid: Identifiant valide d'un concept SNOMED CT.
+
+        Returns:
+            Itérateur des triplets (source, groupe, attribut).
+        """
+        return ((s, d["group"], d["attribute"]) for s, d in self.g.pred[sctid].items())
+
+    def ancestors(self, sctid: SCTID, degree: int) -> List[SCTID]:
+        """
+        Renvoie les ancêtres d'un concept jusqu'à `degree` niveaux.
+        """
+        ancestors = nx.single_source_dijkstra_path_length(
+            self.g, sctid, degree, lambda s, t, a: 1 if a["attribute"] == self._is_a else None
+        )
+        return [t for t in ancestors.keys() if ancestors[t] > 0]
+
+    def descendants(self, sctid: SCTID, degree: int) -> List[SCTID]:
+        """
+        Renvoie les descendants d'un concept jusqu'à `degree` niveaux, en remontant les seules
+        relations "Is a" (comme `CSRBackend.descendants`).
+        """
+        descendants = nx.single_source_dijkstra_path_length(
+            self.g.reverse(copy=False), sctid, degree,
+            lambda s, t, a: 1 if a["attribute"] == self._is_a else None
+        )
+        return [t for t in descendants.keys() if descendants[t] > 0]
+
+    def neighbors(self, sctid: SCTID, degree: int) -> List[SCTID]:
+        """
+        Renvoie le concept et ses voisins hiérarchiques jusqu'à `degree` niveaux.
+        """
+        return list(nx.single_source_dijkstra_path_length(
+            self.undir, sctid, degree, lambda s, t, a: 1 if a["attribute"] == self._is_a else None
+        ).keys())
+
+    def shortest_path(self, src: SCTID, tgt: SCTID, hierarchical: bool) -> List[SCTID]:
+        """
+        Renvoie le plus court chemin non orienté entre deux concepts, par l'algorithme de
+        Dijkstra.
+
+        Args:
+            src: Identifiant valide d'un concept SNOMED CT source.
+            tgt: Identifiant valide d'un concept SNOMED CT cible.
+            hierarchical: Indique si seules les relations "Is a" sont empruntables.
+
+        Returns:
+            Liste des SCTID du chemin.
+        """
+        if hierarchical:
+            return nx.dijkstra_path(
+                self.undir, src, tgt, lambda s, t, a: 1 if a["attribute"] == self._is_a else None)
+        return nx.dijkstra_path(self.undir, src, tgt)
+
+    def edges_frame(self) -> pd.DataFrame:
+        """
+        Renvoie la liste des relations, une ligne par relation (voir `nx.to_pandas_edgelist`).
+        """
+        return nx.to_pandas_edgelist(self.g)
+
+    def subgraph(self, nodes: Iterable[SCTID]) -> Self:
+        """
+        Renvoie le moteur du sous-graphe induit par des concepts.
+        """
+        return type(self)(self.g.subgraph(nodes).copy())
+
+    def compact_terms(self) -> TermTable:
+        """
+        Regroupe les termes des concepts dans une TermTable (voir `compact_nodes`).
+        """
+        return compact_nodes(self.g._node)
+
+    def memory_usage(self, sample: Optional[int],
+                     seen: Dict[int, Any]) -> Dict[Tuple[str, str], int]:
+        """
+        Estime la mémoire occupée par le DiGraph et sa copie non orientée (voir
+        `graph_nbytes`), la TermTable des concepts étant comptée à part après `compact_terms`.
+
+        Args:
+            sample: Nombre de concepts échantillonnés (tous si None).
+            seen: Objets déjà comptés, par identifiant.
+
+        Returns:
+            Taille en octets de chaque partie, par couple (composant, partie).
+        """
+        g = graph_nbytes(self.g, sample)
+        parts = {("nodes", "attributes"): g["nodes"], ("edges", "adjacency"): g["adjacency"],
+                 ("edges", "attributes"): g["edges"]}
+        first = next(iter(self.g._node.values()), None)
+        if isinstance(first, NodeTerms):
+            parts[("nodes", "terms")] = first.table.nbytes + deep_nbytes(first.table.extra,
+                                                                         sample, seen)
+
+        # `nx.to_undirected` renvoie une vue partageant les dictionnaires de `g`
+        if getattr(self.undir, "_graph", None) is self.g:
+            parts[("undirected", "view")] = deep_nbytes(self.undir, sample, seen)
+        else:
+            undir = graph_nbytes(self.undir, sample)
+            parts.update({("undirected", "attributes"): undir["nodes"],
+                          ("undirected", "adjacency"): undir["adjacency"],
+                          ("undirected", "edges"): undir["edges"]})
+        return parts
+
+    def to_csr(self) -> CSRGraph:
+        """
+        Construit la représentation CSR du graphe.
+        """
+        return CSRGraph.from_networkx(self.g)
+
+    def to_networkx(self) -> nx.DiGraph:
+        """
+        Renvoie le DiGraph du moteur lui-même.
+        """
+        return self.g
+
+
+class CSRBackend():
+    """
+    Stockage d'un graphe SNOMED CT sous forme de tableaux NumPy : relations, attributs et
+    groupes relationnels dans une représentation CSR (et sa vue CSC pour les relations
+    entrantes), termes des concepts dans une TermTable. Les parcours de la hiérarchie et les
+    calculs de chemins se font par des parcours en largeur vectorisés.
+
+    Seules les propriétés `attribute` et `group` des relations sont conservées ; `src` et `tgt`
+    sont reconstituées par `to_networkx`.
+    """
+    name = "csr"
+
+    def __init__(self, csr: CSRGraph, terms: TermTable) -> None:
+        """
+        Crée le moteur d'une représentation CSR et de la table des termes de ses concepts.
+
+        Args:
+            csr: Représentation CSR du graphe.
+            terms: Attributs des concepts, une ligne par concept dans l'ordre de `csr`.
+        """
+        self.csr = csr
+        self.terms = terms
+        self._sctids = csr.sctids.tolist()
+        self._rows = dict(zip(self._sctids, range(len(self._sctids))))
+        self._attributes = csr.attributes.tolist()
+        # Groupes relationnels sous la forme des clés du graphe (entiers ou chaînes)
+        self._group = int if csr.int_keys else str
+        # Vues sur les tableaux : lecture d'entiers Python, plus rapide que l'indexation NumPy
+        self._indptr = memoryview(csr.indptr)
+        self._indices = memoryview(csr.indices)
+        self._in_indptr = memoryview(csr.in_indptr)
+        self._in_edges = memoryview(csr.in_edges)
+        self._sources = memoryview(csr.sources)
+        self._edge_type = memoryview(csr.edge_type)
+        self._groups = memoryview(csr.group)
+
+    @classmethod
+    def from_networkx(cls, g: nx.DiGraph) -> Self:
+        """
+        Construit le moteur d'un DiGraph créé par `from_rf2` ou `from_serialized`.
+
+        Args:
+            g: DiGraph dont les arcs portent les propriétés `attribute` et `group`.
+
+        Returns:
+            Un objet CSRBackend.
+        """
+        csr = CSRGraph.from_networkx(g)
+        return cls(csr, TermTable.from_nodes(g.nodes[n] for n in csr.sctids))
+
+    @classmethod
+    def from_frames(cls, nodes: pd.DataFrame, relations: pd.DataFrame) -> Self:
+        """
+        Construit le moteur directement à partir des tables des concepts et des relations, sans
+        passer par un DiGraph. Les concepts sont ordonnés et les relations en double
+        dédoublonnées comme le ferait `nx.from_pandas_edgelist` suivi de `add_nodes_from`.
+
+        Args:
+            nodes: Attributs des concepts, indexés par SCTID.
+            relations: Relations, colonnes `src`, `tgt`, `group` et `attribute`.
+
+        Returns:
+            Un objet CSRBackend.
+        """
+        relations = relations.drop_duplicates(["src", "tgt"], keep="last")
+        ends = np.column_stack([relations.loc[:, "src"].to_numpy(dtype=object),
+                                relations.loc[:, "tgt"].to_numpy(dtype=object)]).ravel()
+        order = pd.Index(pd.unique(ends))
+        order = order.append(nodes.index[~nodes.index.isin(order)])
+        sctids = np.empty(len(order), dtype=object)
+        sctids[:] = order.tolist()
+
+        csr = CSRGraph.from_edges(sctids, relations.loc[:, "src"], relations.loc[:, "tgt"],
+                                  relations.loc[:, "attribute"], relations.loc[:, "group"])
+        records = dict(zip(nodes.index, nodes.to_dict("records")))
+        return cls(csr, TermTable.from_nodes(records.get(n, {}) for n in sctids))
+
+    def __contains__(self, sctid: SCTID) -> bool:
+        return sctid in self._rows
+
+    def __len__(self) -> int:
+        return len(self._sctids)
+
+    def number_of_edges(self) -> int:
+        return len(self.csr.indices)
+
+    def nodes(self) -> Iterable[SCTID]:
+        """
+        Renvoie les SCTID des concepts, dans l'ordre des indices de `csr`.
+        """
+        return self._sctids
+
+    def node(self, sctid: SCTID) -> Mapping[str, Any]:
+        """
+        Renvoie les attributs d'un concept (FSN, PT, SYN), lus dans la table des termes.
+        """
+        return NodeTerms(self.terms, self._rows[sctid])
+
+    def node_items(self) -> Iterable[Tuple[SCTID, Mapping[str, Any]]]:
+        """
+        Renvoie les couples (SCTID, attributs) des concepts, dans l'ordre des indices de `csr`.
+        """
+        return ((n, NodeTerms(self.terms, row)) for row, n in enumerate(self._sctids))
+
+    def successors(self, sctid: SCTID) -> Iterator[Tuple[SCTID, Any, SCTID]]:
+        """
+        Renvoie les relations sortantes d'un concept.
+
+        Args:
+            sctid: Identifiant valide d'un concept SNOMED CT.
+
+        Returns:
+            Itérateur des triplets (cible, groupe, attribut).
+        """
+        row = self._rows[sctid]
+        sctids, indices, group = self._sctids, self._indices, self._group
+        return ((sctids[indices[e]], group(self._groups[e]), self._attributes[self._edge_type[e]])
+                for e in range(self._indptr[row], self._indptr[row + 1]))
+
+    def predecessors(self, sctid: SCTID) -> Iterator[Tuple[SCTID, Any, SCTID]]:
+        """
+        Renvoie les relations entrantes d'un concept, par la vue CSC.
+
+        Args:
+            sctid: Identifiant valide d'un concept SNOMED CT.
+
+        Returns:
+            Itérateur des triplets (source, groupe, attribut).
+        """
+        row = self._rows[sctid]
+        sctids, sources, group = self._sctids, self._sources, self._group
+        return ((sctids[sources[e]], group(self._groups[e]), self._attributes[self._edge_type[e]])
+                for e in (self._in_edges[i]
+                          for i in range(self._in_indptr[row], self._in_indptr[row + 1])))
+
+    def _traverse(self, sctid: SCTID, direction: str, degree: int,
+                  include_self: bool) -> List[SCTID]:
+        """Parcourt les relations "Is a" depuis un concept (voir `CSRGraph.traverse`).
+
+        Returns
+            Liste des SCTID des concepts atteints.
+        """
+        row = self._rows[sctid]
+        reached = self.csr.traverse([row], direction, [IS_A], include_self, degree)
+        if not include_self:
+            reached = reached[reached != row]
+        return self.csr.sctids[reached].tolist()
+
+    def ancestors(self, sctid: SCTID, degree: int) -> List[SCTID]:
+        """
+        Renvoie les ancêtres d'un concept jusqu'à `degree` niveaux.
+        """
+        return self._traverse(sctid, "out", degree, False)
+
+    def descendants(self, sctid: SCTID, degree: int) -> List[SCTID]:
+        """
+        Renvoie les descendants d'un concept jusqu'à `degree` niveaux.
+        """
+        return self._traverse(sctid, "in", degree, False)
+
+    def neighbors(self, sctid: SCTID, degree: int) -> List[SCTID]:
+        """
+        Renvoie le concept et ses voisins hiérarchiques jusqu'à `degree` niveaux.
+        """
+        return self._traverse(sctid, "both", degree, True)
+
+    def shortest_path(self, src: SCTID, tgt: SCTID, hierarchical: bool) -> List[SCTID]:
+        """
+        Renvoie un plus court chemin non orienté entre deux concepts, par un parcours en
+        largeur (voir `CSRGraph.shortest_path`).
+
+        Args:
+            src: Identifiant valide d'un concept SNOMED CT source.
+            tgt: Identifiant valide d'un concept SNOMED CT cible.
+            hierarchical: Indique si seules les relations "Is a" sont empruntables.
+
+        Returns:
+            Liste des SCTID du chemin.
+        """
+        if src not in self._rows or tgt not in self._rows:
+            raise nx.NodeNotFound(f"Concept absent du graphe : {src if tgt in self else tgt}")
+        path = self.csr.shortest_path(self._rows[src], self._rows[tgt], "both",
+                                      [IS_A] if hierarchical else None)
+        if not len(path):
+            raise nx.NetworkXNoPath(f"Aucun chemin entre {src} et {tgt}.")
+        return self.csr.sctids[path].tolist()
+
+    def edges_frame(self) -> pd.DataFrame:
+        """
+        Renvoie la liste des relations, une ligne par relation, dans l'ordre de `csr`.
+        """
+        csr = self.csr
+        source, target = csr.sctids[csr.sources], csr.sctids[csr.indices]
+        return pd.DataFrame({"source": source, "target": target, "src": source, "tgt": target,
+                             "group": [self._group(g) for g in csr.group.tolist()],
+                             "attribute": csr.attributes[csr.edge_type]})
+
+    def subgraph(self, nodes: Iterable[SCTID]) -> Self:
+        """
+        Renvoie le moteur du sous-graphe induit par des concepts.
+        """
+        rows = np.unique([self._rows[n] for n in nodes if n in self._rows]).astype(np.int64)
+        return type(self)(self.csr.subgraph(rows),
+                          TermTable.from_nodes(NodeTerms(self.terms, r) for r in rows.tolist()))
+
+    def compact_terms(self) -> TermTable:
+        """
+        Renvoie la table des termes, les termes étant déjà regroupés.
+        """
+        return self.terms
+
+    def memory_usage(self, sample: Optional[int],
+                     seen: Dict[int, Any]) -> Dict[Tuple[str, str], int]:
+        """
+        Estime la mémoire occupée par les tableaux du moteur.
+
+        Args:
+            sample: Nombre d'éléments échantillonnés par conteneur d'objets Python (tous si
+                None).
+            seen: Objets déjà comptés, par identifiant.
+
+        Returns:
+            Taille en octets de chaque partie, par couple (composant, partie).
+        """
+        edges = deep_nbytes(self.csr, sample, seen)
+        return {("nodes", "terms"): self.terms.nbytes + deep_nbytes(self.terms.extra, sample,
+                                                                    seen),
+                ("nodes", "index"): deep_nbytes(self._rows, sample, seen)
+                + deep_nbytes(self._sctids, sample, seen),
+                ("edges", "arrays"): edges}
+
+    def to_csr(self) -> CSRGraph:
+        """
+        Renvoie la représentation CSR du moteur elle-même.
+        """
+        return self.csr
+
+    def to_networkx(self) -> nx.DiGraph:
+        """
+        Exporte le graphe dans un nouveau DiGraph, au format produit par `from_rf2` (propriétés
+        `src`, `tgt`, `group` et `attribute` des arcs).
+
+        Returns:
+            Un DiGraph indépendant du moteur.
+        """
+        g = nx.DiGraph()
+        g.add_nodes_from((n, dict(d)) for n, d in self.node_items())
+        edges = self.edges_frame()
+        g.add_edges_from((s, t, {"src": s, "tgt": t, "group": grp, "attribute": a})
+                         for s, t, grp, a in zip(edges.loc[:, "source"], edges.loc[:, "target"],
+                                                 edges.loc[:, "group"],
+                                                 edges.loc[:, "attribute"]))
+        return g
+
+
+def make_backend(g: Union[nx.DiGraph, NetworkXBackend, CSRBackend],
+                 backend: Optional[str] = None) -> Union[NetworkXBackend, CSRBackend]:
+    """
+    Renvoie le moteur de stockage d'un graphe.
+
+    Args:
+        g: DiGraph, ou moteur déjà construit.
+        backend: Moteur voulu : "networkx" ou "csr" (celui de `g` par défaut, "networkx" pour un
+            DiGraph).
+
+    Returns:
+        Un objet NetworkXBackend ou CSRBackend.
+    """
+    if backend not in [None, "networkx", "csr"]:
+        raise ValueError("Le moteur ne peut être que 'networkx' ou 'csr'.")
+    if isinstance(g, (NetworkXBackend, CSRBackend)):
+        if backend in [None, g.name]:
+            return g
+        g = g.to_networkx()
+    if backend == "csr":
+        return CSRBackend.from_networkx(g)
+    return NetworkXBackend(g)
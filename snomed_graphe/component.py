@@ -1,18 +1,38 @@
-from typing import Any, Dict, List, Union
+from typing import Any, Callable, Dict, List, NoReturn, Tuple, Union
 
 
-class ConceptDetails():
+class _Frozen():
+    """
+    Base des composants : attributs déclarés dans `__slots__` (pas de `__dict__` par instance)
+    et non modifiables après création, ce qui permet de partager une même instance.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> NoReturn:
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __delattr__(self, name: str) -> NoReturn:
+        raise AttributeError(f"{type(self).__name__} est immuable")
+
+    def __reduce__(self) -> Tuple[type, Tuple]:
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+
+class ConceptDetails(_Frozen):
     """
     Une classe pour représenter les détails essentiels d'un concept SNOMED CT
     """
+    __slots__ = ("sctid", "fsn", "pt_en", "pt_lang", "syn_en", "syn_lang")
+
     def __init__(self, sctid: int, fsn: str, pt_en: str, pt_lang: str,
                  syn_en: List[str], syn_lang: List[str]) -> None:
-        self.sctid = sctid
-        self.fsn = fsn
-        self.pt_en = pt_en
-        self.pt_lang = pt_lang
-        self.syn_en = syn_en
-        self.syn_lang = syn_lang
+        _set = object.__setattr__
+        _set(self, "sctid", sctid)
+        _set(self, "fsn", fsn)
+        _set(self, "pt_en", pt_en)
+        _set(self, "pt_lang", pt_lang)
+        _set(self, "syn_en", syn_en)
+        _set(self, "syn_lang", syn_lang)
 
     def __repr__(self) -> str:
         return f"{self.sctid} |{self.fsn}|"
@@ -28,33 +48,59 @@ class ConceptDetails():
         return self.fsn.split(" (")[-1].rstrip(")")
 
 
-class Relationship():
+class Relationship(_Frozen):
     """
     Une classe pour représenter une relation SNOMED CT
     """
+    __slots__ = ("src", "tgt", "group", "attribute")
+
     def __init__(self, src: ConceptDetails, tgt: Union[int, ConceptDetails], group: str,
                  attribute: ConceptDetails) -> None:
-        self.src = src
-        self.tgt = tgt
-        self.group = group
-        self.attribute = attribute
+        _set = object.__setattr__
+        _set(self, "src", src)
+        _set(self, "tgt", tgt)
+        _set(self, "group", group)
+        _set(self, "attribute", attribute)
 
     def __repr__(self) -> str:
         return f"--{self.attribute}--> {self.tgt}"
 
 
-class Concept():
+class Concept(_Frozen):
     """
     Une classe pour représenter un concept SNOMED CT.
+
+    Les parents, enfants et relations peuvent être donnés sous forme de fonctions sans argument :
+    ils ne sont alors calculés qu'au premier accès, puis conservés.
     """
-    def __init__(self, concept_details: ConceptDetails, parents: List[ConceptDetails],
-                 children: List[ConceptDetails],
-                 relationships: Dict[int, List[Relationship]], lang: str = "fr") -> None:
-        self.concept_details = concept_details
-        self.relationships = relationships
-        self.parents = parents
-        self.children = children
-        self.lang = lang
+    __slots__ = ("concept_details", "_parents", "_children", "_relationships", "lang")
+
+    def __init__(self, concept_details: ConceptDetails,
+                 parents: Union[List[ConceptDetails], Callable[[], List[ConceptDetails]]],
+                 children: Union[List[ConceptDetails], Callable[[], List[ConceptDetails]]],
+                 relationships: Union[Dict[int, List[Relationship]],
+                                      Callable[[], Dict[int, List[Relationship]]]],
+                 lang: str = "fr") -> None:
+        _set = object.__setattr__
+        _set(self, "concept_details", concept_details)
+        _set(self, "_relationships", relationships)
+        _set(self, "_parents", parents)
+        _set(self, "_children", children)
+        _set(self, "lang", lang)
+
+    def __dir__(self) -> List[str]:
+        return [a for a in super().__dir__() if not a.startswith("_") or a.startswith("__")]
+
+    def __reduce__(self) -> Tuple[type, Tuple]:
+        return type(self), (self.concept_details, self.parents, self.children,
+                            self.relationships, self.lang)
+
+    def _load(self, name: str) -> Any:
+        value = getattr(self, name)
+        if callable(value):
+            value = value()
+            object.__setattr__(self, name, value)
+        return value
 
     def __repr__(self) -> str:
         str_ = str(self.concept_details)
@@ -70,6 +116,18 @@ class Concept():
         str_ += "\n".join(f"{k}:\n   {v}\n" for k, v in self.relationships.items())
         return str_
 
+    @property
+    def parents(self) -> List[ConceptDetails]:
+        return self._load("_parents")
+
+    @property
+    def children(self) -> List[ConceptDetails]:
+        return self._load("_children")
+
+    @property
+    def relationships(self) -> Dict[int, List[Relationship]]:
+        return self._load("_relationships")
+
     @property
     def sctid(self) -> int:
         return self.concept_details.sctid
@@ -0,0 +1,468 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from snomed_graphe.sctid import is_int_keyed, to_keys
+from typing import Any, Dict, Iterable, Optional, Self, Tuple
+
+
+class CSRGraph():
+    """
+    Une représentation compacte d'un graphe SNOMED CT sous forme de tableaux NumPy (format CSR).
+
+    Les concepts sont numérotés de 0 à n-1 dans l'ordre des nœuds du graphe NetworkX et les
+    relations sont triées par concept source. Le type d'une relation est un code entier renvoyant
+    vers `attributes`, le tableau des SCTID des attributs.
+    """
+    def __init__(self, sctids: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                 edge_type: np.ndarray, group: np.ndarray, attributes: np.ndarray,
+                 features: Optional[pd.DataFrame] = None) -> None:
+        """
+        Crée une représentation CSR à partir de tableaux déjà construits.
+
+        Args:
+            sctids: SCTID des concepts, dans l'ordre des indices.
+            indptr: Pointeurs de début de ligne (taille n + 1).
+            indices: Indice du concept cible de chaque relation.
+            edge_type: Code de l'attribut de chaque relation.
+            group: Groupe relationnel de chaque relation.
+            attributes: SCTID des attributs, dans l'ordre des codes.
+            features: Caractéristiques des concepts, une ligne par concept dans l'ordre des
+                indices.
+        """
+        self.sctids = sctids
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_type = edge_type
+        self.group = group
+        self.attributes = attributes
+        self.features = features
+        self.sources = np.repeat(np.arange(len(sctids), dtype=indices.dtype), np.diff(indptr))
+
+        # Vue CSC : identifiants des relations triées par concept cible
+        self.in_edges = np.argsort(indices, kind="stable")
+        self.in_indptr = row_pointers(indices, len(sctids))
+        self.in_indices = self.sources[self.in_edges]
+
+        self.int_keys = is_int_keyed(sctids)
+        self._index = pd.Index(sctids)
+        self._attribute_index = pd.Index(attributes)
+        self._adjacency: Dict[Tuple, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.sctids)
+
+    def __repr__(self) -> str:
+        return f"CSRGraph({len(self.sctids)} concepts, {len(self.indices)} relations)"
+
+    @classmethod
+    def from_networkx(cls, g: nx.DiGraph) -> Self:
+        """
+        Construit la représentation CSR d'un DiGraph créé par `from_rf2` ou `from_serialized`.
+
+        Args:
+            g: DiGraph dont les arcs portent les propriétés `attribute` et `group`.
+
+        Returns:
+            Un objet CSRGraph.
+        """
+        sctids = np.empty(g.number_of_nodes(), dtype=object)
+        sctids[:] = list(g.nodes)
+        edges = nx.to_pandas_edgelist(g).reindex(columns=["source", "target", "attribute",
+                                                          "group"])
+        return cls.from_edges(sctids, edges.loc[:, "source"], edges.loc[:, "target"],
+                              edges.loc[:, "attribute"], edges.loc[:, "group"])
+
+    @classmethod
+    def from_edges(cls, sctids: np.ndarray, source: Iterable, target: Iterable,
+                   attribute: Iterable, group: Iterable) -> Self:
+        """
+        Construit la représentation CSR d'une liste de relations.
+
+        Args:
+            sctids: SCTID des concepts, dans l'ordre des indices.
+            source: SCTID du concept source de chaque relation.
+            target: SCTID du concept cible de chaque relation.
+            attribute: SCTID de l'attribut de chaque relation.
+            group: Groupe relationnel de chaque relation.
+
+        Returns:
+            Un objet CSRGraph.
+        """
+        index = pd.Index(sctids)
+        src = index.get_indexer(source).astype(np.int32)
+        tgt = index.get_indexer(target).astype(np.int32)
+        edge_type, attributes = pd.factorize(pd.Series(attribute, dtype=object), sort=True)
+        group = pd.to_numeric(pd.Series(group)).to_numpy(dtype=np.int16)
+
+        # Tri des relations par source puis par cible
+        order = np.lexsort((tgt, src))
+        attributes = np.asarray(attributes, dtype=object)
+        return cls(sctids, row_pointers(src, len(sctids)), tgt[order],
+                   edge_type[order].astype(np.int32), group[order], attributes)
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        """
+        Charge une représentation CSR sauvegardée par `CSRGraph.save`.
+
+        Args:
+            path: Chemin du fichier `.npz`.
+
+        Returns:
+            Un objet CSRGraph.
+        """
+        with np.load(path) as arrays:
+            columns = [k for k in arrays.files if k.startswith("feature:")]
+            features = None
+            if columns:
+                features = pd.DataFrame({c.removeprefix("feature:"): arrays[c] for c in columns})
+            return cls(arrays["sctids"].astype(object), arrays["indptr"], arrays["indices"],
+                       arrays["edge_type"], arrays["group"], arrays["attributes"].astype(object),
+                       features)
+
+    def save(self, path: str, signature: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Sauvegarde la représentation CSR et les caractéristiques des concepts dans un fichier
+        `.npz` (sans pickle).
+
+        Args:
+            path: Chemin du fichier de sauvegarde (l'extension `.npz` est ajoutée si besoin).
+            signature: Nombres de concepts et de relations du graphe d'origine, enregistrés
+                pour vérifier au chargement que la sauvegarde lui correspond toujours (voir
+                `saved_signature`).
+        """
+        features = {}
+        if self.features is not None:
+            features = {f"feature:{c}": to_fixed(self.features.loc[:, c].to_numpy())
+                        for c in self.features.columns}
+        if signature is not None:
+            features["signature"] = np.asarray(signature, dtype=np.int64)
+        np.savez(path, sctids=to_fixed(self.sctids), indptr=self.indptr, indices=self.indices,
+                 edge_type=self.edge_type, group=self.group,
+                 attributes=to_fixed(self.attributes), **features)
+
+    @staticmethod
+    def saved_signature(path: str) -> Optional[Tuple[int, int]]:
+        """
+        Lit la signature du graphe d'origine enregistrée par `CSRGraph.save`.
+
+        Args:
+            path: Chemin du fichier `.npz`.
+
+        Returns:
+            Nombres de concepts et de relations, ou None si le fichier n'en contient pas.
+        """
+        with np.load(path) as arrays:
+            if "signature" not in arrays.files:
+                return None
+            n, m = arrays["signature"].tolist()
+            return n, m
+
+    @property
+    def edge_index(self) -> np.ndarray:
+        """
+        Retourne les relations au format COO (`edge_index` de PyTorch Geometric).
+
+        Returns:
+            Tableau de taille (2, nombre de relations) : indices des sources puis des cibles.
+        """
+        return np.vstack([self.sources, self.indices])
+
+    def split_by_attribute(self) -> Dict[Any, Tuple[np.ndarray, np.ndarray]]:
+        """
+        Découpe les relations en une matrice d'adjacence CSR par attribut.
+
+        Returns:
+            Dictionnaire associant le SCTID de chaque attribut à ses pointeurs de ligne et ses
+            indices de cibles.
+        """
+        order = np.argsort(self.edge_type, kind="stable")
+        bounds = np.searchsorted(self.edge_type[order], np.arange(len(self.attributes) + 1))
+        split = {}
+        for code, attribute in enumerate(self.attributes):
+            edges = order[bounds[code]:bounds[code + 1]]
+            split[attribute] = (row_pointers(self.sources[edges], len(self.sctids)),
+                                self.indices[edges])
+        return split
+
+    def to_scipy(self, attribute: Optional[Any] = None) -> Any:
+        """
+        Convertit la matrice d'adjacence au format `scipy.sparse.csr_array` (nécessite scipy).
+        La valeur d'une case est 1 + le code de type de la relation.
+
+        Args:
+            attribute: SCTID d'un attribut auquel limiter la matrice (toutes les relations par
+                défaut).
+
+        Returns:
+            Une matrice creuse de taille (n, n).
+        """
+        try:
+            from scipy.sparse import csr_array
+        except ImportError:
+            raise ImportError("La conversion vers scipy nécessite le paquet 'scipy'.")
+
+        n = len(self.sctids)
+        if attribute is None:
+            return csr_array((self.edge_type + 1, self.indices, self.indptr), shape=(n, n))
+        indptr, indices = self.split_by_attribute().get(
+            attribute, (np.zeros(n + 1, dtype=np.int64), self.indices[:0]))
+        return csr_array((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n))
+
+    def index_of(self, sctids: Iterable) -> np.ndarray:
+        """
+        Convertit des SCTID (chaînes ou entiers) en indices de concepts.
+
+        Args:
+            sctids: Identifiants valides de concepts SNOMED CT.
+
+        Returns:
+            Tableau des indices correspondants.
+        """
+        sctids = np.asarray(to_keys(sctids, self.int_keys), dtype=object)
+        idx = self._index.get_indexer(sctids)
+        if (idx < 0).any():
+            missing = sctids[idx < 0]
+            raise KeyError(f"Concepts absents du graphe : {list(missing[:10])}")
+        return idx
+
+    def type_codes(self, attributes: Iterable) -> np.ndarray:
+        """
+        Convertit des SCTID d'attributs (chaînes ou entiers) en codes de type. Les attributs
+        absents du graphe sont ignorés.
+
+        Args:
+            attributes: SCTID d'attributs.
+
+        Returns:
+            Tableau des codes de type.
+        """
+        codes = self._attribute_index.get_indexer(
+            np.asarray(to_keys(attributes, self.int_keys), dtype=object))
+        return codes[codes >= 0]
+
+    def adjacency(self, direction: str = "out",
+                  attributes: Optional[Iterable] = None) -> Tuple[np.ndarray, np.ndarray,
+                                                                  np.ndarray]:
+        """
+        Renvoie une liste d'adjacence CSR filtrée selon le sens et le type des relations. Le
+        résultat est conservé pour les appels suivants.
+
+        Args:
+            direction: Sens des relations : sortantes ("out"), entrantes ("in") ou les deux
+                ("both").
+            attributes: SCTID des attributs à conserver (tous par défaut).
+
+        Returns:
+            Tuple contenant les pointeurs de ligne, les indices des voisins et les identifiants
+            des relations.
+        """
+        if direction not in ["out", "in", "both"]:
+            raise ValueError("Le sens ne peut être que 'out', 'in' ou 'both'.")
+        key = (direction, None if attributes is None else tuple(sorted(map(str, attributes))))
+        if key in self._adjacency:
+            return self._adjacency[key]
+
+        edge_ids = np.arange(len(self.indices))
+        if direction == "out":
+            rows, cols = self.sources, self.indices
+        elif direction == "in":
+            rows, cols = self.indices, self.sources
+        else:
+            rows = np.concatenate([self.sources, self.indices])
+            cols = np.concatenate([self.indices, self.sources])
+            edge_ids = np.concatenate([edge_ids, edge_ids])
+
+        if attributes is not None:
+            mask = np.isin(self.edge_type[edge_ids], self.type_codes(attributes))
+            rows, cols, edge_ids = rows[mask], cols[mask], edge_ids[mask]
+
+        order = np.argsort(rows, kind="stable")
+        self._adjacency[key] = (row_pointers(rows, len(self.sctids)), cols[order], edge_ids[order])
+        return self._adjacency[key]
+
+    def traverse(self, starts: np.ndarray, direction: str = "out",
+                 attributes: Optional[Iterable] = None, include_self: bool = False,
+                 degree: Optional[int] = None) -> np.ndarray:
+        """
+        Parcourt le graphe en largeur depuis un ensemble de concepts, tous traités ensemble.
+
+        Args:
+            starts: Indices des concepts de départ.
+            direction: Sens des relations : sortantes ("out", vers les ancêtres pour "Is a"),
+                entrantes ("in", vers les descendants) ou les deux ("both").
+            attributes: SCTID des attributs des relations à suivre (toutes par défaut).
+            include_self: Indique si les concepts de départ font partie du résultat.
+            degree: Nombre maximal de sauts (pas de limite par défaut).
+
+        Returns:
+            Tableau trié des indices des concepts atteints.
+        """
+        indptr, indices, _ = self.adjacency(direction, attributes)
+        return bfs(indptr, indices, starts, include_self, degree)
+
+    def shortest_path(self, src: int, tgt: int, direction: str = "both",
+                      attributes: Optional[Iterable] = None) -> np.ndarray:
+        """
+        Cherche un plus court chemin (en nombre de relations) entre deux concepts, par un
+        parcours en largeur.
+
+        Args:
+            src: Indice du concept source.
+            tgt: Indice du concept cible.
+            direction: Sens des relations empruntables : sortantes ("out"), entrantes ("in") ou
+                les deux ("both", par défaut).
+            attributes: SCTID des attributs des relations empruntables (toutes par défaut).
+
+        Returns:
+            Tableau des indices des concepts du chemin, de `src` à `tgt` (vide s'il n'existe
+            aucun chemin).
+        """
+        indptr, indices, _ = self.adjacency(direction, attributes)
+        return bfs_path(indptr, indices, src, tgt)
+
+    def subgraph(self, rows: np.ndarray) -> Self:
+        """
+        Extrait le sous-graphe induit par des concepts : les concepts, dans l'ordre de leurs
+        indices, et les relations entre eux.
+
+        Args:
+            rows: Indices des concepts conservés.
+
+        Returns:
+            Un objet CSRGraph.
+        """
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        new = np.full(len(self.sctids), -1, dtype=np.int64)
+        new[rows] = np.arange(len(rows))
+
+        edges = np.flatnonzero((new[self.sources] >= 0) & (new[self.indices] >= 0))
+        src = new[self.sources[edges]]
+        codes, edge_type = np.unique(self.edge_type[edges], return_inverse=True)
+        return type(self)(self.sctids[rows], row_pointers(src, len(rows)),
+                          new[self.indices[edges]].astype(self.indices.dtype),
+                          edge_type.astype(np.int32), self.group[edges], self.attributes[codes])
+
+
+def bfs(indptr: np.ndarray, indices: np.ndarray, starts: np.ndarray,
+        include_self: bool = False, degree: Optional[int] = None) -> np.ndarray:
+    """
+    Parcourt en largeur une adjacence CSR depuis un ensemble de concepts, tous traités ensemble
+    (voir `CSRGraph.traverse`).
+
+    Args:
+        indptr: Pointeurs de ligne.
+        indices: Indices des voisins.
+        starts: Indices des concepts de départ.
+        include_self: Indique si les concepts de départ font partie du résultat.
+        degree: Nombre maximal de sauts (pas de limite par défaut).
+
+    Returns:
+        Tableau trié des indices des concepts atteints.
+    """
+    n = len(indptr) - 1
+    starts = np.unique(np.asarray(starts, dtype=np.int64))
+    seen = np.zeros(n, dtype=bool)
+    reached = np.zeros(n, dtype=bool)
+    seen[starts] = True
+
+    frontier, hops = starts, 0
+    while len(frontier) and (degree is None or hops < degree):
+        neighbors = _gather(indptr, indices, frontier)
+        reached[neighbors] = True
+        frontier = np.unique(neighbors[~seen[neighbors]])
+        seen[frontier] = True
+        hops += 1
+
+    if include_self:
+        reached[starts] = True
+    return np.flatnonzero(reached)
+
+
+def bfs_path(indptr: np.ndarray, indices: np.ndarray, src: int, tgt: int) -> np.ndarray:
+    """
+    Cherche un plus court chemin entre deux concepts d'une adjacence CSR, par un parcours en
+    largeur (voir `CSRGraph.shortest_path`).
+
+    Args:
+        indptr: Pointeurs de ligne.
+        indices: Indices des voisins.
+        src: Indice du concept source.
+        tgt: Indice du concept cible.
+
+    Returns:
+        Tableau des indices des concepts du chemin, de `src` à `tgt` (vide s'il n'existe
+        aucun chemin).
+    """
+    parent = np.full(len(indptr) - 1, -1, dtype=np.int64)
+    parent[src] = src
+
+    frontier = np.array([src], dtype=np.int64)
+    while len(frontier) and parent[tgt] < 0:
+        neighbors = _gather(indptr, indices, frontier)
+        sources = np.repeat(frontier, indptr[frontier + 1] - indptr[frontier])
+        new = parent[neighbors] < 0
+        # Premier concept atteint de chaque voisin pour parent
+        frontier, first = np.unique(neighbors[new], return_index=True)
+        parent[frontier] = sources[new][first]
+
+    if parent[tgt] < 0:
+        return np.empty(0, dtype=np.int64)
+    path = [tgt]
+    while path[-1] != src:
+        path.append(int(parent[path[-1]]))
+    return np.array(path[::-1], dtype=np.int64)
+
+
+def to_fixed(values: np.ndarray) -> np.ndarray:
+    """
+    Convertit un tableau d'objets (SCTID, textes) en tableau NumPy de type fixe, sérialisable
+    sans pickle.
+
+    Args:
+        values: Tableau d'objets (entiers ou chaînes de caractères).
+
+    Returns:
+        Le tableau inchangé s'il est déjà de type fixe, un tableau d'entiers si toutes les
+        valeurs sont entières, de chaînes sinon.
+    """
+    if values.dtype != object:
+        return values
+    if all(isinstance(v, (int, np.integer)) for v in values):
+        return values.astype(np.int64)
+    return values.astype(str)
+
+
+def _gather(indptr: np.ndarray, indices: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Concatène les voisins de plusieurs lignes d'une adjacence CSR, sans boucle Python.
+
+    Args:
+        indptr: Pointeurs de ligne.
+        indices: Indices des voisins.
+        rows: Lignes à lire.
+
+    Returns:
+        Tableau des voisins de toutes les lignes.
+    """
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return indices[np.repeat(starts, counts) + offsets]
+
+
+def row_pointers(rows: np.ndarray, n: int) -> np.ndarray:
+    """
+    Calcule les pointeurs de ligne CSR à partir des indices de ligne de chaque élément.
+
+    Args:
+        rows: Indice de ligne de chaque élément.
+        n: Nombre de lignes.
+
+    Returns:
+        Tableau des pointeurs de ligne (taille n + 1).
+    """
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr
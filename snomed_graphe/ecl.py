@@ -0,0 +1,458 @@
+import numpy as np
+import re
+import time
+
+from abc import ABC, abstractmethod
+from snomed_graphe.csr import CSRGraph
+from snomed_graphe.index import AttributeIndex
+from snomed_graphe.sctid import IS_A
+from typing import Dict, List, Optional, Tuple
+
+_TOKENS = re.compile(r"\s*(<<|<!|<|>>|>!|>|!=|=|\(|\)|\{|\}|:|,|\*|\|[^|]*\||[A-Za-z0-9]+)")
+_CONSTRAINTS = {
+    "<<": "descendants ou soi",
+    "<": "descendants",
+    "<!": "enfants",
+    ">>": "ancêtres ou soi",
+    ">": "ancêtres",
+    ">!": "parents",
+    "": "concept"
+}
+_KEYWORDS = {"AND", "OR", "MINUS"}
+
+
+class ECLEngine():
+    """
+    Un moteur d'évaluation d'un sous-ensemble de l'ECL (Expression Constraint Language) :
+    contraintes hiérarchiques (`<`, `<<`, `<!`, `>`, `>>`, `>!`, `*`), conjonction, disjonction et
+    exclusion (`AND`, `OR`, `MINUS`), raffinements (`:`) avec `=` / `!=` et groupes (`{}`).
+
+    Les expressions sont évaluées ensemble par ensemble sous forme de masques booléens, à partir
+    de la représentation CSR (hiérarchie) et de l'index des attributs.
+    """
+    def __init__(self, csr: CSRGraph, attribute_index: AttributeIndex) -> None:
+        """
+        Crée un moteur d'évaluation.
+
+        Args:
+            csr: Représentation CSR du graphe.
+            attribute_index: Index des attributs construit sur `csr`.
+        """
+        self.csr = csr
+        self.attribute_index = attribute_index
+
+    def evaluate(self, expression: str) -> np.ndarray:
+        """
+        Évalue une expression ECL.
+
+        Args:
+            expression: Expression ECL.
+
+        Returns:
+            Tableau trié des indices (dans `csr`) des concepts répondant à l'expression.
+        """
+        return np.flatnonzero(self.run(parse(expression)))
+
+    def explain(self, expression: str) -> str:
+        """
+        Évalue une expression ECL et décrit son plan d'exécution : opérations effectuées,
+        nombre de concepts produits et durée de chaque étape.
+
+        Args:
+            expression: Expression ECL.
+
+        Returns:
+            Description textuelle du plan, une étape par ligne.
+        """
+        node = parse(expression)
+        stats: Dict[int, Tuple[int, float]] = {}
+        self.run(node, stats)
+        lines = []
+        _describe(node, stats, 0, lines)
+        return "\n".join(lines)
+
+    def run(self, node: "_Node", stats: Optional[Dict[int, Tuple[int, float]]] = None
+            ) -> np.ndarray:
+        """
+        Évalue un nœud de l'arbre syntaxique, en mesurant si besoin sa durée et sa cardinalité.
+
+        Args:
+            node: Nœud à évaluer.
+            stats: Cardinalité et durée de chaque nœud évalué, complétées en place (aucune
+                mesure si None).
+
+        Returns:
+            Masque booléen des concepts répondant au nœud.
+        """
+        if stats is None:
+            return node.evaluate(self, stats)
+        start = time.perf_counter()
+        mask = node.evaluate(self, stats)
+        stats[id(node)] = (int(mask.sum()), (time.perf_counter() - start) * 1000)
+        return mask
+
+    def index_of(self, sctid: str) -> int:
+        """
+        Convertit un SCTID de l'expression en indice de concept, qu'il soit stocké sous forme de
+        chaîne ou d'entier dans le graphe.
+
+        Args:
+            sctid: SCTID lu dans l'expression.
+
+        Returns:
+            Indice du concept.
+        """
+        try:
+            return self.csr.index_of([sctid])[0]
+        except KeyError:
+            raise ValueError(f"Le concept '{sctid}' de l'expression ECL est absent du graphe.")
+
+    def hierarchy(self, operator: str, sctid: str) -> np.ndarray:
+        """
+        Renvoie les indices des concepts désignés par une contrainte hiérarchique.
+
+        Args:
+            operator: Opérateur de contrainte ("<<", "<", "<!", ">>", ">", ">!" ou "").
+            sctid: SCTID du concept focus.
+
+        Returns:
+            Tableau des indices des concepts.
+        """
+        start = np.array([self.index_of(sctid)])
+        if not operator:
+            return start
+        direction = "in" if operator.startswith("<") else "out"
+        degree = 1 if operator.endswith("!") else None
+        include_self = operator in ["<<", ">>"]
+        return self.csr.traverse(start, direction, [IS_A], include_self, degree)
+
+    def mask(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Convertit des indices de concepts en masque booléen.
+
+        Args:
+            indices: Indices des concepts.
+
+        Returns:
+            Masque booléen de taille `len(csr)`.
+        """
+        mask = np.zeros(len(self.csr), dtype=bool)
+        mask[indices] = True
+        return mask
+
+
+##########################
+# Arbre syntaxique (AST) #
+##########################
+
+
+class _Node(ABC):
+    """Nœud de l'arbre syntaxique d'une expression ECL."""
+    def children(self) -> List["_Node"]:
+        return []
+
+    @abstractmethod
+    def label(self) -> str:
+        """Renvoie la description du nœud dans le plan d'exécution."""
+
+    @abstractmethod
+    def evaluate(self, engine: ECLEngine, stats: Optional[Dict[int, Tuple[int, float]]]
+                 ) -> np.ndarray:
+        """Évalue le nœud, les mesures de ses enfants complétant `stats` (voir
+        `ECLEngine.run`)."""
+
+
+class _Focus(_Node):
+    """Contrainte hiérarchique sur un concept (`<< 404684003`) ou joker (`*`)."""
+    def __init__(self, operator: str, sctid: str) -> None:
+        self.operator = operator
+        self.sctid = sctid
+
+    def label(self) -> str:
+        if self.sctid == "*":
+            return "* (tous les concepts)"
+        if not self.operator:
+            return f"{self.sctid} (concept)"
+        return f"{self.operator}{self.sctid} ({_CONSTRAINTS[self.operator]}, parcours CSR)"
+
+    def evaluate(self, engine: ECLEngine, stats: Optional[Dict[int, Tuple[int, float]]]
+                 ) -> np.ndarray:
+        if self.sctid == "*":
+            return np.ones(len(engine.csr), dtype=bool)
+        return engine.mask(engine.hierarchy(self.operator, self.sctid))
+
+
+class _Compound(_Node):
+    """Combinaison d'expressions par `AND`, `OR` ou `MINUS`."""
+    def __init__(self, operator: str, operands: List[_Node]) -> None:
+        self.operator = operator
+        self.operands = operands
+
+    def children(self) -> List[_Node]:
+        return self.operands
+
+    def label(self) -> str:
+        return f"{self.operator} (masques booléens)"
+
+    def evaluate(self, engine: ECLEngine, stats: Optional[Dict[int, Tuple[int, float]]]
+                 ) -> np.ndarray:
+        mask = engine.run(self.operands[0], stats).copy()
+        for operand in self.operands[1:]:
+            if self.operator == "AND":
+                if not mask.any():
+                    break
+                mask &= engine.run(operand, stats)
+            elif self.operator == "OR":
+                mask |= engine.run(operand, stats)
+            else:
+                mask &= ~engine.run(operand, stats)
+        return mask
+
+
+class _Refined(_Node):
+    """Expression raffinée (`focus : raffinement`)."""
+    def __init__(self, focus: _Node, refinement: _Node) -> None:
+        self.focus = focus
+        self.refinement = refinement
+
+    def children(self) -> List[_Node]:
+        return [self.focus, self.refinement]
+
+    def label(self) -> str:
+        return "RAFFINEMENT (focus ∩ raffinement)"
+
+    def evaluate(self, engine: ECLEngine, stats: Optional[Dict[int, Tuple[int, float]]]
+                 ) -> np.ndarray:
+        mask = engine.run(self.focus, stats)
+        if mask.any():
+            mask = mask & engine.run(self.refinement, stats)
+        return mask
+
+
+class _Attribute(_Node):
+    """Contrainte d'attribut (`363698007 = << 39057004`)."""
+    def __init__(self, operator: str, attribute: str, comparator: str, value: _Node) -> None:
+        self.operator = operator
+        self.attribute = attribute
+        self.comparator = comparator
+        self.value = value
+
+    def children(self) -> List[_Node]:
+        return [self.value]
+
+    def label(self) -> str:
+        return (f"ATTRIBUT {self.operator}{self.attribute} {self.comparator} "
+                "(index des attributs)")
+
+    def positions(self, engine: ECLEngine, stats: Optional[Dict[int, Tuple[int, float]]]
+                  ) -> np.ndarray:
+        """Renvoie les positions dans l'index des relations satisfaisant la contrainte."""
+        attributes = engine.csr.sctids[engine.hierarchy(self.operator, self.attribute)]
+        values = engine.run(self.value, stats)
+        if self.comparator == "!=":
+            values = ~values
+        return engine.attribute_index.lookup(attributes, np.flatnonzero(values))
+
+    def evaluate(self, engine: ECLEngine, stats: Optional[Dict[int, Tuple[int, float]]]
+                 ) -> np.ndarray:
+        return engine.mask(engine.attribute_index.sources[self.positions(engine, stats)])
+
+
+class _Group(_Node):
+    """Groupe de contraintes d'attributs devant être satisfaites dans un même groupe
+    relationnel (`{ A = V, B = W }`)."""
+    def __init__(self, constraints: List[_Attribute]) -> None:
+        self.constraints = constraints
+
+    def children(self) -> List[_Node]:
+        return self.constraints
+
+    def label(self) -> str:
+        return "GROUPE (intersection des couples concept-groupe)"
+
+    def evaluate(self, engine: ECLEngine, stats: Optional[Dict[int, Tuple[int, float]]]
+                 ) -> np.ndarray:
+        index = engine.attribute_index
+        keys = None
+        for constraint in self.constraints:
+            positions = constraint.positions(engine, stats)
+            if stats is not None:
+                stats[id(constraint)] = (len(np.unique(index.sources[positions])), 0.0)
+            # Chaque relation hors groupe (groupe 0) forme un groupe à elle seule
+            k = np.where(index.groups[positions] > 0,
+                         index.sources[positions].astype(np.int64) * 65536
+                         + index.groups[positions],
+                         -1 - positions)
+            keys = np.unique(k) if keys is None else np.intersect1d(keys, k)
+        sources = np.where(keys >= 0, keys // 65536, index.sources[np.maximum(-1 - keys, 0)])
+        return engine.mask(sources)
+
+
+#################
+# Analyseur ECL #
+#################
+
+
+def parse(expression: str) -> _Node:
+    """
+    Analyse une expression ECL et renvoie son arbre syntaxique.
+
+    Args:
+        expression: Expression ECL.
+
+    Returns:
+        La racine de l'arbre syntaxique.
+    """
+    return _Parser(expression).parse()
+
+
+class _Parser():
+    """Analyseur descendant récursif du sous-ensemble d'ECL supporté."""
+    def __init__(self, expression: str) -> None:
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+
+    def parse(self) -> _Node:
+        node = self.expression()
+        if self.peek() is not None:
+            raise ValueError(f"Symbole inattendu dans l'expression ECL : '{self.peek()}'.")
+        return node
+
+    def peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def next(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise ValueError("Expression ECL incomplète.")
+        self.pos += 1
+        return token
+
+    def expect(self, token: str) -> None:
+        if self.next() != token:
+            raise ValueError(f"'{token}' attendu dans l'expression ECL.")
+
+    def expression(self) -> _Node:
+        operands = [self.refined()]
+        operators = set()
+        while self.peek() is not None and self.peek().upper() in _KEYWORDS:
+            operators.add(self.next().upper())
+            operands.append(self.refined())
+        return _combine(operators, operands)
+
+    def refined(self) -> _Node:
+        focus = self.sub_expression()
+        if self.peek() == ":":
+            self.next()
+            return _Refined(focus, self.refinement())
+        return focus
+
+    def sub_expression(self) -> _Node:
+        if self.peek() == "(":
+            self.next()
+            node = self.expression()
+            self.expect(")")
+            return node
+        operator = self.next() if self.peek() in _CONSTRAINTS else ""
+        return _Focus(operator, self.concept())
+
+    def concept(self) -> str:
+        token = self.next()
+        if (token != "*" and not re.fullmatch(r"[A-Za-z0-9]+", token)) \
+                or token.upper() in _KEYWORDS:
+            raise ValueError(f"Concept attendu dans l'expression ECL, '{token}' trouvé.")
+        if self.peek() is not None and self.peek().startswith("|"):
+            self.next()
+        return token
+
+    def refinement(self) -> _Node:
+        operands = [self.refinement_item()]
+        operators = set()
+        while self.peek() is not None and self.peek().upper() in {"AND", "OR", ","}:
+            token = self.next()
+            operators.add("AND" if token == "," else token.upper())
+            operands.append(self.refinement_item())
+        return _combine(operators, operands)
+
+    def refinement_item(self) -> _Node:
+        if self.peek() == "{":
+            self.next()
+            constraints = [self.attribute()]
+            while self.peek() is not None and self.peek().upper() in {"AND", ","}:
+                self.next()
+                constraints.append(self.attribute())
+            self.expect("}")
+            return _Group(constraints)
+        if self.peek() == "(":
+            self.next()
+            node = self.refinement()
+            self.expect(")")
+            return node
+        return self.attribute()
+
+    def attribute(self) -> _Attribute:
+        operator = self.next() if self.peek() in _CONSTRAINTS else ""
+        attribute = self.concept()
+        comparator = self.next()
+        if comparator not in ["=", "!="]:
+            raise ValueError(f"'=' ou '!=' attendu dans l'expression ECL, '{comparator}' trouvé.")
+        return _Attribute(operator, attribute, comparator, self.sub_expression())
+
+
+def _combine(operators: set, operands: List[_Node]) -> _Node:
+    """
+    Combine des opérandes par un opérateur unique, l'ECL imposant des parenthèses pour mélanger
+    `AND`, `OR` et `MINUS`.
+
+    Args:
+        operators: Opérateurs rencontrés entre les opérandes.
+        operands: Opérandes.
+
+    Returns:
+        Le nœud combiné, ou l'opérande seul.
+    """
+    if len(operators) > 1:
+        raise ValueError("Des parenthèses sont nécessaires pour combiner AND, OR et MINUS.")
+    if not operators:
+        return operands[0]
+    return _Compound(operators.pop(), operands)
+
+
+def _tokenize(expression: str) -> List[str]:
+    """
+    Découpe une expression ECL en symboles.
+
+    Args:
+        expression: Expression ECL.
+
+    Returns:
+        Liste des symboles.
+    """
+    tokens, pos = [], 0
+    expression = expression.strip()
+    while pos < len(expression):
+        match = _TOKENS.match(expression, pos)
+        if not match:
+            raise ValueError(f"Symbole invalide dans l'expression ECL à la position {pos}.")
+        tokens.append(match.group(1))
+        pos = match.end()
+        while pos < len(expression) and expression[pos].isspace():
+            pos += 1
+    return tokens
+
+
+def _describe(node: _Node, stats: Dict[int, Tuple[int, float]], depth: int,
+              lines: List[str]) -> None:
+    """
+    Décrit récursivement un nœud évalué et ses enfants.
+
+    Args:
+        node: Nœud à décrire.
+        stats: Cardinalité et durée de chaque nœud évalué.
+        depth: Profondeur du nœud.
+        lines: Lignes de description, complétées en place.
+    """
+    count, ms = stats.get(id(node), (0, 0.0))
+    lines.append(f"{'  ' * depth}{node.label()} -> {count} concepts ({ms:.2f} ms)")
+    for child in node.children():
+        _describe(child, stats, depth + 1, lines)
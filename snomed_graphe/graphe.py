@@ -1,46 +1,102 @@
 import networkx as nx
+import numpy as np
+import os.path as op
 import pandas as pd
 import snomed_graphe.component as sct
+import threading
 
 from collections import defaultdict
-from typing import Any, Dict, Generator, List, Self, Tuple
+from functools import partial
+from snomed_graphe.annotator import Annotator
+from snomed_graphe.backend import CSRBackend, NetworkXBackend, make_backend
+from snomed_graphe.csr import CSRGraph
+from snomed_graphe.ecl import ECLEngine
+from snomed_graphe.index import AttributeIndex
+from snomed_graphe.memory import deep_nbytes, report
+from snomed_graphe.sampling import NeighborSampler
+from snomed_graphe.sctid import IS_A, SCTID, is_int_keyed, to_key
+from snomed_graphe.search import PrefixIndex, TermMatcher, TokenIndex, TrigramIndex
+from snomed_graphe.terms import TermTable
+from snomed_graphe.text import fold
+from snomed_graphe.walks import RandomWalker
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Self, Tuple, Union
+
+# Structures conservées par `_cached` servant d'index aux requêtes (voir `memory_usage`)
+_INDEXES = ["csr", "attribute_index", "semtags", "semtag_groups", "sctid_index", "token_index",
+            "trigram_index", "prefix_index", "annotator", "ecl"]
 
 
 class SnomedGraph():
     """
-    Une classe pour représenter une release SNOMED CT sous forme de graphe via NetworkX.
+    Une classe pour représenter une release SNOMED CT sous forme de graphe, stocké dans un
+    DiGraph NetworkX (moteur "networkx") ou dans des tableaux NumPy (moteur "csr").
     """
-    def __init__(self, g: nx.DiGraph, lang: str = "fr", root: str = "138875005") -> None:
+    def __init__(self, g: Union[nx.DiGraph, NetworkXBackend, CSRBackend], lang: str = "fr",
+                 root: SCTID = "138875005", intern: bool = True,
+                 backend: Optional[str] = None) -> None:
         """
         Crée une nouvelle instance de Graphe via un objet NetworkX DiGraph
 
         Args:
-            g: Un DiGraph créé par Graphe.from_rf2() ou Graphe.from_serialized().
+            g: Un DiGraph créé par Graphe.from_rf2() ou Graphe.from_serialized(), ou un moteur
+                déjà construit.
             lang: Langue autre que l'anglais utilisée dans le graphe.
             root: SCTID du concept racine du Graphe.
+            intern: Indique si les ConceptDetails sont partagés, un seul objet étant créé par
+                concept (voir `get_concept_details`).
+            backend: Moteur de stockage : "networkx" (par défaut pour un DiGraph) ou "csr",
+                plus compact et plus rapide à parcourir.
         """
-        self.g = g
-        self.undir = nx.to_undirected(self.g)
+        self.backend = make_backend(g, backend)
         self.lang = lang
-        self.root = root
+        self._int_keys = is_int_keyed(self.backend.nodes())
+        self._is_a = self._key(IS_A)
+        self.root = self._key(root)
+        self.intern = intern
+        self._cache: Dict[str, Any] = {}
+        self._cache_signature: Tuple[int, int] = (0, 0)
+        self._cache_lock = threading.RLock()
+        self._details: Dict[str, sct.ConceptDetails] = {}
         print(self)
 
     def __contains__(self, item) -> bool:
-        return item in self.g
+        return self._key(item) in self.backend
 
     def __iter__(self) -> Generator[Any, Any, None]:
-        for sctid in self.g.nodes:
-            yield self.g.nodes[sctid]
+        for _, data in self.backend.node_items():
+            yield data
 
     def __len__(self) -> int:
-        return self.g.number_of_nodes()
+        return len(self.backend)
 
     def __repr__(self) -> str:
-        return f"{self.g.number_of_nodes()} concepts et {self.g.number_of_edges()} relations."
+        return f"{len(self.backend)} concepts et {self.backend.number_of_edges()} relations."
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Le verrou n'est pas transmissible (pool de processus, pickle)
+        state = self.__dict__.copy()
+        del state["_cache_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._cache_lock = threading.RLock()
 
     #####################
     # Méthodes internes #
     #####################
+    def _key(self, sctid: SCTID) -> SCTID:
+        """Convertit un SCTID reçu par l'API (chaîne ou entier) dans la forme des clés du graphe :
+        entiers pour un graphe chargé par `from_rf2` ou `from_serialized`.
+
+        Args:
+            sctid: Identifiant d'un concept SNOMED CT.
+
+        Returns
+            Le SCTID sous la forme des clés du graphe.
+        """
+        return to_key(sctid, self._int_keys)
+
     def _in_relationships(self, sctid: str) -> Generator[Dict, None, None]:
         """Retourne les relations pointant vers le concept `sctid`.
 
@@ -55,10 +111,10 @@ class SnomedGraph():
             sct.Relationship(
                 self.get_concept_details(s),
                 t,
-                self.g.edges[(s, sctid)]["group"],
-                self.get_concept_details(a)
+                group,
+                self.get_concept_details(attribute)
             )
-            for s, _, a in self.g.in_edges(sctid, data="attribute")
+            for s, group, attribute in self.backend.predecessors(sctid)
         )
 
     def _out_relationships(self, sctid: str) -> Generator[Dict, None, None]:
@@ -75,12 +131,268 @@ class SnomedGraph():
             sct.Relationship(
                 s,
                 self.get_concept_details(t),
-                self.g.edges[(sctid, t)]["group"],
-                self.get_concept_details(a)
+                group,
+                self.get_concept_details(attribute)
             )
-            for _, t, a in self.g.out_edges(sctid, data="attribute")
+            for t, group, attribute in self.backend.successors(sctid)
         )
 
+    def _cached(self, key: str, builder: Callable[[], Any]) -> Any:
+        """Renvoie une structure dérivée du graphe, construite au premier appel puis conservée
+        tant que le nombre de concepts et de relations du graphe ne change pas.
+
+        Args:
+            key: Nom de la structure.
+            builder: Fonction construisant la structure.
+
+        Returns
+            La structure demandée.
+        """
+        signature = (len(self.backend), self.backend.number_of_edges())
+        if signature == self._cache_signature and key in self._cache:
+            return self._cache[key]
+        # Un seul thread construit une structure, les autres attendent qu'elle soit prête
+        with self._cache_lock:
+            if signature != self._cache_signature:
+                self.clear_cache()
+                self._cache_signature = signature
+            if key not in self._cache:
+                self._cache[key] = builder()
+            return self._cache[key]
+
+    def clear_cache(self) -> None:
+        """
+        Vide les structures dérivées du graphe (représentation CSR, index, ...). À appeler après
+        une modification de `g` qui ne change ni le nombre de concepts ni celui des relations,
+        ou après toute modification des attributs des concepts.
+        """
+        self._cache.clear()
+        self._details.clear()
+
+    def _descendant_ids(self, sctids: Iterable[str], include_self: bool = True) -> np.ndarray:
+        """Renvoie les indices (dans `csr`) des descendants d'un ou plusieurs concepts, via un
+        parcours des relations "Is a" sur la représentation CSR.
+
+        Args:
+            sctids: Identifiants valides de concepts SNOMED CT.
+            include_self: Indique si les concepts eux-mêmes font partie du résultat.
+
+        Returns
+            Tableau trié des indices des descendants.
+        """
+        return self.csr.traverse(self.csr.index_of(sctids), "in", [IS_A], include_self)
+
+    def _hierarchy_mask(self, hierarchy: Union[str, Iterable[str]]) -> np.ndarray:
+        """Renvoie le masque d'appartenance des concepts (dans l'ordre de `csr`) à une ou
+        plusieurs sous-hiérarchies, concepts racines compris. Seuls les masques des hiérarchies
+        de premier niveau (enfants de la racine), souvent demandées à chaque requête
+        (autocomplétion), sont conservés : leur nombre reste borné quelles que soient les
+        hiérarchies demandées.
+
+        Args:
+            hierarchy: SCTID de la ou des sous-hiérarchies.
+
+        Returns
+            Tableau de booléens, un par concept, à ne pas modifier.
+        """
+        if isinstance(hierarchy, (str, int, np.integer)):
+            hierarchy = [hierarchy]
+        roots = sorted(set(map(str, hierarchy)))
+        top = self._cached("top_hierarchies", lambda: {
+            str(c.sctid) for c in (self.get_children(self.root) if self.root in self else [])})
+
+        def build(sctids: List[str]) -> np.ndarray:
+            mask = np.zeros(len(self.csr), dtype=bool)
+            mask[self._descendant_ids(sctids)] = True
+            return mask
+
+        masks = [self._cached(f"hierarchy_{r}", partial(build, [r])) for r in roots if r in top]
+        others = [r for r in roots if r not in top]
+        if others:
+            masks.append(build(others))
+        return masks[0] if len(masks) == 1 else np.logical_or.reduce(masks)
+
+    def _semtag_groups(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Renvoie l'index tag sémantique -> concepts : les indices (dans `csr`) des concepts
+        regroupés par code de tag (voir `semtags`), et les pointeurs de chaque groupe.
+
+        Returns
+            Tuple contenant les indices des concepts et les pointeurs des groupes.
+        """
+        def build() -> Tuple[np.ndarray, np.ndarray]:
+            codes = self.semtags.codes
+            order = np.argsort(codes, kind="stable")
+            ptr = np.zeros(len(self.semtags.categories) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(codes[codes >= 0], minlength=len(ptr) - 1), out=ptr[1:])
+            return order[codes[order] >= 0], ptr
+
+        return self._cached("semtag_groups", build)
+
+    def _semtag_mask(self, semtag: Union[str, Iterable[str]]) -> np.ndarray:
+        """Renvoie le masque des concepts (dans l'ordre de `csr`) portant un ou plusieurs tags
+        sémantiques, obtenu par l'index des tags.
+
+        Args:
+            semtag: Tag(s) sémantique(s), par exemple "disorder".
+
+        Returns
+            Tableau de booléens, un par concept.
+        """
+        tags = [semtag] if isinstance(semtag, str) else list(semtag)
+        order, ptr = self._semtag_groups()
+        mask = np.zeros(len(self.csr), dtype=bool)
+        for code in self.semtags.categories.get_indexer(tags):
+            if code >= 0:
+                mask[order[ptr[code]:ptr[code + 1]]] = True
+        return mask
+
+    def _desc_nodes(self, lang: Optional[str] = None) -> np.ndarray:
+        """Renvoie l'indice (dans `csr`) du concept de chaque ligne de la table des descriptions.
+
+        Args:
+            lang: Langue autre que l'anglais utilisée dans le graphe (`lang` par défaut).
+
+        Returns
+            Tableau des indices, aligné sur `_desc_table(lang)`.
+        """
+        lang = lang or self.lang
+        return self._cached(f"desc_nodes_{lang}", lambda: self.csr.index_of(
+            self._desc_table(lang).loc[:, "conceptId"]))
+
+    def _desc_table(self, lang: Optional[str] = None) -> pd.DataFrame:
+        """Renvoie la table des descriptions, construite une seule fois puis conservée tant que
+        le graphe ne change pas. Le FSN, l'acceptabilité et la langue y sont catégoriels.
+
+        Args:
+            lang: Langue autre que l'anglais utilisée dans le graphe (`lang` par défaut).
+
+        Returns
+            DataFrame des descriptions (une ligne par PT ou SYN non vide), à ne pas modifier.
+        """
+        lang = lang or self.lang
+        return self._cached(f"desc_{lang}", lambda: self._build_desc_table(lang))
+
+    def _build_desc_table(self, lang: str) -> pd.DataFrame:
+        """Aplatit les PT et SYN anglais et non anglais des concepts en une table des
+        descriptions.
+
+        Args:
+            lang: Langue autre que l'anglais utilisée dans le graphe.
+
+        Returns
+            DataFrame des descriptions.
+        """
+        nodes = pd.DataFrame([{"sctid": n, **d} for n, d in self.backend.node_items()])
+
+        parts = []
+        for column, acceptability, code in [("pt_en", "PREF", "en"), ("syn_en", "ACCEPT", "en"),
+                                            ("pt_lang", "PREF", lang),
+                                            ("syn_lang", "ACCEPT", lang)]:
+            part = nodes.reindex(columns=["sctid", "fsn", column])
+            if acceptability == "ACCEPT":
+                part = part.explode(column, ignore_index=True)
+            part.columns = ["conceptId", "fsn", "term"]
+            part.loc[:, "acceptability"] = acceptability
+            part.loc[:, "lang"] = code
+            parts.append(part)
+
+        desc = pd.concat(parts, ignore_index=True)
+        desc = desc.loc[desc.loc[:, "term"] != ""].reset_index(drop=True)
+        return desc.astype({"fsn": "category",
+                            "acceptability": pd.CategoricalDtype(["PREF", "ACCEPT"]),
+                            "lang": "category"})
+
+    def _desc_keys(self, punctuation: bool = True, lang: Optional[str] = None) -> np.ndarray:
+        """Renvoie les clés de recherche normalisées (sans casse ni accents, voir `fold`) des
+        termes de la table des descriptions, calculées une seule fois.
+
+        Args:
+            punctuation: Indique si la ponctuation est conservée dans les clés.
+            lang: Langue autre que l'anglais utilisée dans le graphe (`lang` par défaut).
+
+        Returns
+            Tableau des clés, aligné sur `_desc_table(lang)` (NaN pour les termes absents).
+        """
+        lang = lang or self.lang
+        return self._cached(f"desc_keys_{lang}_{punctuation}", lambda: np.array(
+            [fold(t, punctuation) if isinstance(t, str) else np.nan
+             for t in self._desc_table(lang).loc[:, "term"]], dtype=object))
+
+    def _desc_terms(self, df: pd.DataFrame, fold_term: bool, strip_punct: bool) -> pd.Series:
+        """Renvoie les textes dans lesquels chercher pour des lignes de la table des
+        descriptions : les termes, ou leurs clés normalisées.
+
+        Args:
+            df: Lignes de `_desc_table()`.
+            fold_term: Indique si les clés normalisées sont utilisées.
+            strip_punct: Indique si les clés sont sans ponctuation.
+
+        Returns
+            Série alignée sur `df`.
+        """
+        if not fold_term:
+            return df.loc[:, "term"]
+        keys = self._desc_keys(not strip_punct)
+        return pd.Series(keys[df.index.to_numpy()], index=df.index, dtype=object)
+
+    def _search_table(self) -> pd.DataFrame:
+        """Renvoie la table des documents de la recherche plein texte : les descriptions (PT et
+        SYN) complétées par les FSN, dont l'acceptabilité vaut "FSN".
+
+        Returns
+            DataFrame des documents.
+        """
+        fsn = pd.Series({n: d.get("fsn") for n, d in self.backend.node_items()},
+                        dtype=object).dropna()
+        fsn = pd.DataFrame({"conceptId": fsn.index.to_numpy(dtype=object), "fsn": fsn.to_numpy(),
+                            "term": fsn.to_numpy(), "acceptability": "FSN", "lang": "en"})
+        return pd.concat([self._desc_table(self.lang).astype(object), fsn], ignore_index=True)
+
+    def _details_table(self) -> pd.DataFrame:
+        """Renvoie la table des détails des concepts (FSN, PT et SYN), une ligne par concept
+        dans l'ordre des indices de `csr`, construite une seule fois.
+
+        Returns
+            DataFrame des détails, indexé par indice de concept, à ne pas modifier.
+        """
+        def build() -> pd.DataFrame:
+            columns = ["fsn", "pt_en", "pt_lang", "syn_en", "syn_lang"]
+            nodes = pd.DataFrame(self._node_columns(), index=pd.Index(list(self.backend.nodes())))
+            nodes = nodes.reindex(index=pd.Index(self.csr.sctids), columns=columns)
+            return nodes.reset_index(drop=True)
+
+        return self._cached("details_table", build)
+
+    def _row_indexer(self, sctids: pd.Series) -> np.ndarray:
+        """Convertit des SCTID en indices de concepts de `csr`, par une jointure sur l'index
+        des SCTID : -1 pour un code absent du graphe ou invalide.
+
+        Args:
+            sctids: SCTID sous forme de chaînes ou d'entiers, éventuellement manquants.
+
+        Returns
+            Tableau des indices.
+        """
+        if not self._int_keys:
+            return self.csr._index.get_indexer(sctids.astype(str).where(sctids.notna()))
+
+        # Index entier : évite le hachage d'objets Python, et la conversion en flottants qui
+        # perdrait les SCTID de plus de 15 chiffres
+        index = self._cached("sctid_index", lambda: pd.Index(self.csr.sctids.astype(np.int64)))
+        rows = np.full(len(sctids), -1, dtype=np.int64)
+        if pd.api.types.is_integer_dtype(sctids.dtype) and not sctids.hasnans:
+            return index.get_indexer(sctids.to_numpy(dtype=np.int64))
+        if pd.api.types.is_float_dtype(sctids.dtype):
+            # Colonne d'entiers avec des valeurs manquantes
+            values = sctids.to_numpy(dtype=float)
+            valid = ~np.isnan(values) & (values == np.floor(values))
+            rows[valid] = index.get_indexer(values[valid].astype(np.int64))
+            return rows
+        text = sctids.astype(str).str.strip()
+        valid = text.str.fullmatch(r"\d{1,18}").to_numpy(dtype=bool)
+        rows[valid] = index.get_indexer(text.to_numpy()[valid].astype(np.int64))
+        return rows
+
     #############
     # Propriété #_out
     #############
@@ -92,29 +404,159 @@ class SnomedGraph():
         Returns:
             Une liste contenant les attributs uniques utilisés dans le graphe.
         """
-        return [self.get_concept_details(a)
-                for a in set(nx.get_edge_attributes(self.g, "type").values())]
+        return [self.get_concept_details(a) for a in self.csr.attributes]
+
+    @property
+    def g(self) -> nx.DiGraph:
+        """
+        Retourne le graphe sous forme de DiGraph NetworkX : celui du moteur "networkx", ou un
+        export construit au premier accès pour le moteur "csr" (voir `to_networkx`), dont les
+        modifications ne sont pas répercutées sur le graphe.
+
+        Returns:
+            Un DiGraph.
+        """
+        if isinstance(self.backend, NetworkXBackend):
+            return self.backend.g
+        return self._cached("networkx", self.to_networkx)
+
+    @property
+    def undir(self) -> nx.Graph:
+        """
+        Retourne la copie non orientée de `g`.
+
+        Returns:
+            Un Graph NetworkX.
+        """
+        if isinstance(self.backend, NetworkXBackend):
+            return self.backend.undir
+        return self._cached("undir", lambda: nx.to_undirected(self.g))
+
+    @property
+    def csr(self) -> CSRGraph:
+        """
+        Retourne la représentation compacte (CSR) du graphe, construite au premier accès.
+
+        Returns:
+            Un objet CSRGraph.
+        """
+        return self._cached("csr", self.backend.to_csr)
+
+    @property
+    def attribute_index(self) -> AttributeIndex:
+        """
+        Retourne l'index inversé (attribut, valeur) -> concepts des relations non hiérarchiques,
+        construit au premier accès.
+
+        Returns:
+            Un objet AttributeIndex.
+        """
+        return self._cached("attribute_index", lambda: AttributeIndex(self.csr))
+
+    @property
+    def semtags(self) -> pd.Categorical:
+        """
+        Retourne le tag sémantique de chaque concept, dans l'ordre des indices de `csr`, extrait
+        une seule fois des FSN.
+
+        Returns:
+            Catégoriel des tags sémantiques ("" pour un concept sans FSN).
+        """
+        def build() -> pd.Categorical:
+            fsn = pd.Series({n: d.get("fsn") for n, d in self.backend.node_items()},
+                            dtype=object)
+            fsn = fsn.reindex(self.csr.sctids).fillna("")
+            return pd.Categorical(fsn.str.split(" (", regex=False).str[-1].str.rstrip(")"))
+
+        return self._cached("semtags", build)
+
+    @property
+    def token_index(self) -> TokenIndex:
+        """
+        Retourne l'index inversé des mots des descriptions (PT, SYN et FSN), construit au
+        premier accès.
+
+        Returns:
+            Un objet TokenIndex.
+        """
+        return self._cached("token_index", lambda: TokenIndex.from_descriptions(
+            self._search_table()))
+
+    @property
+    def trigram_index(self) -> TrigramIndex:
+        """
+        Retourne l'index des trigrammes de caractères des descriptions (PT, SYN et FSN),
+        construit au premier accès.
+
+        Returns:
+            Un objet TrigramIndex.
+        """
+        return self._cached("trigram_index", lambda: TrigramIndex.from_descriptions(
+            self._search_table()))
+
+    @property
+    def prefix_index(self) -> PrefixIndex:
+        """
+        Retourne l'index d'autocomplétion des PT et SYN (anglais et autre langue), construit au
+        premier accès.
+
+        Returns:
+            Un objet PrefixIndex.
+        """
+        return self._cached("prefix_index", lambda: PrefixIndex.from_descriptions(
+            self._desc_table(self.lang), self._desc_nodes(self.lang)))
+
+    @property
+    def annotator(self) -> Annotator:
+        """
+        Retourne l'annotateur de textes libres fondé sur les PT et SYN non anglais, construit au
+        premier accès.
+
+        Returns:
+            Un objet Annotator.
+        """
+        def build() -> Annotator:
+            desc = self._desc_table(self.lang)
+            return Annotator.from_descriptions(desc.loc[desc.loc[:, "lang"] == self.lang])
+
+        return self._cached("annotator", build)
+
+    @property
+    def _ecl_engine(self) -> ECLEngine:
+        return self._cached("ecl", lambda: ECLEngine(self.csr, self.attribute_index))
 
     ###########################################
     # Méthodes d'accès aux éléments du graphe #
     ###########################################
-    def get_concept_details(self, sctid: int) -> sct.ConceptDetails:
+    def get_concept_details(self, sctid: SCTID) -> sct.ConceptDetails:
         """
         Renvoie les détails essentiels d'un concept : SCTID, FSN, PT et synonymes
         acceptables (SYN).
 
+        Les ConceptDetails étant immuables, un seul objet est créé par concept et partagé entre
+        les appels lorsque `intern` est vrai.
+
         Args:
             sctid: Identifiant valide d'un concept SNOMED CT.
 
         Returns:
             Un objet ConceptDetails.
         """
-        return sct.ConceptDetails(sctid=sctid, **self.g.nodes[sctid])
-
-    def get_full_concept(self, sctid: int) -> sct.Concept:
+        sctid = self._key(sctid)
+        if not self.intern:
+            return sct.ConceptDetails(sctid=sctid, **self.backend.node(sctid))
+        try:
+            return self._details[sctid]
+        except KeyError:
+            details = sct.ConceptDetails(sctid=sctid, **self.backend.node(sctid))
+            self._details[sctid] = details
+            return details
+
+    def get_full_concept(self, sctid: SCTID) -> sct.Concept:
         """
         Renvoie tous les détails d'un concept : SCTID, FSN, PT, synonymes,
-        parents, enfants et relations non hiérarchiques.
+        parents, enfants et relations non hiérarchiques. Les parents, enfants et relations ne
+        sont calculés qu'au premier accès.
 
         Args:
             sctid: Identifiant valide d'un concept SNOMED CT.
@@ -122,15 +564,65 @@ class SnomedGraph():
         Returns:
             Un objet Concept.
         """
+        sctid = self._key(sctid)
         return sct.Concept(
             self.get_concept_details(sctid),
-            self.get_parents(sctid),
-            self.get_children(sctid),
-            self.get_grouped_relationships(sctid),
+            partial(self.get_parents, sctid),
+            partial(self.get_children, sctid),
+            partial(self.get_grouped_relationships, sctid),
             self.lang
         )
 
-    def get_grouped_relationships(self, sctid: int) -> Dict[str, List[sct.Relationship]]:
+    def get_full_concepts(self, sctids: Iterable[SCTID],
+                          parts: Iterable[str] = ("parents", "children", "relationships")
+                          ) -> List[sct.Concept]:
+        """
+        Renvoie tous les détails de plusieurs concepts (voir `get_full_concept`), en calculant
+        d'avance les parties demandées. Les parents et les relations sont tirés d'un même
+        parcours des relations sortantes de chaque concept, sans créer de Relationship pour les
+        relations "Is a", et les ConceptDetails sont partagés entre les concepts.
+
+        Args:
+            sctids: Identifiants valides de concepts SNOMED CT.
+            parts: Parties calculées d'avance, parmi "parents", "children" et "relationships"
+                (toutes par défaut). Les autres sont calculées au premier accès.
+
+        Returns:
+            Liste des objets Concept, dans l'ordre des SCTID.
+        """
+        parts = set(parts)
+        if not parts <= {"parents", "children", "relationships"}:
+            raise ValueError(
+                "Les parties ne peuvent être que 'parents', 'children' ou 'relationships'.")
+
+        details = self.get_concept_details
+        concepts = []
+        for sctid in map(self._key, sctids):
+            c = details(sctid)
+            parents = partial(self.get_parents, sctid)
+            children = partial(self.get_children, sctid)
+            relationships = partial(self.get_grouped_relationships, sctid)
+
+            if "parents" in parts or "relationships" in parts:
+                is_a, grouped = [], defaultdict(list)
+                for t, group, attribute in self.backend.successors(sctid):
+                    if attribute == self._is_a:
+                        is_a.append(details(t))
+                    elif "relationships" in parts:
+                        grouped[group].append(
+                            sct.Relationship(c, details(t), group, details(attribute)))
+                if "parents" in parts:
+                    parents = is_a
+                if "relationships" in parts:
+                    relationships = dict(grouped)
+            if "children" in parts:
+                children = [details(s) for s, _, attribute in self.backend.predecessors(sctid)
+                            if attribute == self._is_a]
+
+            concepts.append(sct.Concept(c, parents, children, relationships, self.lang))
+        return concepts
+
+    def get_grouped_relationships(self, sctid: SCTID) -> Dict[str, List[sct.Relationship]]:
         """
         Renvoie la liste des relations non hiérarchiques d'un concept avec les groupes
         relationnels.
@@ -141,12 +633,13 @@ class SnomedGraph():
         Returns:
             Un dictionnaire des relations non hiérarchiques regroupées par groupe relationnel.
         """
+        sctid = self._key(sctid)
         relationship = defaultdict(list)
         {relationship[rel.group].append(rel) for rel in self._out_relationships(sctid)
-         if rel.attribute.sctid != "116680003"}
+         if rel.attribute.sctid != self._is_a}
         return dict(relationship)
 
-    def get_ungrouped_relationships(self, sctid: int) -> List[sct.Relationship]:
+    def get_ungrouped_relationships(self, sctid: SCTID) -> List[sct.Relationship]:
         """
         Renvoie la liste brute des relations non hiérarchiques d'un concept.
 
@@ -156,13 +649,14 @@ class SnomedGraph():
         Returns:
             Une liste des relations non hiérarchiques.
         """
+        sctid = self._key(sctid)
         return [rel for rel in self._out_relationships(sctid)
-                if rel.attribute.sctid != "116680003"]
+                if rel.attribute.sctid != self._is_a]
 
     ##############################################
     # Méthodes d'accès à la hiérarchie du graphe #
     ##############################################
-    def get_ancestors(self, sctid: str, degree: int = 999999) -> List[sct.ConceptDetails]:
+    def get_ancestors(self, sctid: SCTID, degree: int = 999999) -> List[sct.ConceptDetails]:
         """
         Renvoie les ancêtres d'un concept.
 
@@ -174,12 +668,10 @@ class SnomedGraph():
         Returns:
             Liste des ancêtres.
         """
-        ancestors = nx.single_source_dijkstra_path_length(
-            self.g, sctid, degree, lambda s, t, a: 1 if a["attribute"] == "116680003" else None
-        )
-        return [self.get_concept_details(t) for t in ancestors.keys() if ancestors[t] > 0]
+        sctid = self._key(sctid)
+        return [self.get_concept_details(t) for t in self.backend.ancestors(sctid, degree)]
 
-    def get_children(self, sctid: int) -> List[sct.ConceptDetails]:
+    def get_children(self, sctid: SCTID) -> List[sct.ConceptDetails]:
         """
         Renvoie les enfants d'un concept.
 
@@ -189,10 +681,11 @@ class SnomedGraph():
         Returns
             La liste des SCTIDs des enfants.
         """
+        sctid = self._key(sctid)
         return [rel.src for rel in self._in_relationships(sctid)
-                if rel.attribute.sctid == "116680003"]
+                if rel.attribute.sctid == self._is_a]
 
-    def get_descendants(self, sctid: str, degree: int = 999999) -> List[sct.ConceptDetails]:
+    def get_descendants(self, sctid: SCTID, degree: int = 999999) -> List[sct.ConceptDetails]:
         """
         Renvoie les descendants d'un concept.
 
@@ -204,15 +697,10 @@ class SnomedGraph():
         Returns:
             Liste des descendants.
         """
-        filter = nx.ancestors(self.g, sctid)
-        descendants = set(nx.single_source_dijkstra_path_length(
-            self.undir, sctid, degree, lambda s, t, a: 1 if a["attribute"] == "116680003" else None
-        ).keys())
-        descendants = descendants.intersection(filter)
-
-        return [self.get_concept_details(id) for id in descendants]
+        sctid = self._key(sctid)
+        return [self.get_concept_details(id) for id in self.backend.descendants(sctid, degree)]
 
-    def get_neighbors(self, sctid: int, degree: int = 1) -> List[sct.ConceptDetails]:
+    def get_neighbors(self, sctid: SCTID, degree: int = 1) -> List[sct.ConceptDetails]:
         """
         Renvoie les voisins d'un concept. Les voisins comprennent les ancêtres, descendants et
         cousins jusqu'à un certain degré `degree`.
@@ -225,12 +713,10 @@ class SnomedGraph():
         Returns:
             Une liste des voisins.
         """
-        target = nx.single_source_dijkstra_path_length(
-            self.undir, sctid, degree, lambda s, t, a: 1 if a["attribute"] == "116680003" else None
-        )
-        return [self.get_concept_details(t) for t in target.keys()]
+        sctid = self._key(sctid)
+        return [self.get_concept_details(t) for t in self.backend.neighbors(sctid, degree)]
 
-    def get_parents(self, sctid: str) -> List[sct.ConceptDetails]:
+    def get_parents(self, sctid: SCTID) -> List[sct.ConceptDetails]:
         """
         Renvoie les parents d'un concept.
 
@@ -240,13 +726,135 @@ class SnomedGraph():
         Returns
             La liste des SCTIDs des parents.
         """
+        sctid = self._key(sctid)
         return [rel.tgt for rel in self._out_relationships(sctid)
-                if rel.attribute.sctid == "116680003"]
+                if rel.attribute.sctid == self._is_a]
+
+    def neighbor_sampler(self, fanouts: List[int], attributes: Optional[Iterable[str]] = None,
+                         direction: str = "both", replace: bool = False,
+                         seed: Optional[int] = None) -> NeighborSampler:
+        """
+        Renvoie un échantillonneur de voisinages à effectif fixe, à la manière de
+        `get_neighbors` mais pour des mini-lots de concepts.
+
+        Args:
+            fanouts: Nombre de voisins tirés par concept à chaque saut (-1 pour tous).
+            attributes: SCTID des attributs des relations utilisables (toutes par défaut,
+                ["116680003"] pour la seule hiérarchie).
+            direction: Sens des relations : sortantes ("out"), entrantes ("in") ou les deux
+                ("both", par défaut).
+            replace: Indique si le tirage se fait avec remise.
+            seed: Graine du générateur aléatoire, pour des tirages reproductibles.
+
+        Returns:
+            Un objet NeighborSampler.
+        """
+        return NeighborSampler(self.csr, fanouts, attributes, direction, replace, seed)
+
+    def random_walker(self, walk_length: int = 40, walks_per_node: int = 10, p: float = 1.0,
+                      q: float = 1.0, attributes: Optional[Iterable[str]] = None,
+                      direction: str = "both", seed: Optional[int] = None) -> RandomWalker:
+        """
+        Renvoie un générateur de marches aléatoires (DeepWalk, node2vec) sur le graphe, pour
+        l'apprentissage de plongements de concepts.
+
+        Args:
+            walk_length: Nombre maximal de concepts par marche.
+            walks_per_node: Nombre de marches partant de chaque concept.
+            p: Paramètre de retour de node2vec (1 par défaut, soit DeepWalk).
+            q: Paramètre entrée-sortie de node2vec (1 par défaut, soit DeepWalk).
+            attributes: SCTID des attributs des relations empruntables (toutes par défaut,
+                ["116680003"] pour la seule hiérarchie).
+            direction: Sens des relations : sortantes ("out"), entrantes ("in") ou les deux
+                ("both", par défaut).
+            seed: Graine du générateur aléatoire, pour des marches reproductibles.
+
+        Returns:
+            Un objet RandomWalker.
+        """
+        return RandomWalker(self.csr, walk_length, walks_per_node, p, q, attributes, direction,
+                            seed)
+
+    ################################
+    # Méthodes de requête indexées #
+    ################################
+    def ecl(self, expression: str) -> List[str]:
+        """
+        Évalue une expression ECL parmi le sous-ensemble supporté : contraintes hiérarchiques
+        (`<`, `<<`, `<!`, `>`, `>>`, `>!`, `*`), `AND`, `OR`, `MINUS` (parenthèses obligatoires
+        pour les combiner), raffinements `A = V` / `A != V` et groupes `{ }`.
+
+        Args:
+            expression: Expression ECL, par exemple `<< 404684003 : 363698007 = << 123037004`.
+
+        Returns:
+            Liste des SCTID des concepts répondant à l'expression.
+        """
+        return list(self.csr.sctids[self._ecl_engine.evaluate(expression)])
+
+    def explain_ecl(self, expression: str) -> str:
+        """
+        Évalue une expression ECL et décrit son plan d'exécution (étapes, nombre de concepts
+        produits et durée de chaque étape).
+
+        Args:
+            expression: Expression ECL.
+
+        Returns:
+            Description textuelle du plan d'exécution.
+        """
+        return self._ecl_engine.explain(expression)
+
+    def find_by_semtag(self, semtag: Union[str, Iterable[str]]) -> List[str]:
+        """
+        Renvoie les concepts portant un ou plusieurs tags sémantiques, via l'index des tags.
+
+        Args:
+            semtag: Tag(s) sémantique(s), par exemple "disorder".
+
+        Returns:
+            Liste des SCTID des concepts trouvés.
+        """
+        return list(self.csr.sctids[self._semtag_mask(semtag)])
+
+    def find_by_attribute(self, attribute: str, value: str = "",
+                          hierarchy: Union[str, Iterable[str]] = "",
+                          value_descendants: bool = True,
+                          attribute_descendants: bool = True) -> List[str]:
+        """
+        Renvoie les concepts ayant une relation `attribute` dont la valeur est `value` (ou un
+        de ses descendants), via l'index des attributs et sans parcourir tout le graphe.
+
+        Args:
+            attribute: SCTID de l'attribut recherché.
+            value: SCTID de la valeur recherchée (n'importe quelle valeur par défaut).
+            hierarchy: SCTID de la ou des sous-hiérarchies auxquelles limiter la recherche.
+            value_descendants: Indique si les descendants de `value` sont acceptés comme valeur.
+            attribute_descendants: Indique si les sous-attributs de `attribute` sont acceptés.
+
+        Returns:
+            Liste des SCTID des concepts répondant à la requête.
+        """
+        csr = self.csr
+        attributes = [attribute]
+        if attribute_descendants:
+            attributes += list(csr.sctids[self._descendant_ids([attribute], False)])
+
+        values = None
+        if value:
+            values = self._descendant_ids([value], True) if value_descendants else \
+                csr.index_of([value])
+
+        sources, _ = self.attribute_index.sources_of(attributes, values)
+        if hierarchy:
+            sources = sources[self._hierarchy_mask(hierarchy)[sources]]
+
+        return list(csr.sctids[np.unique(sources)])
 
     ##################################
     # Méthodes de calcul des chemins #
     ##################################
-    def hierarchical_path(self, src: int, tgt: int) -> List[sct.ConceptDetails]:
+    def hierarchical_path(self, src: SCTID, tgt: SCTID) -> List[sct.ConceptDetails]:
         """
         Retourne le chemin le plus court entre les concepts en utilisant uniquement les relations
         hiérarchiques via l'algorithme de Dijkstra.
@@ -258,11 +866,10 @@ class SnomedGraph():
         Returns:
             Une liste des concepts formant le chemin entre la source et la cible.
         """
-        return [self.get_concept_details(c) for c in nx.dijkstra_path(
-            self.undir, src, tgt, lambda s, t, a: 1 if a["attribute"] == "116680003" else None)
-        ]
+        src, tgt = self._key(src), self._key(tgt)
+        return [self.get_concept_details(c) for c in self.backend.shortest_path(src, tgt, True)]
 
-    def hierarchical_path_to_root(self, sctid: int) -> List[sct.ConceptDetails]:
+    def hierarchical_path_to_root(self, sctid: SCTID) -> List[sct.ConceptDetails]:
         """
         Retourne le chemin le plus court entre le concept et la racine du graphe en utilisant
         uniquement les relations hiérarchiques via l'algorithme de Dijkstra.
@@ -275,7 +882,7 @@ class SnomedGraph():
         """
         return self.path(sctid, self.root)
 
-    def path(self, src: int, tgt: int) -> List[sct.ConceptDetails]:
+    def path(self, src: SCTID, tgt: SCTID) -> List[sct.ConceptDetails]:
         """
         Retourne le chemin le plus court entre les concepts en utilisant les relations
         hiérarchiques et non hiérarchiques via l'algorithme de Dijkstra.
@@ -287,73 +894,187 @@ class SnomedGraph():
         Returns:
             Une liste des concepts formant le chemin entre la source et la cible.
         """
-        return [self.get_concept_details(c) for c in nx.dijkstra_path(self.undir, src, tgt)]
+        src, tgt = self._key(src), self._key(tgt)
+        return [self.get_concept_details(c) for c in self.backend.shortest_path(src, tgt, False)]
 
     #######################################################
     # Méthodes de manipulation & transformation du graphe #
     #######################################################
-    def graph_to_pandas(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    def graph_to_pandas(self, semtag: Union[str, Iterable[str]] = "") -> Tuple[pd.DataFrame,
+                                                                                 pd.DataFrame]:
         """
         Transforme le graphe en deux DataFrame Pandas (nœuds et arcs).
 
+        Args:
+            semtag: Tag(s) sémantique(s) des concepts à conserver, avec leurs relations
+                sortantes (tous par défaut).
+
         Returns:
             Tuple contenant le DataFrame des nœuds et celui des arcs.
         """
-        nodes_df = (
-            pd.DataFrame([{"sctid": n, **self.g.nodes[n]} for n in self.g.nodes])
-            .set_index("sctid")
-        )
+        nodes_df = pd.DataFrame(self._node_columns(), index=pd.Index(list(self.backend.nodes()),
+                                                                     name="sctid"))
+
+        edges_df = self.backend.edges_frame()
+        if semtag:
+            kept = self.csr.sctids[self._semtag_mask(semtag)]
+            nodes_df = nodes_df.loc[nodes_df.index.isin(kept)]
+            edges_df = edges_df.loc[edges_df.loc[:, "source"].isin(kept)]
+        return (nodes_df, edges_df)
+
+    def graph_to_tables(self, semtag: Union[str, Iterable[str]] = "") -> Tuple[pd.DataFrame,
+                                                                                pd.DataFrame]:
+        """
+        Transforme le graphe en deux tables colonnes (concepts et relations), construites
+        directement à partir de la représentation CSR plutôt qu'arc par arc. Les SYN restent des
+        listes ; tags sémantiques et attributs sont catégoriels.
+
+        Args:
+            semtag: Tag(s) sémantique(s) des concepts à conserver, avec leurs relations
+                sortantes (tous par défaut).
 
-        edges_df = nx.to_pandas_edgelist(self.g)
+        Returns:
+            Tuple contenant la table des concepts (dans l'ordre de `csr`) et celle des relations
+            (triées par source puis cible), colonnes `source`, `target`, `attribute` et `group`.
+        """
+        csr = self.csr
+        columns = self._node_columns()
+        for k in ["syn_en", "syn_lang"]:
+            # Listes de SYN homogènes, y compris pour les concepts sans synonyme
+            columns[k] = [v if isinstance(v, list) else [v] if isinstance(v, str) and v else []
+                          for v in columns.get(k, [np.nan] * len(csr))]
+        nodes_df = pd.DataFrame({"sctid": csr.sctids, **columns, "semtag": self.semtags})
+        edges_df = pd.DataFrame({
+            "source": csr.sctids[csr.sources],
+            "target": csr.sctids[csr.indices],
+            "attribute": pd.Categorical.from_codes(csr.edge_type, csr.attributes),
+            "group": csr.group
+        })
+        if semtag:
+            mask = self._semtag_mask(semtag)
+            nodes_df = nodes_df.loc[mask].reset_index(drop=True)
+            edges_df = edges_df.loc[mask[csr.sources]].reset_index(drop=True)
         return (nodes_df, edges_df)
 
-    def desc_to_pandas(self, lang: str = "fr") -> pd.DataFrame:
+    def _node_columns(self) -> Dict[str, List[Any]]:
+        """
+        Extrait les propriétés des concepts colonne par colonne, dans l'ordre des concepts du
+        graphe (et de `csr`).
+
+        Returns:
+            Dictionnaire associant à chaque propriété la liste de ses valeurs (NaN si absente).
+        """
+        data = [d for _, d in self.backend.node_items()]
+        keys = dict.fromkeys(k for d in data for k in d)
+        return {k: [d.get(k, np.nan) for d in data] for k in keys}
+
+    def graph_to_arrays(self, path: str = "") -> CSRGraph:
+        """
+        Transforme le graphe en tableaux indexés par des entiers : correspondance indice-SCTID,
+        adjacence CSR (et COO via `edge_index`), types et groupes relationnels des relations et
+        caractéristiques des concepts.
+
+        Args:
+            path: Chemin d'un fichier `.npz` servant de cache (l'extension est ajoutée si
+                besoin) : chargé s'il existe et correspond toujours au graphe (mêmes nombres de
+                concepts et de relations), créé ou remplacé sinon.
+
+        Returns:
+            Un objet CSRGraph dont l'attribut `features` contient les caractéristiques des
+            concepts.
+        """
+        signature = (len(self.backend), self.backend.number_of_edges())
+        if path and not path.endswith(".npz"):
+            path = f"{path}.npz"
+        if path and op.exists(path) and CSRGraph.saved_signature(path) == signature:
+            return CSRGraph.load(path)
+
+        csr = self.csr
+        arrays = CSRGraph(csr.sctids, csr.indptr, csr.indices, csr.edge_type, csr.group,
+                          csr.attributes, self.node_features())
+        if path:
+            arrays.save(path, signature)
+        return arrays
+
+    def node_features(self) -> pd.DataFrame:
+        """
+        Calcule des caractéristiques simples des concepts, dans l'ordre des indices de `csr` :
+        tag sémantique, degrés, nombre de parents, d'enfants et de synonymes.
+
+        Returns:
+            DataFrame contenant une ligne par concept.
+        """
+        csr = self.csr
+        nodes = pd.DataFrame(self._node_columns(), index=pd.Index(list(self.backend.nodes())))
+        nodes = nodes.reindex(index=pd.Index(csr.sctids), columns=["pt_lang", "syn_en", "syn_lang"])
+        isa_out, _, _ = csr.adjacency("out", [IS_A])
+        isa_in, _, _ = csr.adjacency("in", [IS_A])
+
+        return pd.DataFrame({
+            "sctid": csr.sctids,
+            "semtag": np.asarray(self.semtags, dtype=str),
+            "out_degree": np.diff(csr.indptr),
+            "in_degree": np.diff(csr.in_indptr),
+            "parents": np.diff(isa_out),
+            "children": np.diff(isa_in),
+            "syn_en": [len(s) if isinstance(s, list) else 0 for s in nodes.loc[:, "syn_en"]],
+            "syn_lang": [len(s) if isinstance(s, list) else 0 for s in nodes.loc[:, "syn_lang"]],
+            "has_pt_lang": nodes.loc[:, "pt_lang"].fillna("").to_numpy(dtype=str) != ""
+        })
+
+    def desc_to_pandas(self, lang: str = "fr",
+                       semtag: Union[str, Iterable[str]] = "") -> pd.DataFrame:
         """
         Fournit une visualisation des descriptions sous forme de DataFrame Pandas.
 
         Args:
             lang: Langue autre que l'anglais utilisée dans le graphe.
+            semtag: Tag(s) sémantique(s) des concepts dont les descriptions sont conservées
+                (tous par défaut).
 
         Returns:
             DataFrame représentant les descriptions du graphe.
         """
-        nodes_df = (
-            pd.DataFrame([{"sctid": n, **self.g.nodes[n]} for n in self.g.nodes])
-            .set_index("sctid")
-        )
-        nodes_df.reset_index(inplace=True)
-
-        # Restructuration des PT anglais
-        nodes_en_pt = nodes_df.loc[:, ["sctid", "fsn", "pt_en"]]
-        nodes_en_pt.columns = ["conceptId", "fsn", "term"]
-        nodes_en_pt.loc[:, "acceptability"] = ["PREF"] * len(nodes_en_pt)
-        nodes_en_pt.loc[:, "lang"] = ["en"] * len(nodes_en_pt)
-
-        # Restructuration des synonymes anglais
-        nodes_en_syn = nodes_df.loc[:, ["sctid", "fsn", "syn_en"]]
-        nodes_en_syn = nodes_en_syn.explode("syn_en", ignore_index=True)
-        nodes_en_syn.columns = ["conceptId", "fsn", "term"]
-        nodes_en_syn.loc[:, "acceptability"] = ["ACCEPT"] * len(nodes_en_syn)
-        nodes_en_syn.loc[:, "lang"] = ["en"] * len(nodes_en_syn)
-
-        # Restructuration des PT anglais
-        nodes_lang_pt = nodes_df.loc[:, ["sctid", "fsn", "pt_lang"]]
-        nodes_lang_pt.columns = ["conceptId", "fsn", "term"]
-        nodes_lang_pt.loc[:, "acceptability"] = ["PREF"] * len(nodes_lang_pt)
-        nodes_lang_pt.loc[:, "lang"] = [lang] * len(nodes_lang_pt)
-
-        # Restructuration des synonymes anglais
-        nodes_lang_syn = nodes_df.loc[:, ["sctid", "fsn", "syn_lang"]]
-        nodes_lang_syn = nodes_lang_syn.explode("syn_lang", ignore_index=True)
-        nodes_lang_syn.columns = ["conceptId", "fsn", "term"]
-        nodes_lang_syn.loc[:, "acceptability"] = ["ACCEPT"] * len(nodes_lang_syn)
-        nodes_lang_syn.loc[:, "lang"] = [lang] * len(nodes_lang_syn)
-
-        nodes = pd.concat([nodes_en_pt, nodes_en_syn, nodes_lang_pt, nodes_lang_syn],
-                          ignore_index=True)
-        return nodes.loc[nodes.loc[:, "term"] != ""]
-
-    def subgraph(self, target: str, down: str = True, up: str = False) -> Self:
+        desc = self._desc_table(lang)
+        if semtag:
+            desc = desc.loc[self._semtag_mask(semtag)[self._desc_nodes(lang)]]
+        return desc.astype({"fsn": object, "acceptability": object, "lang": object})
+
+    def details_to_pandas(self, sctids: Union[pd.Series, np.ndarray, Iterable[SCTID]]
+                          ) -> pd.DataFrame:
+        """
+        Renvoie les détails de nombreux concepts à la fois, sans créer d'objet ConceptDetails :
+        les SCTID sont joints à une table des détails construite une seule fois. Les codes
+        absents du graphe ou invalides n'interrompent pas la recherche : `exists` est alors
+        faux et les détails manquants (NaN).
+
+        Args:
+            sctids: SCTID (chaînes ou entiers), par exemple une colonne d'une table à enrichir.
+
+        Returns:
+            DataFrame des colonnes `sctid` (tel que donné), `exists`, `fsn`, `pt_en`,
+            `pt_lang`, `syn_en`, `syn_lang` et `semtag` (catégoriel), une ligne par SCTID dans
+            l'ordre donné, indexé comme `sctids` s'il s'agit d'une Series.
+        """
+        sctids = sctids if isinstance(sctids, pd.Series) else pd.Series(
+            sctids if isinstance(sctids, np.ndarray) else list(sctids))
+        rows = self._row_indexer(sctids)
+        exists = rows >= 0
+
+        # Les indices -1 ne figurent pas dans l'index de la table : lignes manquantes (NaN)
+        details = self._details_table().reindex(rows)
+        semtags = self.semtags
+        semtag = pd.Categorical.from_codes(np.where(exists, semtags.codes[rows], -1),
+                                           semtags.categories)
+
+        df = pd.DataFrame({"sctid": sctids.to_numpy(), "exists": exists}, index=sctids.index)
+        for column in details.columns:
+            df[column] = details.loc[:, column].to_numpy()
+        df["semtag"] = semtag
+        return df
+
+    def subgraph(self, target: SCTID, down: str = True, up: str = False,
+                 semtag: Union[str, Iterable[str]] = "") -> Self:
         """
         Renvoie un sous-graphe centré sur un concept. Le sous-graphe peut regrouper les ancêtres
         et/ou les descendants du concept, les attributs utilisés par ces concepts, les valeurs
@@ -363,10 +1084,13 @@ class SnomedGraph():
             target: Concept centre du sous-graphe.
             down: Indique si les descendants du concept sont récupérés (oui par défaut).
             up: Indique si les ancêtres du concept sont récupérés (non par défaut).
+            semtag: Tag(s) sémantique(s) auxquels limiter les ancêtres et descendants récupérés
+                (tous par défaut).
 
         Returns:
             Renvoie un objet SnomedGraph contenant le sous-graphe
         """
+        target = self._key(target)
         nodes = {target}
         if down:
             # Récupère les descendants
@@ -374,6 +1098,10 @@ class SnomedGraph():
         if up:
             # Récupère les ancêtres
             nodes = nodes.union({c.sctid for c in self.get_ancestors(target)})
+        if semtag:
+            # Ne conserve que les ancêtres et descendants portant le tag sémantique
+            kept = self.csr.sctids[self._semtag_mask(semtag)]
+            nodes = {target}.union(pd.Index(list(nodes)).intersection(kept))
 
         # Récupère les relations non hiérarchiques de tous les concepts
         rel = [r for n in nodes for r in self.get_ungrouped_relationships(n)]
@@ -388,25 +1116,80 @@ class SnomedGraph():
             nodes = nodes.union({c.sctid for a in attributes for c in self.get_ancestors(a)})
             nodes = nodes.union(attributes)
             if down or up:
-                nodes = nodes.union({"116680003"})
+                nodes = nodes.union({self._is_a})
 
             # Récupère les ancêtres des valeurs d'attributs utilisées & les valeurs
             nodes = nodes.union({c.sctid for v in values for c in self.get_ancestors(v)})
             nodes = nodes.union(values)
 
         # Création du graphe, avec comme racine le concept centre du sous-graphe
-        return SnomedGraph(self.g.subgraph(nodes).copy(), self.lang, root=target)
+        return SnomedGraph(self.backend.subgraph(nodes), self.lang, root=target,
+                           intern=self.intern)
+
+    def memory_usage(self, sample: Optional[int] = 1000) -> pd.Series:
+        """
+        Estime la mémoire occupée par le graphe, par composant : attributs des concepts,
+        relations, copie non orientée (moteur "networkx"), index des requêtes et autres
+        structures conservées (tables des descriptions, ConceptDetails partagés, ...).
+
+        Les tailles des tableaux sont exactes ; celles des objets Python sont extrapolées d'un
+        échantillon régulier de `sample` éléments par collection, ce qui rend l'appel assez
+        rapide pour être périodique. Un objet partagé n'est compté qu'une fois.
 
-    def search_in_desc(self, term: str, hierarchy: str = "", accept: str = "", is_in: bool = True,
-                       lang: str = "fr", regex_term: bool = False, case_term: bool = False,
-                       fsn: str = "", regex_fsn: bool = False,
-                       case_fsn: bool = False) -> List[str]:
+        Args:
+            sample: Nombre d'éléments échantillonnés par collection (tous si None, plus précis
+                mais proportionnel à la taille du graphe).
+
+        Returns:
+            Série des tailles estimées en octets, indexée par composant ("nodes", "edges",
+            "undirected", "indexes", "caches") et partie.
+        """
+        seen = {}
+        parts = self.backend.memory_usage(sample, seen)
+        cached = sorted(self._cache, key=lambda k: k not in _INDEXES)
+        for key in cached:
+            component = "indexes" if key in _INDEXES else "caches"
+            parts[(component, key)] = deep_nbytes(self._cache[key], sample, seen)
+        parts[("caches", "details")] = deep_nbytes(self._details, sample, seen)
+        return report(parts)
+
+    def to_networkx(self) -> nx.DiGraph:
+        """
+        Exporte le graphe en DiGraph NetworkX, pour l'interopérabilité avec d'autres
+        bibliothèques.
+
+        Returns:
+            Le DiGraph du moteur "networkx" lui-même, ou un nouveau DiGraph au format produit
+            par `from_rf2` pour le moteur "csr".
+        """
+        return self.backend.to_networkx()
+
+    def compact_terms(self) -> TermTable:
+        """
+        Regroupe les termes des concepts (FSN, PT et SYN) dans une TermTable : un tampon UTF-8
+        unique où chaque terme distinct n'est stocké qu'une fois, au lieu d'objets `str` et
+        `list` propres à chaque nœud. Les attributs des nœuds restent lisibles et modifiables
+        comme avant, les termes étant décodés à chaque accès.
+
+        Returns:
+            La TermTable des attributs des concepts.
+        """
+        table = self.backend.compact_terms()
+        self._details.clear()
+        return table
+
+    def search_in_desc(self, term: str, hierarchy: Union[str, Iterable[str]] = "",
+                       accept: str = "", is_in: bool = True, lang: str = "fr",
+                       regex_term: bool = False, case_term: bool = False, fsn: str = "",
+                       regex_fsn: bool = False, case_fsn: bool = False, fold_term: bool = False,
+                       strip_punct: bool = False,
+                       semtag: Union[str, Iterable[str]] = "") -> List[str]:
         """Chercher un terme dans les descriptions non-anglaises si le FSN contient un terme
         spécifique.
 
         Args:
             term: Terme à rechercher dans les descriptions non-anglaises.
-            hierarchy: SCTID de la sous-hiérarchie à laquelle limiter la recherche.
+            hierarchy: SCTID de la ou des sous-hiérarchies auxquelles limiter la recherche.
             accept: Indique si `term` doit être cherché dans un terme préféré ("PREF"),
                 un synonyme acceptable ("ACCEPT") ou peu importe ("").
             is_in: Indique si `term` doit être présent (True) ou absent (False).
@@ -416,19 +1199,117 @@ class SnomedGraph():
             fsn: Terme à rechercher dans les FSN des concepts auxquels limiter la recherche.
             regex_fsn: Indique si `fsn` est une regex ou non.
             case_fsn: Indique si la recherche doit être sensible à la casse de `fsn`.
+            fold_term: Indique si `term` est cherché sans tenir compte de la casse ni des accents
+                ("hemorragie" trouve "Hémorragie"), dans des clés normalisées calculées une
+                seule fois (`case_term` est alors ignoré).
+            strip_punct: Indique si la ponctuation est aussi ignorée avec `fold_term`
+                ("sous endocardique" trouve "sous-endocardique"), sauf dans une regex.
+            semtag: Tag(s) sémantique(s) des concepts auxquels limiter la recherche, par
+                exemple "disorder".
 
         Returns:
             Liste des SCTID des concepts répondant à la requête.
         """
+        df = self._filter_desc(hierarchy, accept, lang, fsn, regex_fsn, case_fsn, semtag)
+        terms = self._desc_terms(df, fold_term, strip_punct)
+        if fold_term:
+            # Une regex garde sa casse et sa ponctuation, et s'applique sans tenir compte de la
+            # casse ; un terme littéral est normalisé comme les clés
+            term = fold(term, punctuation=regex_term or not strip_punct, case=regex_term)
+            case_term = not regex_term
+
+        # Recherche du terme
+        if is_in:
+            df = df.loc[terms.str.contains(term, regex=regex_term, case=case_term)]
+        else:
+            df = df.loc[~terms.str.contains(term, regex=regex_term, case=case_term)]
+
+        return list(df.loc[:, "conceptId"].unique())
+
+    def search_in_desc_batch(self, terms: Iterable[str], hierarchy: Union[str, Iterable[str]] = "",
+                             accept: str = "", lang: str = "fr", regex_term: bool = False,
+                             case_term: bool = False, fsn: str = "", regex_fsn: bool = False,
+                             case_fsn: bool = False, fold_term: bool = False,
+                             strip_punct: bool = False,
+                             semtag: Union[str, Iterable[str]] = "", processes: int = 1,
+                             chunk_size: int = 100000) -> Dict[str, List[str]]:
+        """Chercher de nombreux termes à la fois dans les descriptions non-anglaises, avec les
+        mêmes filtres pour tous. Équivaut à un appel de `search_in_desc` par terme, mais les
+        descriptions ne sont parcourues qu'une seule fois pour l'ensemble des termes littéraux.
+
+        Args:
+            terms: Termes à rechercher dans les descriptions non-anglaises.
+            hierarchy: SCTID de la ou des sous-hiérarchies auxquelles limiter la recherche.
+            accept: Indique si les termes doivent être cherchés dans un terme préféré ("PREF"),
+                un synonyme acceptable ("ACCEPT") ou peu importe ("").
+            lang: Indique la langue dans laquelle les termes doivent être cherchés, par défaut
+                "fr".
+            regex_term: Indique si les termes sont des regex ou non.
+            case_term: Indique si la recherche doit être sensible à la casse des termes.
+            fsn: Terme à rechercher dans les FSN des concepts auxquels limiter la recherche.
+            regex_fsn: Indique si `fsn` est une regex ou non.
+            case_fsn: Indique si la recherche doit être sensible à la casse de `fsn`.
+            fold_term: Indique si les termes sont cherchés sans tenir compte de la casse ni des
+                accents, dans les clés normalisées (`case_term` est alors ignoré).
+            strip_punct: Indique si la ponctuation est aussi ignorée avec `fold_term`, sauf
+                dans une regex.
+            semtag: Tag(s) sémantique(s) des concepts auxquels limiter la recherche.
+            processes: Nombre de processus se partageant les descriptions.
+            chunk_size: Nombre de descriptions par tâche lorsque `processes` > 1.
+
+        Returns:
+            Dictionnaire associant à chaque terme la liste des SCTID des concepts trouvés.
+        """
+        terms = list(terms)
+        df = self._filter_desc(hierarchy, accept, lang, fsn, regex_fsn, case_fsn, semtag)
+        texts = self._desc_terms(df, fold_term, strip_punct)
+        df, texts = df.loc[texts.notna()], texts.loc[texts.notna()]
+
+        patterns = terms
+        if fold_term:
+            patterns = [fold(t, punctuation=regex_term or not strip_punct, case=regex_term)
+                        for t in terms]
+            case_term = not regex_term
+        matcher = TermMatcher(patterns, regex_term, case_term)
+        found, rows = matcher.match(texts, processes, chunk_size)
+
+        # SCTID uniques de chaque terme, dans l'ordre des descriptions
+        pairs = pd.DataFrame({"term": found, "sctid": df.loc[:, "conceptId"].to_numpy()[rows]})
+        pairs = pairs.drop_duplicates()
+        result = {term: [] for term in terms}
+        for i, sctids in pairs.groupby("term", sort=False)["sctid"]:
+            result[terms[i]] = list(sctids)
+        return result
+
+    def _filter_desc(self, hierarchy: Union[str, Iterable[str]], accept: str, lang: str,
+                     fsn: str, regex_fsn: bool, case_fsn: bool,
+                     semtag: Union[str, Iterable[str]] = "") -> pd.DataFrame:
+        """Restreint la table des descriptions selon les filtres de `search_in_desc`.
+
+        Args:
+            hierarchy: SCTID de la ou des sous-hiérarchies auxquelles limiter la recherche.
+            accept: Acceptabilité recherchée ("PREF", "ACCEPT" ou "").
+            lang: Langue recherchée.
+            fsn: Terme à rechercher dans les FSN des concepts.
+            regex_fsn: Indique si `fsn` est une regex ou non.
+            case_fsn: Indique si la recherche doit être sensible à la casse de `fsn`.
+            semtag: Tag(s) sémantique(s) des concepts auxquels limiter la recherche.
+
+        Returns
+            DataFrame des descriptions conservées.
+        """
         # Vérifier la valeur d'acceptabilité
         if accept not in ["", "PREF", "ACCEPT"]:
             raise ValueError("L'acceptabilité ne peut être que '', 'PREF' ou 'ACCEPT'.")
 
-        # Récupérer la sous-partie de la SNOMED CT pertinente
+        # Restreindre les descriptions du graphe aux concepts des sous-hiérarchies pertinentes
+        df = self._desc_table()
         if hierarchy:
-            df = self.subgraph(hierarchy).desc_to_pandas()
-        else:
-            df = self.desc_to_pandas()
+            df = df.loc[self._hierarchy_mask(hierarchy)[self._desc_nodes()[df.index]]]
+
+        # Filtre sur le tag sémantique
+        if semtag:
+            df = df.loc[self._semtag_mask(semtag)[self._desc_nodes()[df.index]]]
 
         # Filtre sur l'acceptabilité
         if accept:
@@ -438,14 +1319,107 @@ class SnomedGraph():
         if fsn:
             df = df.loc[df.loc[:, "fsn"].str.contains(fsn, regex=regex_fsn, case=case_fsn)]
 
-        # Recherche du terme
-        if is_in:
-            df = df.loc[(df.loc[:, "lang"] == lang)
-                        & (df.loc[:, "term"].str.contains(term, regex=regex_term, case=case_term))]
-        else:
-            df = df.loc[
-                (df.loc[:, "lang"] == lang)
-                & (~df.loc[:, "term"].str.contains(term, regex=regex_term, case=case_term))
-            ]
+        return df.loc[df.loc[:, "lang"] == lang]
 
-        return list(df.loc[:, "conceptId"].unique())
+    def search_tokens(self, query: str, hierarchy: Union[str, Iterable[str]] = "",
+                      accept: str = "", lang: str = "fr", fsn: str = "", regex_fsn: bool = False,
+                      case_fsn: bool = False) -> List[str]:
+        """Chercher des mots dans les descriptions via l'index inversé des mots. Les mots de la
+        requête doivent tous être présents, `OR` sépare des alternatives et les guillemets
+        délimitent une expression exacte, par exemple `infarctus "du myocarde" OR idm`. La
+        casse et la ponctuation sont ignorées.
+
+        Args:
+            query: Requête.
+            hierarchy: SCTID de la ou des sous-hiérarchies auxquelles limiter la recherche.
+            accept: Indique si la requête doit être cherchée dans un terme préféré ("PREF"), un
+                synonyme acceptable ("ACCEPT"), les deux ("") ou les FSN ("FSN").
+            lang: Indique la langue dans laquelle chercher, par défaut "fr" (ignoré pour "FSN").
+            fsn: Terme à rechercher dans les FSN des concepts auxquels limiter la recherche.
+            regex_fsn: Indique si `fsn` est une regex ou non.
+            case_fsn: Indique si la recherche doit être sensible à la casse de `fsn`.
+
+        Returns:
+            Liste des SCTID des concepts répondant à la requête.
+        """
+        # Vérifier la valeur d'acceptabilité
+        if accept not in ["", "PREF", "ACCEPT", "FSN"]:
+            raise ValueError("L'acceptabilité ne peut être que '', 'PREF', 'ACCEPT' ou 'FSN'.")
+
+        index = self.token_index
+        docs = index.search(query)
+
+        # Filtres sur l'acceptabilité et la langue
+        docs = index.select(docs, accept, lang)
+
+        # Filtre sur le FSN
+        if fsn:
+            docs = docs[index.fsn_mask(docs, fsn, regex_fsn, case_fsn)]
+
+        concepts = pd.unique(index.concepts[docs])
+        # Filtre sur la sous-hiérarchie
+        if hierarchy:
+            concepts = concepts[self._hierarchy_mask(hierarchy)[self.csr.index_of(concepts)]]
+
+        return list(concepts)
+
+    def search_fuzzy(self, term: str, k: int = 10, min_similarity: float = 0.3,
+                     hierarchy: Union[str, Iterable[str]] = "", accept: str = "",
+                     lang: str = "fr") -> List[Tuple[str, float]]:
+        """Chercher les concepts dont une description ressemble à un terme, malgré les fautes de
+        frappe et les accents manquants, via l'index des trigrammes de caractères.
+
+        Args:
+            term: Terme à rechercher.
+            k: Nombre maximal de concepts renvoyés.
+            min_similarity: Similarité minimale (coefficient de Dice des trigrammes, entre 0 et
+                1) d'une description retenue.
+            hierarchy: SCTID de la ou des sous-hiérarchies auxquelles limiter la recherche.
+            accept: Indique si le terme doit être cherché dans un terme préféré ("PREF"), un
+                synonyme acceptable ("ACCEPT"), les deux ("") ou les FSN ("FSN").
+            lang: Indique la langue dans laquelle chercher, par défaut "fr" (ignoré pour "FSN").
+
+        Returns:
+            Liste des couples (SCTID, similarité) des `k` concepts les plus proches, par
+            similarité décroissante.
+        """
+        # Vérifier la valeur d'acceptabilité
+        if accept not in ["", "PREF", "ACCEPT", "FSN"]:
+            raise ValueError("L'acceptabilité ne peut être que '', 'PREF', 'ACCEPT' ou 'FSN'.")
+
+        index = self.trigram_index
+        docs, scores = index.search(term, min_similarity, accept, lang)
+
+        # Meilleure similarité de chaque concept
+        order = np.argsort(-scores, kind="stable")
+        concepts, first = np.unique(index.concepts[docs[order]], return_index=True)
+        best = np.argsort(first)
+        concepts, scores = concepts[best], scores[order][first[best]]
+
+        # Filtre sur la sous-hiérarchie
+        if hierarchy:
+            keep = self._hierarchy_mask(hierarchy)[self.csr.index_of(concepts)]
+            concepts, scores = concepts[keep], scores[keep]
+
+        return [(c, float(score)) for c, score in zip(concepts[:k], scores[:k])]
+
+    def autocomplete(self, prefix: str, k: int = 10, semtag: str = "",
+                     hierarchy: Union[str, Iterable[str]] = "") -> List[Tuple[str, str]]:
+        """Propose les concepts dont un PT ou un SYN (anglais ou autre langue) commence par un
+        préfixe, pour une saisie semi-automatique. Les concepts trouvés par un PT précèdent ceux
+        trouvés par un SYN, puis l'ordre est alphabétique. La casse, les accents et la
+        ponctuation sont ignorés.
+
+        Args:
+            prefix: Début du terme saisi.
+            k: Nombre maximal de concepts proposés.
+            semtag: Tag sémantique auquel limiter la recherche, par exemple "disorder".
+            hierarchy: SCTID de la ou des sous-hiérarchies auxquelles limiter la recherche.
+
+        Returns:
+            Liste des couples (SCTID, terme trouvé) des concepts proposés.
+        """
+        index = self.prefix_index
+        allowed = self._hierarchy_mask(hierarchy) if hierarchy else None
+        docs = index.complete(prefix, k, semtag, allowed)
+        return list(zip(index.concepts[docs], index.terms[docs]))
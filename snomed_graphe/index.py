@@ -0,0 +1,81 @@
+import numpy as np
+
+from snomed_graphe.csr import CSRGraph
+from snomed_graphe.sctid import IS_A
+from typing import Iterable, Optional, Tuple
+
+
+class AttributeIndex():
+    """
+    Un index inversé des relations non hiérarchiques : (attribut, valeur) -> concepts sources,
+    avec le groupe relationnel de chaque relation.
+
+    Les relations sont triées par attribut puis par valeur, de sorte que les relations d'un
+    attribut forment un bloc contigu dans lequel les valeurs se recherchent par dichotomie.
+    """
+    def __init__(self, csr: CSRGraph, exclude: Iterable = (IS_A,)) -> None:
+        """
+        Construit l'index à partir d'une représentation CSR.
+
+        Args:
+            csr: Représentation CSR du graphe.
+            exclude: SCTID des attributs à ne pas indexer ("Is a" par défaut).
+        """
+        self.csr = csr
+        edges = np.flatnonzero(~np.isin(csr.edge_type, csr.type_codes(exclude)))
+        edges = edges[np.lexsort((csr.indices[edges], csr.edge_type[edges]))]
+
+        self.edge_ids = edges
+        self.types = csr.edge_type[edges]
+        self.targets = csr.indices[edges]
+        self.sources = csr.sources[edges]
+        self.groups = csr.group[edges]
+        self.bounds = np.searchsorted(self.types, np.arange(len(csr.attributes) + 1))
+
+    def __len__(self) -> int:
+        return len(self.edge_ids)
+
+    def __repr__(self) -> str:
+        return f"AttributeIndex({len(self.edge_ids)} relations)"
+
+    def lookup(self, attributes: Iterable, values: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Recherche les relations d'un ou plusieurs attributs vers un ensemble de valeurs.
+
+        Args:
+            attributes: SCTID des attributs.
+            values: Indices des concepts valeurs (toutes les valeurs par défaut).
+
+        Returns:
+            Positions des relations trouvées dans l'index (voir `sources`, `targets`, `groups`).
+        """
+        positions = []
+        if values is not None:
+            values = np.unique(values)
+        for code in self.csr.type_codes(attributes):
+            lo, hi = self.bounds[code], self.bounds[code + 1]
+            if values is None:
+                positions.append(np.arange(lo, hi))
+                continue
+            starts = lo + np.searchsorted(self.targets[lo:hi], values, side="left")
+            ends = lo + np.searchsorted(self.targets[lo:hi], values, side="right")
+            counts = ends - starts
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            positions.append(np.repeat(starts, counts) + offsets)
+        return np.concatenate(positions) if positions else np.zeros(0, dtype=np.int64)
+
+    def sources_of(self, attributes: Iterable,
+                   values: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Renvoie les concepts ayant une relation d'un des attributs vers une des valeurs.
+
+        Args:
+            attributes: SCTID des attributs.
+            values: Indices des concepts valeurs (toutes les valeurs par défaut).
+
+        Returns:
+            Tuple contenant les indices des concepts sources et les groupes relationnels, une
+            entrée par relation trouvée.
+        """
+        positions = self.lookup(attributes, values)
+        return self.sources[positions], self.groups[positions]
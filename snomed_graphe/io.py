@@ -1,9 +1,13 @@
+import hashlib
 import networkx as nx
+import os
 import os.path as op
 import pandas as pd
 
 from datetime import datetime
+from snomed_graphe.backend import CSRBackend
 from snomed_graphe.graphe import SnomedGraph
+from snomed_graphe.search import TokenIndex
 from tqdm import tqdm
 from typing import Tuple
 
@@ -194,6 +198,37 @@ def _rf2_paths(path: str, lang: str = "fr") -> Tuple[str]:
     return concepts, en_desc, en_accept, lang_desc, lang_accept, relations
 
 
+def _token_index_path(path: str) -> str:
+    """
+    Génère le chemin de l'index des mots sauvegardé à côté d'un graphe linéarisé.
+
+    Args:
+        path: Chemin + nom du fichier du graphe.
+
+    Returns:
+        Chemin du fichier de l'index des mots.
+    """
+    return f"{op.splitext(path)[0]}.tokens.npz"
+
+
+def _graph_signature(path: str) -> str:
+    """
+    Calcule la signature d'un graphe linéarisé : empreinte du contenu du fichier, qui change
+    dès qu'un concept, une relation ou une description du graphe sauvegardé change.
+
+    Args:
+        path: Chemin + nom du fichier du graphe.
+
+    Returns:
+        Empreinte hexadécimale du fichier.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
 def _set_acceptability(desc: pd.DataFrame, en_accept_path: str, lang_accept_path: str,
                        lang: str) -> pd.DataFrame:
     """
@@ -246,13 +281,15 @@ def _set_acceptability(desc: pd.DataFrame, en_accept_path: str, lang_accept_path
 #######################
 
 
-def from_rf2(path: str, lang: str = "fr") -> SnomedGraph:
+def from_rf2(path: str, lang: str = "fr", backend: str = "networkx") -> SnomedGraph:
     """
     Crée un Graphe depuis une archive RF2.
 
     Args:
         path: Chemin vers l'archive RF2.
         lang: Autre langue que l'anglais présente dans la release, par défaut 'fr'.
+        backend: Moteur de stockage du graphe : "networkx" (par défaut) ou "csr", construit
+            directement à partir des tables sans passer par un DiGraph.
 
     Returns:
         Un objet Graphe.
@@ -264,8 +301,17 @@ def from_rf2(path: str, lang: str = "fr") -> SnomedGraph:
     desc = _get_descriptions(c_path, en_path, lang_path, lang)
     # Ajouter l'acceptabilité
     desc = _set_acceptability(desc, en_accept_path, lang_accept_path, lang)
-    # Récupérer les relations
-    relations = _get_relations(rs_path)
+    # Récupérer les relations, avec des SCTID et des groupes entiers (clés canoniques)
+    relations = _get_relations(rs_path).astype(
+        {"src": "int64", "tgt": "int64", "group": "int64", "attribute": "int64"})
+
+    # Rassemblement des attributs pour chaque nœuds
+    nodes = _get_nodes_details(desc, lang)
+    nodes.index = nodes.index.astype("int64")
+
+    if backend == "csr":
+        print("\nCréation des tableaux ...")
+        return SnomedGraph(CSRBackend.from_frames(nodes, relations), lang=lang)
 
     # Création des arcs
     print("\nCréation des arcs ...")
@@ -273,42 +319,96 @@ def from_rf2(path: str, lang: str = "fr") -> SnomedGraph:
                                 edge_attr=["src", "tgt", "group", "attribute"],
                                 create_using=nx.DiGraph)
 
-    # Rassemblement des attributs pour chaque nœuds
-    nodes = _get_nodes_details(desc, lang)
-
     # Création des nœuds
     print("\nCréation des concepts ...")
     g.add_nodes_from((id, dict(row)) for id, row in tqdm(nodes.iterrows(), total=len(nodes)))
 
     # Retourne le graphe complet
-    return SnomedGraph(g, lang=lang)
+    return SnomedGraph(g, lang=lang, backend=backend)
 
 
-def from_serialized(path: str, lang: str = "fr") -> SnomedGraph:
+def from_serialized(path: str, lang: str = "fr", backend: str = "networkx") -> SnomedGraph:
     """
     Charge un graphe depuis une linéarisation.
 
     Args:
         path: Chemin + nom du fichier sauvegardé.
         lang: Langue autre que l'anglais utilisée dans le graphe.
+        backend: Moteur de stockage du graphe : "networkx" (par défaut) ou "csr".
 
     Returns:
         Un objet SnomedGraph.
     """
-    g = nx.read_gml(path, destringizer=int)
-    return SnomedGraph(g, lang=lang)
+    g = SnomedGraph(nx.read_gml(path, destringizer=int), lang=lang, backend=backend)
 
-######################
-# Méthode d'écriture #
-######################
+    # Chargement de l'index des mots s'il a été sauvegardé avec cette version du graphe
+    tokens = _token_index_path(path)
+    if op.exists(tokens) and TokenIndex.saved_signature(tokens) == _graph_signature(path):
+        g._cached("token_index", lambda: TokenIndex.load(tokens))
+    return g
 
+#######################
+# Méthodes d'écriture #
+#######################
 
-def save(g: SnomedGraph, path: str) -> None:
+
+def save(g: SnomedGraph, path: str, token_index: bool = False) -> None:
     """
     Sauvegarder un SnomedGraph au format gml.
 
     Args:
         g: Graphe SNOMED CT
         path: Chemin du fichier de sauvegarde
+        token_index: Indique si l'index des mots des descriptions est sauvegardé à côté du
+            graphe (fichier `.tokens.npz`), pour être rechargé par `from_serialized`. Sinon,
+            un index sauvegardé auparavant au même endroit est supprimé.
     """
     nx.write_gml(g.g, path)
+    tokens = _token_index_path(path)
+    if token_index:
+        g.token_index.save(tokens, _graph_signature(path))
+    elif op.exists(tokens):
+        os.remove(tokens)
+
+
+def export_tables(g: SnomedGraph, path: str, format: str = "parquet", semtag: str = "",
+                  chunk_size: int = 100000) -> None:
+    """
+    Exporter les tables des concepts et des relations (voir `SnomedGraph.graph_to_tables`) au
+    format Parquet ou Arrow IPC, par blocs de `chunk_size` lignes. Nécessite le paquet
+    `pyarrow`.
+
+    Args:
+        g: Graphe SNOMED CT
+        path: Chemin du dossier de sauvegarde, où sont écrits `nodes.<format>` et
+            `edges.<format>`.
+        format: Format des fichiers : "parquet" ou "arrow".
+        semtag: Tag sémantique des concepts à exporter (tous par défaut).
+        chunk_size: Nombre de lignes converties et écrites à la fois, soit un groupe de lignes
+            (Parquet) ou un lot (Arrow).
+    """
+    if format not in ["parquet", "arrow"]:
+        raise ValueError("Le format ne peut être que 'parquet' ou 'arrow'.")
+    if chunk_size < 1:
+        raise ValueError("La taille des blocs doit être un entier positif.")
+    try:
+        import pyarrow as pa
+        if format == "parquet":
+            import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("L'export Parquet ou Arrow nécessite le paquet 'pyarrow'.")
+
+    os.makedirs(path, exist_ok=True)
+    for name, df in zip(["nodes", "edges"], g.graph_to_tables(semtag)):
+        # Schéma commun à tous les blocs, pour que chaque tranche soit convertie à l'identique
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        file = op.join(path, f"{name}.{format}")
+        if format == "parquet":
+            writer = pq.ParquetWriter(file, schema)
+        else:
+            writer = pa.ipc.new_file(file, schema)
+        with writer:
+            # Seule la tranche en cours est convertie en table Arrow
+            for i in range(0, len(df), chunk_size):
+                writer.write_table(pa.Table.from_pandas(df.iloc[i:i + chunk_size], schema=schema,
+                                                        preserve_index=False))
@@ -0,0 +1,202 @@
+import argparse
+import http.client
+import json
+import numpy as np
+import random
+import threading
+import time
+
+from itertools import cycle
+from typing import Any, Dict, List, Optional, Self
+from urllib.parse import urlencode, urlsplit
+
+
+class Client():
+    """
+    Un client du serveur de requêtes (voir `server.SnomedServer`), réutilisant une même
+    connexion HTTP/1.1 (keep-alive). Un client ne doit être utilisé que par un seul thread.
+    """
+    def __init__(self, url: str = "http://127.0.0.1:8000", timeout: float = 60) -> None:
+        """
+        Crée le client, la connexion étant ouverte à la première requête.
+
+        Args:
+            url: Adresse du serveur.
+            timeout: Délai maximal d'une requête, en secondes.
+        """
+        parts = urlsplit(url)
+        self.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def request(self, http_method: str, path: str, payload: Any = None) -> Dict[str, Any]:
+        """
+        Envoie une requête et renvoie sa réponse JSON décodée, complétée de son statut HTTP
+        ("status").
+
+        Args:
+            http_method: "GET" ou "POST".
+            path: Chemin de la requête, paramètres compris.
+            payload: Corps JSON d'une requête POST.
+
+        Returns:
+            Réponse décodée.
+        """
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        self.conn.request(http_method, path, body, headers)
+        response = self.conn.getresponse()
+        data = json.loads(response.read())
+        data["status"] = response.status
+        return data
+
+    def get(self, method: str, **params: Any) -> Dict[str, Any]:
+        query = f"?{urlencode(params)}" if params else ""
+        return self.request("GET", f"/{method}{query}")
+
+    def batch(self, queries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return self.request("POST", "/batch", queries)
+
+
+def sample_queries(url: str, n: int = 1000, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Prépare des requêtes variées à partir du graphe servi : concepts tirés parmi les
+    descendants proches de la racine, interrogés par toutes les méthodes du service.
+
+    Args:
+        url: Adresse du serveur.
+        n: Nombre de requêtes.
+        seed: Graine du tirage.
+
+    Returns:
+        Requêtes, de la forme {"method": ..., "params": {...}}.
+    """
+    rng = random.Random(seed)
+    with Client(url) as client:
+        root = client.get("health")["root"]
+        concepts = client.get("descendants", sctid=root, degree=3).get("result", [])
+    if not concepts:
+        raise ValueError("Le graphe servi n'a pas de descendants de la racine.")
+    sctids = [c["sctid"] for c in concepts]
+    words = [w for c in concepts for w in c["pt_lang"].split() if len(w) > 4] or ["a"]
+
+    queries = []
+    for _ in range(n):
+        sctid = rng.choice(sctids)
+        method = rng.choice(["details", "details", "full", "parents", "children", "ancestors",
+                             "hierarchical_path", "path", "search"])
+        if method in ("path", "hierarchical_path"):
+            params = {"src": sctid, "tgt": root}
+        elif method == "search":
+            params = {"term": rng.choice(words)}
+        else:
+            params = {"sctid": sctid}
+        queries.append({"method": method, "params": params})
+    return queries
+
+
+def load_test(url: str, queries: List[Dict[str, Any]], concurrency: int = 8,
+              requests: int = 1000, batch_size: int = 1) -> Dict[str, float]:
+    """
+    Mesure le débit et la latence du serveur : `concurrency` threads, chacun avec sa propre
+    connexion keep-alive, envoient `requests` requêtes au total en parcourant `queries` en
+    boucle, une à une (GET) ou par lots de `batch_size` (POST /batch).
+
+    Args:
+        url: Adresse du serveur.
+        queries: Requêtes à envoyer (voir `sample_queries`).
+        concurrency: Nombre de clients simultanés.
+        requests: Nombre total de requêtes.
+        batch_size: Nombre de requêtes par appel HTTP.
+
+    Returns:
+        Dictionnaire des mesures : requêtes, appels HTTP, erreurs, durée (s), débit
+        (requêtes/s) et latences des appels HTTP (p50, p95, p99, en ms).
+    """
+    if concurrency < 1 or batch_size < 1:
+        raise ValueError("Le nombre de clients et la taille des lots doivent être positifs.")
+    calls = [queries[i:i + batch_size] for i in range(0, len(queries), batch_size)]
+    remaining = [-(-requests // batch_size)]
+    pending, lock = cycle(calls), threading.Lock()
+    latencies: List[float] = []
+    errors = [0]
+
+    def run() -> None:
+        with Client(url) as client:
+            while True:
+                with lock:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                    call = next(pending)
+                start = time.perf_counter()
+                if batch_size == 1:
+                    q = call[0]
+                    responses = [client.get(q["method"], **q.get("params", {}))]
+                else:
+                    responses = client.batch(call).get("results", [{"error": ""}])
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+                    errors[0] += sum("error" in r for r in responses)
+
+    threads = [threading.Thread(target=run) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    duration = time.perf_counter() - start
+
+    done = sum(len(calls[i % len(calls)]) for i in range(len(latencies)))
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99]).tolist()
+    return {"requests": done, "calls": len(latencies), "errors": errors[0],
+            "seconds": round(duration, 3), "requests_per_second": round(done / duration, 1),
+            "p50_ms": round(p50, 2), "p95_ms": round(p95, 2), "p99_ms": round(p99, 2)}
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Test de charge d'un serveur local : `python -m snomed_graphe.loadtest --url
+    http://127.0.0.1:8000`, ou `--graph chemin/graphe` pour démarrer d'abord un serveur sur un
+    port libre.
+    """
+    parser = argparse.ArgumentParser(description="Test de charge du serveur SNOMED CT.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--graph", help="Graphe sauvegardé à servir le temps du test.")
+    parser.add_argument("--backend", default="networkx", choices=["networkx", "csr"])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--queries", type=int, default=1000,
+                        help="Nombre de requêtes distinctes (les suivantes sont en cache).")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.graph:
+        from snomed_graphe.io import from_serialized
+        from snomed_graphe.server import SnomedServer
+
+        server = SnomedServer(from_serialized(args.graph, backend=args.backend), port=0)
+        server.service.warm_up()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        args.url = server.url
+    try:
+        queries = sample_queries(args.url, args.queries)
+        print(json.dumps(load_test(args.url, queries, args.concurrency, args.requests,
+                                   args.batch_size), indent=2))
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+import sys
+
+from itertools import islice
+from snomed_graphe.terms import NodeTerms
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+# Types dont la taille ne dépend que de l'objet lui-même
+_SCALARS = (str, bytes, int, float, bool, complex, type(None), np.generic)
+
+
+def sample_mean(values: Iterable[Any], n: int, sample: Optional[int],
+                size: Any) -> float:
+    """
+    Estime la taille moyenne des éléments d'une collection à partir d'un échantillon régulier
+    (un élément tous les `n // sample`), sans parcourir tous les éléments en Python.
+
+    Args:
+        values: Éléments de la collection.
+        n: Nombre d'éléments de la collection.
+        sample: Taille de l'échantillon (tous les éléments si None).
+        size: Fonction renvoyant la taille d'un élément en octets.
+
+    Returns:
+        Taille moyenne d'un élément (0 pour une collection vide).
+    """
+    sizes = [size(v) for v in islice(values, 0, None, _step(n, sample))]
+    return sum(sizes) / len(sizes) if sizes else 0.0
+
+
+def value_nbytes(value: Any) -> int:
+    """
+    Renvoie la taille d'une valeur d'attribut : scalaire, ou liste de scalaires (SYN).
+    """
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def mapping_nbytes(data: Any) -> int:
+    """
+    Renvoie la taille d'un dictionnaire d'attributs (nœud ou arc) et de ses valeurs. Une vue
+    NodeTerms ne compte que pour elle-même, sa TermTable étant comptée à part.
+    """
+    if isinstance(data, NodeTerms):
+        return sys.getsizeof(data)
+    return sys.getsizeof(data) + sum(value_nbytes(v) for v in data.values())
+
+
+def graph_nbytes(g: nx.Graph, sample: Optional[int] = 1000) -> Dict[str, int]:
+    """
+    Estime la mémoire occupée par un graphe NetworkX, à partir d'un échantillon de concepts.
+
+    Args:
+        g: Graphe orienté ou non.
+        sample: Nombre de concepts échantillonnés (tous si None).
+
+    Returns:
+        Dictionnaire des tailles en octets des attributs des concepts ("nodes"), des
+        dictionnaires d'adjacence ("adjacency") et des attributs des arcs ("edges").
+    """
+    n, m = g.number_of_nodes(), g.number_of_edges()
+    adjacency = [g._adj, g._pred] if g.is_directed() else [g._adj]
+
+    nodes = sys.getsizeof(g._node) + n * sample_mean(g._node.values(), n, sample,
+                                                     mapping_nbytes)
+    adj = sum(sys.getsizeof(a) + n * sample_mean(a.values(), n, sample, sys.getsizeof)
+              for a in adjacency)
+
+    # Taille moyenne d'un attribut d'arc, sur les arcs sortants des concepts échantillonnés
+    edges = [d for nbrs in islice(g._adj.values(), 0, None, _step(n, sample))
+             for d in nbrs.values()]
+    edge_size = sum(map(mapping_nbytes, edges)) / len(edges) if edges else 0.0
+    return {"nodes": int(nodes), "adjacency": int(adj), "edges": int(m * edge_size)}
+
+
+def deep_nbytes(obj: Any, sample: Optional[int] = 1000,
+                seen: Optional[Dict[int, Any]] = None) -> int:
+    """
+    Estime la mémoire occupée par un objet et ce qu'il référence : tableaux NumPy et pandas
+    (nbytes, plus un échantillon des objets Python qu'ils contiennent), conteneurs (un
+    échantillon de leurs éléments) et attributs des autres objets. Les objets déjà comptés
+    (`seen`) ne le sont pas une seconde fois.
+
+    Args:
+        obj: Objet à mesurer.
+        sample: Nombre d'éléments échantillonnés par conteneur (tous si None).
+        seen: Objets déjà comptés par identifiant, complétés au fil de la mesure. Les objets
+            y sont conservés : l'identifiant d'un objet temporaire (vue pandas, ...) libéré
+            pourrait sinon être réattribué à un autre objet, qui serait alors ignoré.
+
+    Returns:
+        Taille estimée en octets.
+    """
+    seen = {} if seen is None else seen
+    if isinstance(obj, _SCALARS):
+        return sys.getsizeof(obj)
+    if id(obj) in seen:
+        return 0
+    seen[id(obj)] = obj
+
+    def items(values: Any, n: int) -> float:
+        return n * sample_mean(values, n, sample, lambda v: deep_nbytes(v, sample, seen))
+
+    if isinstance(obj, np.ndarray):
+        # Une vue (colonne d'un bloc pandas, ...) est comptée par le tableau qu'elle partage
+        if isinstance(obj.base, np.ndarray):
+            return deep_nbytes(obj.base, sample, seen)
+        size = obj.nbytes
+        if obj.dtype == object:
+            # Échantillon par ligne : les lignes d'un bloc pandas sont des colonnes distinctes
+            rows = obj.reshape(-1, obj.shape[-1]) if obj.ndim > 1 else [obj]
+            size += sum(items(iter(row), len(row)) for row in rows)
+        return int(size)
+    if isinstance(obj, pd.DataFrame):
+        return sum(deep_nbytes(obj.iloc[:, i].array, sample, seen)
+                   for i in range(obj.shape[1])) + obj.index.nbytes
+    if isinstance(obj, pd.Series):
+        return deep_nbytes(obj.array, sample, seen) + obj.index.nbytes
+    if isinstance(obj, pd.Index):
+        return deep_nbytes(obj.array, sample, seen)
+    if isinstance(obj, pd.Categorical):
+        return deep_nbytes(obj.codes, sample, seen) + deep_nbytes(obj.categories, sample, seen)
+    if isinstance(obj, pd.api.extensions.ExtensionArray):
+        return deep_nbytes(obj.to_numpy(), sample, seen)
+    if isinstance(obj, nx.Graph):
+        # Une vue (sous-graphe, graphe non orienté) partage les dictionnaires de son graphe
+        if getattr(obj, "_graph", None) is not None:
+            return sys.getsizeof(obj)
+        return sum(graph_nbytes(obj, sample).values())
+    if isinstance(obj, (memoryview, type, type(len))):
+        return sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        return int(sys.getsizeof(obj) + items(iter(obj.keys()), len(obj))
+                   + items(iter(obj.values()), len(obj)))
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return int(sys.getsizeof(obj) + items(iter(obj), len(obj)))
+
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_nbytes(vars(obj), sample, seen)
+    for name in getattr(type(obj), "__slots__", ()):
+        size += deep_nbytes(getattr(obj, name, None), sample, seen)
+    return size
+
+
+def report(parts: Dict[Tuple[str, str], int]) -> pd.Series:
+    """
+    Met en forme un relevé de mémoire.
+
+    Args:
+        parts: Taille en octets de chaque partie, par couple (composant, partie).
+
+    Returns:
+        Série des tailles en octets, indexée par composant et partie.
+    """
+    index = pd.MultiIndex.from_tuples(list(parts), names=["component", "part"])
+    return pd.Series(list(parts.values()), index=index, dtype=np.int64, name="bytes")
+
+
+def _step(n: int, sample: Optional[int]) -> int:
+    """
+    Renvoie le pas d'un échantillon régulier de `sample` éléments parmi `n`.
+    """
+    return 1 if sample is None else max(1, n // max(sample, 1))
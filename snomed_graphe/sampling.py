@@ -0,0 +1,154 @@
+import numpy as np
+
+from snomed_graphe.csr import CSRGraph
+from typing import Iterable, List, Optional
+
+
+class SampledBlock():
+    """
+    Un bloc bipartite CSR produit par un saut d'échantillonnage de voisinage.
+
+    Les indices locaux de `indices` renvoient vers `src_nodes`, dont les premiers éléments sont
+    les concepts de destination `dst_nodes`.
+    """
+    def __init__(self, src_nodes: np.ndarray, dst_nodes: np.ndarray, indptr: np.ndarray,
+                 indices: np.ndarray, edge_ids: np.ndarray) -> None:
+        self.src_nodes = src_nodes
+        self.dst_nodes = dst_nodes
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_ids = edge_ids
+
+    def __repr__(self) -> str:
+        return (f"SampledBlock({len(self.src_nodes)} sources, {len(self.dst_nodes)} destinations, "
+                f"{len(self.indices)} relations)")
+
+    @property
+    def num_src(self) -> int:
+        return len(self.src_nodes)
+
+    @property
+    def num_dst(self) -> int:
+        return len(self.dst_nodes)
+
+
+class NeighborSampler():
+    """
+    Un échantillonneur de voisinages à k sauts et à effectif fixe, destiné à l'entraînement de
+    réseaux de neurones sur graphe par mini-lots.
+    """
+    def __init__(self, csr: CSRGraph, fanouts: List[int], attributes: Optional[Iterable] = None,
+                 direction: str = "both", replace: bool = False,
+                 seed: Optional[int] = None) -> None:
+        """
+        Crée un échantillonneur sur une représentation CSR.
+
+        Args:
+            csr: Représentation CSR du graphe.
+            fanouts: Nombre de voisins tirés par concept à chaque saut (-1 pour tous).
+            attributes: SCTID des attributs des relations utilisables (toutes par défaut).
+            direction: Sens des relations : sortantes ("out"), entrantes ("in") ou les deux
+                ("both").
+            replace: Indique si le tirage se fait avec remise.
+            seed: Graine du générateur aléatoire, pour des tirages reproductibles.
+        """
+        self.csr = csr
+        self.fanouts = list(fanouts)
+        self.replace = replace
+        self.indptr, self.indices, self.edge_ids = csr.adjacency(direction, attributes)
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self, seeds: Iterable) -> List[SampledBlock]:
+        """
+        Échantillonne le voisinage d'un mini-lot de concepts.
+
+        Args:
+            seeds: SCTID des concepts du mini-lot.
+
+        Returns:
+            Liste des blocs, du premier saut (destinations = concepts du mini-lot, dans l'ordre
+            fourni et sans doublon) au dernier.
+        """
+        frontier = _unique(self.csr.index_of(seeds))
+        blocks = []
+        for fanout in self.fanouts:
+            block = self._sample_hop(frontier, fanout)
+            blocks.append(block)
+            frontier = block.src_nodes
+        return blocks
+
+    def sample_sctids(self, seeds: Iterable) -> np.ndarray:
+        """
+        Échantillonne le voisinage d'un mini-lot et renvoie les SCTID de tous les concepts
+        atteints.
+
+        Args:
+            seeds: SCTID des concepts du mini-lot.
+
+        Returns:
+            Tableau des SCTID des concepts atteints, mini-lot compris.
+        """
+        blocks = self.sample(seeds)
+        if not blocks:
+            return self.csr.sctids[_unique(self.csr.index_of(seeds))]
+        return self.csr.sctids[blocks[-1].src_nodes]
+
+    def _sample_hop(self, frontier: np.ndarray, fanout: int) -> SampledBlock:
+        """
+        Tire au plus `fanout` voisins pour chaque concept de `frontier`.
+
+        Args:
+            frontier: Indices des concepts de destination.
+            fanout: Nombre de voisins tirés par concept (-1 pour tous).
+
+        Returns:
+            Le bloc correspondant au saut.
+        """
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+
+        if self.replace and fanout >= 0:
+            # Tirage avec remise : `fanout` positions uniformes dans chaque ligne non vide
+            k = np.where(counts > 0, fanout, 0)
+            seg = np.repeat(np.arange(len(frontier)), k)
+            pos = np.repeat(starts, k) + (self.rng.random(k.sum()) * counts[seg]).astype(np.int64)
+            kept = k
+        else:
+            # Tirage sans remise : clés aléatoires, puis les `fanout` plus petites par ligne
+            offsets = np.cumsum(counts) - counts
+            seg = np.repeat(np.arange(len(frontier)), counts)
+            rank = np.arange(counts.sum()) - np.repeat(offsets, counts)
+            pos = np.repeat(starts, counts) + rank
+            if fanout >= 0:
+                order = np.lexsort((self.rng.random(len(pos)), seg))
+                mask = rank < fanout
+                seg, pos = seg[mask], pos[order][mask]
+            kept = np.bincount(seg, minlength=len(frontier))
+
+        neighbors = self.indices[pos]
+
+        # Les destinations sont placées en tête des sources
+        nodes = np.concatenate([frontier, neighbors])
+        uniq, first, inverse = np.unique(nodes, return_index=True, return_inverse=True)
+        order = np.argsort(first, kind="stable")
+        local = np.empty(len(uniq), dtype=np.int64)
+        local[order] = np.arange(len(uniq))
+
+        indptr = np.zeros(len(frontier) + 1, dtype=np.int64)
+        np.cumsum(kept, out=indptr[1:])
+        return SampledBlock(uniq[order], frontier, indptr,
+                            local[inverse[len(frontier):]], self.edge_ids[pos])
+
+
+def _unique(idx: np.ndarray) -> np.ndarray:
+    """
+    Supprime les doublons d'un tableau d'indices en conservant l'ordre de première apparition.
+
+    Args:
+        idx: Tableau d'indices.
+
+    Returns:
+        Tableau d'indices sans doublon.
+    """
+    _, first = np.unique(idx, return_index=True)
+    return idx[np.sort(first)]
@@ -0,0 +1,61 @@
+import numpy as np
+
+from typing import Any, Iterable, List, Union
+
+# Un SCTID tel qu'accepté par l'API : entier (forme canonique) ou chaîne de chiffres
+SCTID = Union[int, str]
+
+# SCTID de l'attribut "Is a"
+IS_A = 116680003
+
+
+def is_int_keyed(sctids: Iterable) -> bool:
+    """
+    Indique si les SCTID d'un graphe sont stockés sous forme d'entiers (forme canonique produite
+    par `from_rf2` et `from_serialized`) plutôt que de chaînes, d'après le premier concept.
+
+    Args:
+        sctids: SCTID des concepts du graphe.
+
+    Returns:
+        Vrai si les SCTID sont des entiers.
+    """
+    for sctid in sctids:
+        return isinstance(sctid, (int, np.integer))
+    return False
+
+
+def to_key(sctid: Any, int_keys: bool) -> SCTID:
+    """
+    Convertit un SCTID donné sous forme de chaîne ou d'entier dans la forme des clés du graphe.
+    Les identifiants non numériques sont laissés tels quels.
+
+    Args:
+        sctid: SCTID à convertir.
+        int_keys: Indique si les clés du graphe sont des entiers (voir `is_int_keyed`).
+
+    Returns:
+        Le SCTID sous la forme des clés du graphe.
+    """
+    if int_keys:
+        if isinstance(sctid, str) and sctid.isdigit():
+            return int(sctid)
+        if isinstance(sctid, np.integer):
+            return int(sctid)
+    elif isinstance(sctid, (int, np.integer)):
+        return str(sctid)
+    return sctid
+
+
+def to_keys(sctids: Iterable, int_keys: bool) -> List[SCTID]:
+    """
+    Convertit plusieurs SCTID dans la forme des clés du graphe (voir `to_key`).
+
+    Args:
+        sctids: SCTID à convertir.
+        int_keys: Indique si les clés du graphe sont des entiers.
+
+    Returns:
+        Liste des SCTID convertis.
+    """
+    return [to_key(s, int_keys) for s in sctids]
@@ -0,0 +1,738 @@
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+import re
+
+from functools import partial
+from itertools import chain
+from snomed_graphe.csr import row_pointers, to_fixed
+from snomed_graphe.text import fold, tokenize
+from typing import Any, Dict, Iterable, List, Optional, Self, Tuple
+
+_QUERY = re.compile(r'"[^"]*"|\S+')
+
+# Motifs partagés par les processus de recherche (initialisés par `_init_worker`)
+_WORKER: Dict[str, Any] = {}
+
+
+class _Documents():
+    """
+    Les métadonnées des documents (descriptions) d'un index de recherche : concept, langue et
+    acceptabilité de chaque document.
+    """
+    def __init__(self, concepts: np.ndarray, lang: np.ndarray, acceptability: np.ndarray) -> None:
+        self.concepts = concepts
+        self.lang = lang
+        self.acceptability = acceptability
+
+    def __len__(self) -> int:
+        return len(self.concepts)
+
+    def select(self, docs: np.ndarray, accept: str = "", lang: str = "fr") -> np.ndarray:
+        """
+        Filtre des documents selon leur acceptabilité et leur langue.
+
+        Args:
+            docs: Documents à filtrer.
+            accept: Acceptabilité recherchée : terme préféré ("PREF"), synonyme acceptable
+                ("ACCEPT"), les deux ("") ou FSN ("FSN").
+            lang: Langue recherchée (ignorée pour les FSN).
+
+        Returns:
+            Les documents conservés.
+        """
+        if accept == "FSN":
+            return docs[self.acceptability[docs] == "FSN"]
+        docs = docs[(self.lang[docs] == lang) & (self.acceptability[docs] != "FSN")]
+        if accept:
+            docs = docs[self.acceptability[docs] == accept]
+        return docs
+
+
+class TokenIndex(_Documents):
+    """
+    Un index inversé des mots des descriptions (PT, SYN et FSN) pour la recherche plein texte.
+
+    Chaque description est un document : les listes de documents de chaque mot (postings) et
+    la suite des mots de chaque document (pour la recherche d'expressions exactes) sont
+    stockées au format CSR.
+    """
+    def __init__(self, concepts: np.ndarray, lang: np.ndarray, acceptability: np.ndarray,
+                 fsn_codes: np.ndarray, fsn: np.ndarray, vocabulary: np.ndarray,
+                 postings_ptr: np.ndarray, postings: np.ndarray, doc_ptr: np.ndarray,
+                 doc_tokens: np.ndarray) -> None:
+        """
+        Crée un index à partir de tableaux déjà construits.
+
+        Args:
+            concepts: SCTID du concept de chaque document.
+            lang: Langue de chaque document.
+            acceptability: Acceptabilité de chaque document ("PREF", "ACCEPT" ou "FSN").
+            fsn_codes: Code du FSN du concept de chaque document.
+            fsn: FSN, dans l'ordre des codes.
+            vocabulary: Mots indexés, triés.
+            postings_ptr: Pointeurs des listes de documents de chaque mot.
+            postings: Documents contenant chaque mot, triés.
+            doc_ptr: Pointeurs des suites de mots de chaque document.
+            doc_tokens: Identifiants des mots de chaque document, dans l'ordre du terme.
+        """
+        super().__init__(concepts, lang, acceptability)
+        self.fsn_codes = fsn_codes
+        self.fsn = fsn
+        self.vocabulary = vocabulary
+        self.postings_ptr = postings_ptr
+        self.postings = postings
+        self.doc_ptr = doc_ptr
+        self.doc_tokens = doc_tokens
+        self._vocabulary = pd.Index(vocabulary)
+
+    def __repr__(self) -> str:
+        return f"TokenIndex({len(self.concepts)} descriptions, {len(self.vocabulary)} mots)"
+
+    @classmethod
+    def from_descriptions(cls, desc: pd.DataFrame) -> Self:
+        """
+        Construit l'index d'une table de descriptions.
+
+        Args:
+            desc: DataFrame contenant les colonnes `conceptId`, `fsn`, `term`, `acceptability`
+                et `lang`.
+
+        Returns:
+            Un objet TokenIndex.
+        """
+        tokens = [tokenize(t) if isinstance(t, str) else [] for t in desc.loc[:, "term"]]
+        lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+        ids, vocabulary = pd.factorize(pd.Series(list(chain.from_iterable(tokens)),
+                                                 dtype=object), sort=True)
+        fsn_codes, fsn = pd.factorize(desc.loc[:, "fsn"].astype(object).fillna(""))
+
+        # Listes de documents : couples (mot, document) uniques triés par mot puis document
+        n = max(len(tokens), 1)
+        docs = np.repeat(np.arange(len(tokens), dtype=np.int64), lengths)
+        pairs = _sorted_unique(ids.astype(np.int64) * n + docs)
+
+        doc_ptr = np.zeros(len(tokens) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=doc_ptr[1:])
+        return cls(desc.loc[:, "conceptId"].to_numpy(dtype=object),
+                   desc.loc[:, "lang"].to_numpy(dtype=str),
+                   desc.loc[:, "acceptability"].to_numpy(dtype=str),
+                   fsn_codes.astype(np.int32), np.asarray(fsn, dtype=object),
+                   np.asarray(vocabulary, dtype=object), row_pointers(pairs // n, len(vocabulary)),
+                   (pairs % n).astype(np.int32), doc_ptr, ids.astype(np.int32))
+
+    @classmethod
+    def load(cls, path: str) -> Self:
+        """
+        Charge un index sauvegardé par `TokenIndex.save`.
+
+        Args:
+            path: Chemin du fichier `.npz`.
+
+        Returns:
+            Un objet TokenIndex.
+        """
+        with np.load(path) as a:
+            return cls(a["concepts"].astype(object), a["lang"], a["acceptability"],
+                       a["fsn_codes"], a["fsn"].astype(object), a["vocabulary"].astype(object),
+                       a["postings_ptr"], a["postings"], a["doc_ptr"], a["doc_tokens"])
+
+    def save(self, path: str, signature: Optional[str] = None) -> None:
+        """
+        Sauvegarde l'index dans un fichier `.npz` (sans pickle).
+
+        Args:
+            path: Chemin du fichier de sauvegarde.
+            signature: Signature du graphe indexé, enregistrée pour vérifier au chargement que
+                l'index lui correspond toujours (voir `saved_signature`).
+        """
+        extra = {} if signature is None else {"signature": np.asarray(signature)}
+        np.savez(path, concepts=to_fixed(self.concepts), lang=self.lang,
+                 acceptability=self.acceptability, fsn_codes=self.fsn_codes,
+                 fsn=to_fixed(self.fsn), vocabulary=to_fixed(self.vocabulary),
+                 postings_ptr=self.postings_ptr, postings=self.postings, doc_ptr=self.doc_ptr,
+                 doc_tokens=self.doc_tokens, **extra)
+
+    @staticmethod
+    def saved_signature(path: str) -> Optional[str]:
+        """
+        Lit la signature du graphe indexé enregistrée par `TokenIndex.save`.
+
+        Args:
+            path: Chemin du fichier `.npz`.
+
+        Returns:
+            Signature du graphe, ou None si le fichier n'en contient pas.
+        """
+        with np.load(path) as a:
+            return str(a["signature"]) if "signature" in a.files else None
+
+    def search(self, query: str) -> np.ndarray:
+        """
+        Recherche les documents répondant à une requête. Les mots d'une requête doivent tous
+        être présents (ET), `OR` sépare des alternatives et les guillemets délimitent une
+        expression exacte : `infarctus "du myocarde" OR idm`.
+
+        Args:
+            query: Requête.
+
+        Returns:
+            Tableau trié des documents trouvés.
+        """
+        found = [self._search_clause(words, phrases) for words, phrases in _parse(query)]
+        if not found:
+            return np.zeros(0, dtype=np.int32)
+        return np.unique(np.concatenate(found))
+
+    def fsn_mask(self, docs: np.ndarray, fsn: str, regex: bool = False,
+                 case: bool = False) -> np.ndarray:
+        """
+        Indique pour chaque document si le FSN de son concept contient `fsn`. La recherche
+        porte sur les FSN distincts et non sur chaque document.
+
+        Args:
+            docs: Documents à tester.
+            fsn: Terme à rechercher dans les FSN.
+            regex: Indique si `fsn` est une regex ou non.
+            case: Indique si la recherche est sensible à la casse.
+
+        Returns:
+            Masque booléen des documents.
+        """
+        found = pd.Series(self.fsn, dtype=object).str.contains(fsn, regex=regex, case=case)
+        return found.to_numpy(dtype=bool)[self.fsn_codes[docs]]
+
+    def _postings(self, token: str) -> np.ndarray:
+        """
+        Renvoie les documents contenant un mot.
+
+        Args:
+            token: Mot recherché.
+
+        Returns:
+            Tableau trié des documents.
+        """
+        i = self._vocabulary.get_indexer([token])[0]
+        if i < 0:
+            return self.postings[:0]
+        return self.postings[self.postings_ptr[i]:self.postings_ptr[i + 1]]
+
+    def _search_clause(self, words: List[str], phrases: List[List[str]]) -> np.ndarray:
+        """
+        Recherche les documents contenant tous les mots et toutes les expressions d'une clause.
+
+        Args:
+            words: Mots de la clause.
+            phrases: Expressions exactes de la clause, sous forme de listes de mots.
+
+        Returns:
+            Tableau trié des documents.
+        """
+        postings = sorted((self._postings(t) for t in set(words).union(*phrases)), key=len)
+        if not postings:
+            return np.zeros(0, dtype=np.int32)
+        docs = postings[0]
+        for p in postings[1:]:
+            docs = np.intersect1d(docs, p, assume_unique=True)
+
+        # Vérification de l'ordre des mots des expressions exactes sur les seuls candidats
+        for phrase in phrases:
+            docs = self._phrase_docs(docs, self._vocabulary.get_indexer(phrase))
+        return docs
+
+    def _phrase_docs(self, docs: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        """
+        Filtre les documents dans lesquels la suite de mots `ids` apparaît, en testant toutes
+        les positions des documents candidats à la fois.
+
+        Args:
+            docs: Documents candidats, triés.
+            ids: Identifiants des mots de l'expression.
+
+        Returns:
+            Tableau trié des documents contenant l'expression.
+        """
+        starts = self.doc_ptr[docs]
+        counts = self.doc_ptr[docs + 1] - starts
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        pos = np.repeat(starts, counts) + offsets
+        owner = np.repeat(docs, counts)
+
+        # Positions où l'expression commence et tient dans le document
+        keep = (self.doc_tokens[pos] == ids[0]) & (pos + len(ids) <= np.repeat(starts + counts,
+                                                                                 counts))
+        pos, owner = pos[keep], owner[keep]
+        for j in range(1, len(ids)):
+            keep = self.doc_tokens[pos + j] == ids[j]
+            pos, owner = pos[keep], owner[keep]
+        return np.unique(owner)
+
+
+class TrigramIndex(_Documents):
+    """
+    Un index des trigrammes de caractères des descriptions (PT, SYN et FSN) pour la recherche
+    approchée, tolérante aux fautes de frappe, à la casse et aux accents.
+
+    Les termes sont normalisés par `fold` et encadrés d'espaces ("  term "), puis chaque
+    trigramme est codé par un entier de 63 bits (trois points de code Unicode de 21 bits).
+    """
+    def __init__(self, concepts: np.ndarray, lang: np.ndarray, acceptability: np.ndarray,
+                 vocabulary: np.ndarray, postings_ptr: np.ndarray, postings: np.ndarray,
+                 sizes: np.ndarray) -> None:
+        """
+        Crée un index à partir de tableaux déjà construits.
+
+        Args:
+            concepts: SCTID du concept de chaque document.
+            lang: Langue de chaque document.
+            acceptability: Acceptabilité de chaque document ("PREF", "ACCEPT" ou "FSN").
+            vocabulary: Codes des trigrammes indexés, triés.
+            postings_ptr: Pointeurs des listes de documents de chaque trigramme.
+            postings: Documents contenant chaque trigramme, triés.
+            sizes: Nombre de trigrammes distincts de chaque document.
+        """
+        super().__init__(concepts, lang, acceptability)
+        self.vocabulary = vocabulary
+        self.postings_ptr = postings_ptr
+        self.postings = postings
+        self.sizes = sizes
+
+    def __repr__(self) -> str:
+        return f"TrigramIndex({len(self.concepts)} descriptions, {len(self.vocabulary)} trigrammes)"
+
+    @classmethod
+    def from_descriptions(cls, desc: pd.DataFrame) -> Self:
+        """
+        Construit l'index d'une table de descriptions.
+
+        Args:
+            desc: DataFrame contenant les colonnes `conceptId`, `term`, `acceptability` et
+                `lang`.
+
+        Returns:
+            Un objet TrigramIndex.
+        """
+        terms = [fold(t) if isinstance(t, str) else "" for t in desc.loc[:, "term"]]
+        keys, docs = _trigrams(terms)
+        vocabulary, ids = np.unique(keys, return_inverse=True)
+
+        # Couples (trigramme, document) uniques triés par trigramme puis document
+        n = max(len(terms), 1)
+        pairs = _sorted_unique(ids.astype(np.int64) * n + docs)
+        postings = (pairs % n).astype(np.int32)
+        return cls(desc.loc[:, "conceptId"].to_numpy(dtype=object),
+                   desc.loc[:, "lang"].to_numpy(dtype=str),
+                   desc.loc[:, "acceptability"].to_numpy(dtype=str), vocabulary,
+                   row_pointers(pairs // n, len(vocabulary)), postings,
+                   np.bincount(postings, minlength=len(terms)).astype(np.int32))
+
+    def search(self, term: str, min_similarity: float = 0.3, accept: str = "",
+               lang: str = "fr") -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recherche les documents proches d'un terme, selon le coefficient de Dice de leurs
+        trigrammes : 2 x trigrammes communs / (trigrammes du terme + trigrammes du document).
+
+        Seules les listes des trigrammes les plus rares sont parcourues : un document atteignant
+        `min_similarity` contient forcément au moins l'un d'entre eux.
+
+        Args:
+            term: Terme recherché.
+            min_similarity: Similarité minimale des documents renvoyés (entre 0 et 1).
+            accept: Acceptabilité recherchée ("PREF", "ACCEPT", "" pour les deux ou "FSN").
+            lang: Langue recherchée (ignorée pour les FSN).
+
+        Returns:
+            Tuple contenant les documents trouvés et leur similarité.
+        """
+        keys, _ = _trigrams([fold(term)])
+        keys = np.unique(keys)
+        ids = np.searchsorted(self.vocabulary, keys)
+        known = ids < len(self.vocabulary)
+        ids = ids[known][self.vocabulary[ids[known]] == keys[known]]
+        if not len(ids):
+            return np.zeros(0, dtype=np.int32), np.zeros(0)
+
+        # Génération des candidats à partir des trigrammes les plus rares, dont les
+        # occurrences sont comptées au passage
+        lengths = self.postings_ptr[ids + 1] - self.postings_ptr[ids]
+        ids = ids[np.argsort(lengths, kind="stable")]
+        q = len(keys)
+        shared = max(int(np.ceil(min_similarity * q / (2 - min_similarity))), 1)
+        rare = max(len(ids) - shared + 1, 1)
+        counts = np.bincount(np.concatenate([self._postings(i) for i in ids[:rare]]),
+                             minlength=len(self))
+        docs = np.flatnonzero(counts).astype(np.int32)
+
+        # Le coefficient de Dice borne le nombre de trigrammes des documents retenus
+        sizes = self.sizes[docs]
+        keep = ((sizes * (2 - min_similarity) >= min_similarity * q)
+                & (min_similarity * sizes <= q * (2 - min_similarity)))
+        docs = self.select(docs[keep], accept, lang)
+        counts = counts[docs]
+        needed = min_similarity * (q + self.sizes[docs]) / 2
+
+        # Trigrammes restants : recherche dichotomique sur les seuls candidats encore viables
+        for left, i in zip(range(len(ids) - rare, 0, -1), ids[rare:]):
+            viable = counts + left >= needed
+            docs, counts, needed = docs[viable], counts[viable], needed[viable]
+            postings = self._postings(i)
+            pos = np.minimum(np.searchsorted(postings, docs), len(postings) - 1)
+            counts += postings[pos] == docs
+
+        scores = 2 * counts / (q + self.sizes[docs])
+        keep = scores >= min_similarity
+        return docs[keep], scores[keep]
+
+    def _postings(self, i: int) -> np.ndarray:
+        """
+        Renvoie les documents contenant un trigramme.
+
+        Args:
+            i: Identifiant du trigramme.
+
+        Returns:
+            Tableau trié des documents.
+        """
+        return self.postings[self.postings_ptr[i]:self.postings_ptr[i + 1]]
+
+
+class PrefixIndex(_Documents):
+    """
+    Un index des PT et SYN (anglais et autre langue) triés par clé normalisée, pour
+    l'autocomplétion : les termes commençant par un préfixe forment une plage contiguë, trouvée
+    par dichotomie.
+
+    Les PT précèdent les SYN : chaque acceptabilité forme un bloc trié séparément, de sorte que
+    les k premiers concepts d'une plage sont obtenus sans trier les correspondances.
+    """
+    def __init__(self, concepts: np.ndarray, lang: np.ndarray, acceptability: np.ndarray,
+                 keys: np.ndarray, terms: np.ndarray, nodes: np.ndarray, semtag_codes: np.ndarray,
+                 semtags: np.ndarray, bounds: np.ndarray) -> None:
+        """
+        Crée un index à partir de tableaux déjà construits.
+
+        Args:
+            concepts: SCTID du concept de chaque description.
+            lang: Langue de chaque description.
+            acceptability: Acceptabilité de chaque description ("PREF" ou "ACCEPT").
+            keys: Clé normalisée de chaque description, triée au sein de chaque bloc.
+            terms: Terme original de chaque description.
+            nodes: Indice (dans la représentation CSR) du concept de chaque description.
+            semtag_codes: Code du tag sémantique du concept de chaque description.
+            semtags: Tags sémantiques, dans l'ordre des codes.
+            bounds: Limites des blocs d'acceptabilité (PT puis SYN).
+        """
+        super().__init__(concepts, lang, acceptability)
+        self.keys = keys
+        self.terms = terms
+        self.nodes = nodes
+        self.semtag_codes = semtag_codes
+        self.semtags = semtags
+        self.bounds = bounds
+
+    def __repr__(self) -> str:
+        return f"PrefixIndex({len(self.concepts)} descriptions)"
+
+    @classmethod
+    def from_descriptions(cls, desc: pd.DataFrame, nodes: np.ndarray) -> Self:
+        """
+        Construit l'index d'une table de descriptions.
+
+        Args:
+            desc: DataFrame contenant les colonnes `conceptId`, `fsn`, `term`, `acceptability`
+                et `lang`.
+            nodes: Indice du concept de chaque description dans la représentation CSR.
+
+        Returns:
+            Un objet PrefixIndex.
+        """
+        keep = desc.loc[:, "term"].notna().to_numpy()
+        desc, nodes = desc.loc[keep], nodes[keep]
+        keys = np.array([fold(t, punctuation=False) for t in desc.loc[:, "term"]], dtype=object)
+        rank = (desc.loc[:, "acceptability"].to_numpy(dtype=str) != "PREF").astype(np.int8)
+        order = np.argsort(keys, kind="stable")
+        order = order[np.argsort(rank[order], kind="stable")]
+
+        semtags = (desc.loc[:, "fsn"].astype(object).fillna("").str.split(" (", regex=False)
+                   .str[-1].str.rstrip(")"))
+        semtag_codes, semtag_values = pd.factorize(semtags)
+        return cls(desc.loc[:, "conceptId"].to_numpy(dtype=object)[order],
+                   desc.loc[:, "lang"].to_numpy(dtype=str)[order],
+                   desc.loc[:, "acceptability"].to_numpy(dtype=str)[order], keys[order],
+                   desc.loc[:, "term"].to_numpy(dtype=object)[order], nodes[order],
+                   semtag_codes[order].astype(np.int32), np.asarray(semtag_values, dtype=object),
+                   np.searchsorted(rank[order], [0, 1, 2]))
+
+    def complete(self, prefix: str, k: int = 10, semtag: str = "",
+                 allowed: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Recherche les k premiers concepts ayant une description commençant par un préfixe : les
+        concepts trouvés par un PT d'abord, puis ceux trouvés par un SYN, par ordre alphabétique.
+
+        Args:
+            prefix: Préfixe recherché (normalisé comme les termes).
+            k: Nombre maximal de concepts renvoyés.
+            semtag: Tag sémantique auquel limiter la recherche.
+            allowed: Masque des concepts (indices CSR) auxquels limiter la recherche.
+
+        Returns:
+            Tableau de la meilleure description de chacun des concepts trouvés.
+        """
+        key = fold(prefix, punctuation=False)
+        code = -1
+        if semtag:
+            codes = np.flatnonzero(self.semtags == semtag)
+            if not len(codes):
+                return np.zeros(0, dtype=np.int64)
+            code = codes[0]
+
+        found, seen = [], set()
+        for lo, hi in zip(self.bounds[:-1], self.bounds[1:]):
+            start = lo + np.searchsorted(self.keys[lo:hi], key, side="left")
+            end = lo + np.searchsorted(self.keys[lo:hi], key + "\U0010ffff", side="left")
+
+            # Parcours de la plage par blocs de taille croissante jusqu'à k concepts
+            size = 4 * k
+            while start < end and len(found) < k:
+                docs = np.arange(start, min(start + size, end))
+                if code >= 0:
+                    docs = docs[self.semtag_codes[docs] == code]
+                if allowed is not None:
+                    docs = docs[allowed[self.nodes[docs]]]
+                for doc in docs:
+                    concept = self.concepts[doc]
+                    if concept not in seen:
+                        seen.add(concept)
+                        found.append(doc)
+                        if len(found) == k:
+                            break
+                start, size = start + size, size * 4
+        return np.asarray(found, dtype=np.int64)
+
+
+class TermMatcher():
+    """
+    Un automate recherchant simultanément de nombreux termes (ou motifs) dans des textes, en une
+    seule passe.
+
+    Les termes littéraux sont compilés en une unique regex en forme d'arbre préfixe
+    (`myo(?:carde(?: anterieur)?)?`), essayée à chaque position du texte : elle renvoie le plus
+    long terme commençant à cette position, les termes qui en sont des préfixes s'en déduisant.
+    Les regex arbitraires ne pouvant être fusionnées, chacune est essayée sur chaque texte.
+    """
+    def __init__(self, terms: Iterable[str], regex: bool = False, case: bool = False) -> None:
+        """
+        Compile les termes à rechercher.
+
+        Args:
+            terms: Termes ou motifs à rechercher.
+            regex: Indique si les termes sont des regex ou non.
+            case: Indique si la recherche est sensible à la casse.
+        """
+        self.terms = list(terms)
+        self.regex = regex
+        self.case = case
+        flags = 0 if case else re.IGNORECASE
+        if regex:
+            self.patterns = [re.compile(t, flags) for t in self.terms]
+            self.prefixes = {}
+            return
+
+        # Termes regroupés par clé (minuscules si la casse est ignorée), puis, pour chaque clé,
+        # termes dont la clé est un préfixe
+        keys: Dict[str, List[int]] = {}
+        for i, t in enumerate(self.terms):
+            keys.setdefault(t if case else t.lower(), []).append(i)
+        self.prefixes = {k: [i for j in range(len(k) + 1) for i in keys.get(k[:j], [])]
+                         for k in keys}
+        self.patterns = [re.compile(f"(?=({_trie_pattern(keys)}))", flags)] if keys else []
+
+    def __repr__(self) -> str:
+        return f"TermMatcher({len(self.terms)} termes)"
+
+    def match(self, texts: Iterable[str], processes: int = 1,
+              chunk_size: int = 100000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Recherche les termes dans des textes.
+
+        Args:
+            texts: Textes dans lesquels chercher (sans saut de ligne).
+            processes: Nombre de processus de recherche.
+            chunk_size: Nombre de textes par tâche lorsque `processes` > 1.
+
+        Returns:
+            Tuple contenant les couples (terme, texte) trouvés, triés par terme puis texte :
+            indices des termes et indices des textes.
+        """
+        texts = list(texts)
+        if processes == 1:
+            chunks = [(0, texts)]
+        else:
+            chunks = [(i, texts[i:i + chunk_size]) for i in range(0, len(texts), chunk_size)]
+
+        args = (self.patterns, self.prefixes, self.regex, self.case)
+        if processes == 1:
+            # Motifs propres à l'appel : plusieurs recherches peuvent s'exécuter en même temps
+            found = list(map(partial(_match, _state(*args)), chunks))
+        else:
+            with mp.Pool(processes, initializer=_init_worker, initargs=args) as pool:
+                found = pool.map(_match_chunk, chunks)
+
+        n = max(len(texts), 1)
+        pairs = _sorted_unique(np.concatenate([np.zeros(0, dtype=np.int64)]
+                                              + [terms * n + rows for terms, rows in found]))
+        return pairs // n, pairs % n
+
+
+def _init_worker(patterns: List[re.Pattern], prefixes: Dict[str, List[int]], regex: bool,
+                 case: bool) -> None:
+    """
+    Initialise les motifs d'un processus de recherche, transmis une seule fois par processus.
+    """
+    _WORKER.update(_state(patterns, prefixes, regex, case))
+
+
+def _state(patterns: List[re.Pattern], prefixes: Dict[str, List[int]], regex: bool,
+           case: bool) -> Dict[str, Any]:
+    """
+    Regroupe les motifs et paramètres nécessaires à une recherche.
+    """
+    return dict(patterns=patterns, prefixes=prefixes, regex=regex, case=case)
+
+
+def _match_chunk(chunk: Tuple[int, List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Recherche les motifs d'un processus de recherche dans un bloc de textes (voir `_match`).
+    """
+    return _match(_WORKER, chunk)
+
+
+def _match(state: Dict[str, Any], chunk: Tuple[int, List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Recherche des motifs dans un bloc de textes. Une regex est essayée sur chaque texte ; l'arbre
+    préfixe des termes littéraux, qui ne peut trouver de saut de ligne, parcourt une seule fois
+    les textes réunis en un texte d'une ligne par texte.
+
+    Args:
+        state: Motifs et paramètres de la recherche (voir `_state`).
+        chunk: Indice du premier texte du bloc et textes du bloc.
+
+    Returns:
+        Tuple contenant les indices des termes et des textes de chaque occurrence trouvée.
+    """
+    offset, texts = chunk
+    if state["regex"]:
+        terms, rows = [], []
+        for i, pattern in enumerate(state["patterns"]):
+            found = [j for j, text in enumerate(texts) if pattern.search(text)]
+            terms.extend([i] * len(found))
+            rows.extend(found)
+        return np.asarray(terms, dtype=np.int64), offset + np.asarray(rows, dtype=np.int64)
+
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts)) + 1
+    starts = np.cumsum(lengths) - lengths
+    text = "\n".join(texts)
+
+    terms, positions = [], []
+    prefixes, case = state["prefixes"], state["case"]
+    for pattern in state["patterns"]:
+        for m in pattern.finditer(text):
+            found = prefixes.get(m.group(1) if case else m.group(1).lower(), [])
+            terms.extend(found)
+            positions.extend([m.start()] * len(found))
+
+    rows = np.searchsorted(starts, np.asarray(positions, dtype=np.int64), side="right") - 1
+    return np.asarray(terms, dtype=np.int64), offset + rows
+
+
+def _sorted_unique(a: np.ndarray) -> np.ndarray:
+    """
+    Trie un tableau d'entiers et en retire les doublons. Équivalent de `np.unique`, bien plus
+    rapide sur les dizaines de millions de valeurs presque toutes distinctes des couples
+    (mot, document).
+
+    Args:
+        a: Tableau d'entiers.
+
+    Returns:
+        Tableau trié des valeurs distinctes.
+    """
+    a = np.sort(a)
+    return a[np.concatenate(([True], a[1:] != a[:-1]))] if len(a) else a
+
+
+def _trigrams(terms: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calcule les codes des trigrammes de caractères de plusieurs termes en une seule passe sur
+    leurs points de code.
+
+    Args:
+        terms: Termes normalisés.
+
+    Returns:
+        Tuple contenant le code de chaque trigramme et le terme dont il est issu.
+    """
+    padded = [f"  {t} " for t in terms]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    codes = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+
+    starts = np.cumsum(lengths) - lengths
+    counts = lengths - 2
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    pos = np.repeat(starts, counts) + offsets
+    keys = (codes[pos] << 42) | (codes[pos + 1] << 21) | codes[pos + 2]
+    return keys, np.repeat(np.arange(len(terms), dtype=np.int64), counts)
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Construit une regex reconnaissant un ensemble de mots, factorisée selon leurs préfixes
+    communs et préférant la correspondance la plus longue.
+
+    Args:
+        words: Mots à reconnaître.
+
+    Returns:
+        La regex, sans groupe capturant.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for c in word:
+            node = node.setdefault(c, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(c) + build(child) for c, child in sorted(node.items()) if c]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if "" in node else "")
+
+    return build(trie)
+
+
+def _parse(query: str) -> List[Tuple[List[str], List[List[str]]]]:
+    """
+    Découpe une requête en clauses séparées par `OR`, chacune composée de mots et
+    d'expressions exactes. Un élément formé de plusieurs mots (`sous-endocardique`) est traité
+    comme une expression exacte.
+
+    Args:
+        query: Requête.
+
+    Returns:
+        Liste des clauses (mots, expressions).
+    """
+    clauses = [([], [])]
+    for item in _QUERY.findall(query):
+        if item == "OR":
+            clauses.append(([], []))
+            continue
+        tokens = tokenize(item.strip('"'))
+        if len(tokens) == 1:
+            clauses[-1][0].append(tokens[0])
+        elif tokens:
+            clauses[-1][1].append(tokens)
+    return [c for c in clauses if c[0] or c[1]]
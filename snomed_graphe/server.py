@@ -0,0 +1,408 @@
+import argparse
+import json
+import networkx as nx
+import re
+import snomed_graphe.component as sct
+import threading
+
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from snomed_graphe.graphe import SnomedGraph
+from snomed_graphe.io import from_serialized
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+# Nombre maximal de requêtes d'un lot (POST /batch)
+MAX_BATCH = 1000
+
+# Taille maximale en octets du corps d'une requête POST
+MAX_BODY = 1 << 20
+
+# Paramètres des requêtes désignant des concepts, vérifiés avant l'exécution
+_CONCEPT_PARAMS = ("sctid", "src", "tgt", "hierarchy")
+
+# Paramètres de `search_in_desc` acceptés par le service, avec leur type
+_SEARCH_PARAMS = {"hierarchy": str, "accept": str, "is_in": bool, "lang": str,
+                  "regex_term": bool, "case_term": bool, "fsn": str, "regex_fsn": bool,
+                  "case_fsn": bool, "fold_term": bool, "strip_punct": bool, "semtag": str}
+
+
+class ConceptNotFound(LookupError):
+    """
+    Un concept désigné par les paramètres d'une requête est absent du graphe.
+    """
+
+
+def details_to_dict(c: sct.ConceptDetails) -> Dict[str, Any]:
+    """
+    Convertit un ConceptDetails en dictionnaire sérialisable en JSON. Les SCTID sont donnés
+    sous forme de chaînes, un entier de 18 chiffres n'étant pas représentable exactement en
+    JavaScript.
+
+    Args:
+        c: Détails d'un concept.
+
+    Returns:
+        Dictionnaire des détails du concept.
+    """
+    return {"sctid": str(c.sctid), "fsn": c.fsn, "pt_en": c.pt_en, "pt_lang": c.pt_lang,
+            "syn_en": c.syn_en, "syn_lang": c.syn_lang}
+
+
+def concept_to_dict(c: sct.Concept) -> Dict[str, Any]:
+    """
+    Convertit un Concept en dictionnaire sérialisable en JSON : détails, parents, enfants et
+    relations non hiérarchiques par groupe relationnel.
+
+    Args:
+        c: Concept complet.
+
+    Returns:
+        Dictionnaire du concept.
+    """
+    return {**details_to_dict(c.concept_details),
+            "parents": [details_to_dict(p) for p in c.parents],
+            "children": [details_to_dict(e) for e in c.children],
+            "relationships": {str(group): [{"attribute": details_to_dict(r.attribute),
+                                            "tgt": details_to_dict(r.tgt)} for r in rels]
+                              for group, rels in c.relationships.items()}}
+
+
+def _flag(value: Any) -> bool:
+    """
+    Convertit un paramètre booléen, reçu tel quel en JSON ou sous forme de chaîne dans une URL.
+    """
+    if isinstance(value, bool):
+        return value
+    if str(value).lower() in ("1", "true", "yes", "oui"):
+        return True
+    if str(value).lower() in ("0", "false", "no", "non", ""):
+        return False
+    raise ValueError(f"Valeur booléenne invalide : {value}")
+
+
+class QueryService():
+    """
+    Un service répondant aux requêtes adressées à un graphe chargé une seule fois, partagé par
+    les threads du serveur. Chaque requête est nommée par une méthode ("details", "full",
+    "parents", "children", "ancestors", "descendants", "path", "hierarchical_path", "search")
+    et ses paramètres, et son résultat sérialisable en JSON est conservé dans un cache LRU.
+    """
+    def __init__(self, graph: SnomedGraph, cache_size: int = 10000) -> None:
+        """
+        Crée le service.
+
+        Args:
+            graph: Graphe interrogé.
+            cache_size: Nombre maximal de réponses conservées (0 pour ne rien conserver).
+        """
+        if cache_size < 0:
+            raise ValueError("La taille du cache doit être positive ou nulle.")
+        self.graph = graph
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._methods: Dict[str, Callable[..., Any]] = {
+            "details": self._details,
+            "full": self._full,
+            "parents": lambda sctid: self._concepts(self.graph.get_parents(sctid)),
+            "children": lambda sctid: self._concepts(self.graph.get_children(sctid)),
+            "ancestors": lambda sctid, degree=999999: self._concepts(
+                self.graph.get_ancestors(sctid, int(degree))),
+            "descendants": lambda sctid, degree=999999: self._concepts(
+                self.graph.get_descendants(sctid, int(degree))),
+            "path": lambda src, tgt: self._concepts(self.graph.path(src, tgt)),
+            "hierarchical_path": lambda src, tgt: self._concepts(
+                self.graph.hierarchical_path(src, tgt)),
+            "search": self._search,
+        }
+
+    def __repr__(self) -> str:
+        return f"QueryService({len(self._cache)} réponses en cache)"
+
+    @property
+    def methods(self) -> List[str]:
+        return list(self._methods)
+
+    def warm_up(self) -> None:
+        """
+        Construit d'avance les structures conservées par le graphe dont dépendent les requêtes
+        (représentation CSR, table des descriptions), pour que les premières requêtes ne les
+        attendent pas.
+        """
+        self.graph.csr
+        # Tables lues par `search_in_desc` (voir `SnomedGraph._filter_desc`)
+        self.graph._desc_table()
+        self.graph._desc_nodes()
+
+    def query(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Répond à une requête, en réutilisant la réponse conservée pour les mêmes paramètres.
+
+        Args:
+            method: Nom de la requête (voir `methods`).
+            params: Paramètres de la requête, par exemple {"sctid": "404684003"}.
+
+        Returns:
+            Résultat sérialisable en JSON.
+
+        Raises:
+            ValueError: Requête inconnue ou paramètres invalides.
+            ConceptNotFound: Concept absent du graphe.
+            nx.NetworkXNoPath: Aucun chemin entre les concepts.
+        """
+        if method not in self._methods:
+            raise ValueError(f"Requête inconnue : {method}")
+        params = params or {}
+        self._check_concepts(params)
+        key = json.dumps([method, params], sort_keys=True, default=str)
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            self.misses += 1
+
+        try:
+            result = self._methods[method](**params)
+        except TypeError as e:
+            raise ValueError(f"Paramètres invalides pour {method} : {e}") from e
+
+        if self.cache_size:
+            with self._lock:
+                self._cache[key] = result
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return result
+
+    def batch(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Répond à un lot de requêtes, dans l'ordre. L'échec d'une requête n'interrompt pas le
+        lot : sa réponse contient alors l'erreur et le statut HTTP correspondant.
+
+        Args:
+            queries: Requêtes, de la forme {"method": ..., "params": {...}}.
+
+        Returns:
+            Réponses, de la forme {"result": ...} ou {"error": ..., "status": ...}.
+        """
+        if len(queries) > MAX_BATCH:
+            raise ValueError(f"Un lot ne peut dépasser {MAX_BATCH} requêtes.")
+        responses = []
+        for q in queries:
+            try:
+                if not isinstance(q, dict):
+                    raise ValueError("Une requête doit être un objet JSON.")
+                responses.append({"result": self.query(q.get("method", ""), q.get("params"))})
+            except Exception as e:
+                status, message = error_status(e)
+                responses.append({"error": message, "status": status})
+        return responses
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Renvoie l'état du service : taille du graphe et utilisation du cache.
+        """
+        with self._lock:
+            cached = len(self._cache)
+        return {"concepts": len(self.graph), "relations": self.graph.backend.number_of_edges(),
+                "root": str(self.graph.root), "backend": self.graph.backend.name,
+                "methods": self.methods, "cached": cached, "hits": self.hits,
+                "misses": self.misses}
+
+    def _check_concepts(self, params: Dict[str, Any]) -> None:
+        """
+        Vérifie que les concepts désignés par les paramètres d'une requête existent, pour
+        distinguer un concept absent d'une erreur interne.
+
+        Args:
+            params: Paramètres de la requête.
+        """
+        for name in [n for n in _CONCEPT_PARAMS if n in params]:
+            values = params[name]
+            for sctid in values if isinstance(values, list) else [values]:
+                if name == "hierarchy" and sctid == "":
+                    continue
+                if not isinstance(sctid, (str, int)) or isinstance(sctid, bool):
+                    raise ValueError(f"SCTID invalide : {sctid!r}")
+                if sctid not in self.graph:
+                    raise ConceptNotFound(sctid)
+
+    def _details(self, sctid: str) -> Dict[str, Any]:
+        return details_to_dict(self.graph.get_concept_details(sctid))
+
+    def _full(self, sctid: str) -> Dict[str, Any]:
+        return concept_to_dict(self.graph.get_full_concepts([sctid])[0])
+
+    def _concepts(self, concepts: List[sct.ConceptDetails]) -> List[Dict[str, Any]]:
+        return [details_to_dict(c) for c in concepts]
+
+    def _search(self, term: str, **filters: Any) -> List[str]:
+        unknown = set(filters) - set(_SEARCH_PARAMS)
+        if unknown:
+            raise ValueError(f"Filtres inconnus : {', '.join(sorted(unknown))}")
+        filters = {k: _flag(v) if _SEARCH_PARAMS[k] is bool else v for k, v in filters.items()}
+        return [str(s) for s in self.graph.search_in_desc(term, **filters)]
+
+
+def error_status(error: Exception) -> Tuple[int, str]:
+    """
+    Associe une erreur levée par une requête à un statut HTTP et à un message.
+
+    Args:
+        error: Erreur levée.
+
+    Returns:
+        Couple (statut, message) : 404 pour un concept ou un chemin introuvable, 400 pour une
+        requête invalide, 500 sinon (erreur interne, y compris un KeyError imprévu).
+    """
+    if isinstance(error, ConceptNotFound):
+        return 404, f"Concept absent du graphe : {error.args[0] if error.args else ''}"
+    if isinstance(error, (nx.NetworkXNoPath, nx.NodeNotFound)):
+        return 404, str(error)
+    if isinstance(error, (ValueError, re.error)):
+        return 400, str(error)
+    return 500, f"{type(error).__name__} : {error}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Traite les requêtes HTTP d'une connexion. HTTP/1.1 garde la connexion ouverte entre les
+    requêtes (keep-alive), chaque réponse précisant sa longueur.
+
+    - GET /<méthode>?<paramètres> : une requête, paramètres dans l'URL.
+    - POST /<méthode> : une requête, paramètres dans un objet JSON.
+    - POST /batch : un lot de requêtes, liste JSON de {"method": ..., "params": {...}}.
+    - GET /health : état du service.
+    """
+    protocol_version = "HTTP/1.1"
+    # En-têtes et corps étant écrits séparément, Nagle retarderait chaque réponse d'une
+    # connexion gardée ouverte jusqu'à l'accusé de réception différé du client (~40 ms)
+    disable_nagle_algorithm = True
+    # Délai d'inactivité en secondes d'une connexion, qui est alors fermée : un client lent ou
+    # un corps plus court que annoncé ne bloque pas indéfiniment le thread
+    timeout = 30
+    server: "SnomedServer"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        method = url.path.strip("/")
+        if method == "health":
+            return self._send(200, self.server.service.stats())
+        params = {k: v[-1] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+        self._answer(method, params)
+
+    def do_POST(self) -> None:
+        method = urlsplit(self.path).path.strip("/")
+        length = self.headers.get("Content-Length", "")
+        if not length.isdigit():
+            # La fin du corps étant inconnue, la connexion ne peut servir à d'autres requêtes
+            self.close_connection = True
+            return self._send(400, {"error": "En-tête Content-Length absent ou invalide."})
+        if int(length) > MAX_BODY:
+            self.close_connection = True
+            return self._send(413, {"error": f"Le corps ne peut dépasser {MAX_BODY} octets."})
+        try:
+            body = json.loads(self.rfile.read(int(length)) or b"{}")
+        except TimeoutError:
+            self.close_connection = True
+            return
+        except ValueError:
+            return self._send(400, {"error": "Corps de requête JSON invalide."})
+
+        if method == "batch":
+            if not isinstance(body, list):
+                return self._send(400, {"error": "Un lot doit être une liste de requêtes."})
+            try:
+                return self._send(200, {"results": self.server.service.batch(body)})
+            except ValueError as e:
+                return self._send(400, {"error": str(e)})
+        if not isinstance(body, dict):
+            return self._send(400, {"error": "Les paramètres doivent être un objet JSON."})
+        self._answer(method, body)
+
+    def _answer(self, method: str, params: Dict[str, Any]) -> None:
+        try:
+            result = self.server.service.query(method, params)
+        except Exception as e:
+            status, message = error_status(e)
+            return self._send(status, {"error": message})
+        self._send(200, {"result": result})
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class SnomedServer(ThreadingHTTPServer):
+    """
+    Un serveur HTTP/JSON multi-thread exposant un graphe chargé une seule fois (voir
+    `QueryService` et `_Handler` pour les routes).
+    """
+    daemon_threads = True
+    # La file par défaut (5) fait rejeter des connexions simultanées, réessayées après 1 s
+    request_queue_size = 128
+
+    def __init__(self, graph: SnomedGraph, host: str = "127.0.0.1", port: int = 8000,
+                 cache_size: int = 10000, verbose: bool = False) -> None:
+        """
+        Crée le serveur, sans le démarrer (voir `serve_forever`).
+
+        Args:
+            graph: Graphe interrogé.
+            host: Adresse d'écoute (locale par défaut).
+            port: Port d'écoute (0 pour un port libre choisi par le système).
+            cache_size: Nombre maximal de réponses conservées.
+            verbose: Indique si chaque requête est journalisée.
+        """
+        self.service = QueryService(graph, cache_size)
+        self.verbose = verbose
+        super().__init__((host, port), _Handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Charge un graphe sérialisé puis le sert en HTTP :
+    `python -m snomed_graphe.server chemin/graphe --port 8000`.
+    """
+    parser = argparse.ArgumentParser(description="Serveur HTTP/JSON de requêtes SNOMED CT.")
+    parser.add_argument("path", help="Fichier d'un graphe sauvegardé par `io.save`.")
+    parser.add_argument("--lang", default="fr")
+    parser.add_argument("--backend", default="networkx", choices=["networkx", "csr"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache-size", type=int, default=10000)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    graph = from_serialized(args.path, args.lang, args.backend)
+    server = SnomedServer(graph, args.host, args.port, args.cache_size, args.verbose)
+    server.service.warm_up()
+    print(f"Serveur à l'écoute sur {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
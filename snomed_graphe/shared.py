@@ -0,0 +1,362 @@
+import multiprocessing as mp
+import numpy as np
+import pandas as pd
+import re
+import weakref
+
+from multiprocessing.shared_memory import SharedMemory
+from snomed_graphe.backend import CSRBackend
+from snomed_graphe.csr import bfs, bfs_path
+from snomed_graphe.graphe import SnomedGraph
+from snomed_graphe.sctid import IS_A, SCTID
+from snomed_graphe.terms import TermTable, term_rows
+from typing import Any, Dict, Iterable, List, Optional, Self, Tuple
+
+# Tableaux partagés par les processus de requête (initialisés par `_init_worker`)
+_WORKER: Dict[str, Any] = {}
+
+# Description d'un tableau publié : nom du segment, type et forme
+ArraySpec = Tuple[str, str, Tuple[int, ...]]
+
+
+class SharedArrays():
+    """
+    Des tableaux NumPy publiés en mémoire partagée (`multiprocessing.shared_memory`), un
+    segment par tableau. Les processus s'y rattachent par leurs descriptions (`specs`), sans
+    copie ni pickle des données.
+    """
+    def __init__(self, arrays: Dict[str, np.ndarray]) -> None:
+        """
+        Copie les tableaux dans des segments de mémoire partagée.
+
+        Args:
+            arrays: Tableaux à publier, par nom.
+        """
+        self.segments: List[SharedMemory] = []
+        self.specs: Dict[str, ArraySpec] = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            # Un segment ne peut être vide
+            shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, array.dtype, buffer=shm.buf)[...] = array
+            self.segments.append(shm)
+            self.specs[name] = (shm.name, array.dtype.str, array.shape)
+
+    def __repr__(self) -> str:
+        return f"SharedArrays({len(self.specs)} tableaux, {self.nbytes} octets)"
+
+    @property
+    def nbytes(self) -> int:
+        return sum(s.size for s in self.segments)
+
+    def close(self) -> None:
+        """
+        Libère les segments, une fois les processus qui s'y rattachent arrêtés.
+        """
+        for shm in self.segments:
+            shm.close()
+            shm.unlink()
+        self.segments.clear()
+
+    @staticmethod
+    def attach(specs: Dict[str, ArraySpec]) -> Tuple[Dict[str, np.ndarray], List[SharedMemory]]:
+        """
+        Se rattache à des tableaux publiés par un autre processus.
+
+        Args:
+            specs: Descriptions des tableaux (voir `specs`).
+
+        Returns:
+            Tuple contenant les tableaux, par nom, et les segments à garder ouverts tant que les
+            tableaux sont utilisés.
+        """
+        arrays, segments = {}, []
+        for name, (segment, dtype, shape) in specs.items():
+            # Les processus du pool partagent le suivi des segments du processus principal,
+            # seul chargé de les libérer
+            shm = SharedMemory(segment)
+            arrays[name] = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf)
+            segments.append(shm)
+        return arrays, segments
+
+
+class SharedGraphPool():
+    """
+    Un pool de processus exécutant des lots de requêtes sur un même graphe : ancêtres,
+    descendants, chemins et recherches de termes, répartis sur tous les cœurs.
+
+    Le graphe n'est ni copié ni sérialisé vers les processus : ses tableaux sont publiés une
+    seule fois en mémoire partagée. Ce sont les listes d'adjacence "Is a" (vers les parents,
+    vers les enfants et non orientée) et de toutes les relations (non orientée), déjà filtrées
+    par attribut, ainsi que les termes PT et SYN de la langue du graphe (voir `TermTable`).
+    Les processus renvoient des indices de concepts, convertis en SCTID par le processus
+    principal, dans l'ordre des requêtes.
+    """
+    def __init__(self, graph: SnomedGraph, processes: Optional[int] = None,
+                 chunk_size: int = 64) -> None:
+        """
+        Publie les tableaux du graphe et démarre le pool.
+
+        Args:
+            graph: Graphe interrogé.
+            processes: Nombre de processus (nombre de cœurs par défaut).
+            chunk_size: Nombre de requêtes par tâche transmise à un processus.
+        """
+        if chunk_size < 1:
+            raise ValueError("La taille des tâches doit être positive.")
+        self.graph = graph
+        self.chunk_size = chunk_size
+        csr = graph.csr
+
+        arrays = {}
+        for name, direction, attributes in [("up", "out", [IS_A]), ("down", "in", [IS_A]),
+                                            ("is_a", "both", [IS_A]), ("all", "both", None)]:
+            indptr, indices, _ = csr.adjacency(direction, attributes)
+            arrays[f"{name}_ptr"], arrays[f"{name}_idx"] = indptr, indices
+
+        terms = _lang_terms(graph)
+        columns = [terms.columns["pt_lang"], terms.columns["syn_lang"]]
+        arrays.update(buffer=np.frombuffer(terms.store.buffer, dtype=np.uint8),
+                      offsets=terms.store.offsets, kinds=terms.kinds[:, columns],
+                      codes=terms.codes[:, columns], list_ptr=terms.list_ptr,
+                      list_ids=terms.list_ids)
+
+        self.arrays = SharedArrays(arrays)
+        try:
+            self._pool = mp.Pool(processes, initializer=_init_worker,
+                                 initargs=(self.arrays.specs,))
+        except Exception:
+            self.arrays.close()
+            raise
+        # Libération du pool et des segments si `close` n'est pas appelé
+        self._finalizer = weakref.finalize(self, _shutdown, self._pool, self.arrays)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"SharedGraphPool({self.graph!r} {self.arrays!r})"
+
+    def close(self) -> None:
+        """
+        Arrête le pool après les tâches en cours, puis libère la mémoire partagée.
+        """
+        if self._finalizer.alive:
+            self._pool.close()
+            self._pool.join()
+            self._finalizer()
+
+    def ancestors(self, sctids: Iterable[SCTID], degree: Optional[int] = None
+                  ) -> List[List[SCTID]]:
+        """
+        Renvoie les ancêtres de chaque concept, par les seules relations "Is a" comme
+        `SnomedGraph.get_ancestors` quel que soit le moteur du graphe.
+
+        Args:
+            sctids: Identifiants valides de concepts SNOMED CT.
+            degree: Nombre maximal de niveaux (pas de limite par défaut).
+
+        Returns:
+            Liste des SCTID des ancêtres de chaque concept, dans l'ordre des concepts.
+        """
+        return self._traverse("up", sctids, degree)
+
+    def descendants(self, sctids: Iterable[SCTID], degree: Optional[int] = None
+                    ) -> List[List[SCTID]]:
+        """
+        Renvoie les descendants de chaque concept, par les seules relations "Is a" comme
+        `SnomedGraph.get_descendants` quel que soit le moteur du graphe.
+
+        Args:
+            sctids: Identifiants valides de concepts SNOMED CT.
+            degree: Nombre maximal de niveaux (pas de limite par défaut).
+
+        Returns:
+            Liste des SCTID des descendants de chaque concept, dans l'ordre des concepts.
+        """
+        return self._traverse("down", sctids, degree)
+
+    def paths(self, pairs: Iterable[Tuple[SCTID, SCTID]], hierarchical: bool = False
+              ) -> List[Optional[List[SCTID]]]:
+        """
+        Renvoie un plus court chemin non orienté pour chaque couple de concepts (voir
+        `SnomedGraph.path` et `SnomedGraph.hierarchical_path`).
+
+        Args:
+            pairs: Couples (source, cible) de concepts.
+            hierarchical: Indique si seules les relations "Is a" sont empruntables.
+
+        Returns:
+            Liste des SCTID de chaque chemin, de la source à la cible, ou None lorsqu'il
+            n'existe aucun chemin, dans l'ordre des couples.
+        """
+        pairs = list(pairs)
+        rows = self.graph.csr.index_of([p[i] for p in pairs for i in (0, 1)]).reshape(-1, 2)
+        key = "is_a" if hierarchical else "all"
+        found = self._map(_path_chunk, [(key, chunk) for chunk in self._chunks(rows)])
+        sctids = self.graph.csr.sctids
+        return [sctids[path].tolist() if len(path) else None for path in found]
+
+    def search(self, terms: Iterable[str], accept: str = "", regex_term: bool = False,
+               case_term: bool = False) -> List[List[SCTID]]:
+        """
+        Cherche des termes dans les descriptions de la langue du graphe, comme
+        `SnomedGraph.search_in_desc` sans filtre de hiérarchie ni de FSN.
+
+        Args:
+            terms: Termes à rechercher.
+            accept: Indique si les termes doivent être cherchés dans un terme préféré ("PREF"),
+                un synonyme acceptable ("ACCEPT") ou peu importe ("").
+            regex_term: Indique si les termes sont des regex ou non.
+            case_term: Indique si la recherche doit être sensible à la casse des termes.
+
+        Returns:
+            Liste des SCTID des concepts trouvés pour chaque terme, dans l'ordre des termes.
+        """
+        if accept not in ["", "PREF", "ACCEPT"]:
+            raise ValueError("L'acceptabilité ne peut être que '', 'PREF' ou 'ACCEPT'.")
+        terms = list(terms)
+        columns = {"": [0, 1], "PREF": [0], "ACCEPT": [1]}[accept]
+        tasks = [(chunk, columns, regex_term, case_term) for chunk in self._chunks(terms)]
+        sctids = self.graph.csr.sctids
+        return [sctids[rows].tolist() for rows in self._map(_search_chunk, tasks)]
+
+    def _traverse(self, key: str, sctids: Iterable[SCTID], degree: Optional[int]
+                  ) -> List[List[SCTID]]:
+        """Parcourt une liste d'adjacence publiée depuis chaque concept.
+
+        Args:
+            key: Nom de la liste d'adjacence ("up" ou "down").
+            sctids: Identifiants valides de concepts SNOMED CT.
+            degree: Nombre maximal de niveaux.
+
+        Returns
+            Liste des SCTID atteints depuis chaque concept.
+        """
+        rows = self.graph.csr.index_of(list(sctids))
+        tasks = [(key, chunk, degree) for chunk in self._chunks(rows)]
+        sctids = self.graph.csr.sctids
+        return [sctids[reached].tolist() for reached in self._map(_traverse_chunk, tasks)]
+
+    def _chunks(self, items: Any) -> List[Any]:
+        """Découpe des requêtes en tâches de `chunk_size` requêtes.
+
+        Returns
+            Liste des tâches.
+        """
+        return [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+
+    def _map(self, func: Any, tasks: List[Any]) -> List[Any]:
+        """Exécute des tâches dans le pool et met bout à bout leurs résultats, dans l'ordre.
+
+        Returns
+            Liste des résultats de chaque requête.
+        """
+        if not self._finalizer.alive:
+            raise ValueError("Le pool est fermé.")
+        return [r for results in self._pool.imap(func, tasks) for r in results]
+
+
+def _lang_terms(graph: SnomedGraph) -> TermTable:
+    """
+    Renvoie une TermTable des termes du graphe, dans l'ordre de `csr` : celle du moteur "csr"
+    lorsqu'aucune valeur n'y a été modifiée, une table des seuls PT et SYN de la langue sinon.
+    """
+    backend = graph.backend
+    if isinstance(backend, CSRBackend) and not backend.terms.extra:
+        return backend.terms
+    return TermTable.from_nodes((d for _, d in backend.node_items()),
+                                columns=("pt_lang", "syn_lang"))
+
+
+def _shutdown(pool: Any, arrays: SharedArrays) -> None:
+    """
+    Arrête le pool puis libère la mémoire partagée.
+    """
+    pool.terminate()
+    pool.join()
+    arrays.close()
+
+
+def _init_worker(specs: Dict[str, ArraySpec]) -> None:
+    """
+    Rattache un processus de requête aux tableaux publiés, une seule fois par processus.
+    """
+    arrays, segments = SharedArrays.attach(specs)
+    _WORKER.update(arrays)
+    _WORKER["segments"] = segments
+
+
+def _traverse_chunk(task: Tuple[str, np.ndarray, Optional[int]]) -> List[np.ndarray]:
+    """
+    Parcourt une liste d'adjacence publiée depuis chaque concept d'une tâche.
+    """
+    key, rows, degree = task
+    indptr, indices = _WORKER[f"{key}_ptr"], _WORKER[f"{key}_idx"]
+    results = []
+    for row in rows.tolist():
+        reached = bfs(indptr, indices, [row], False, degree)
+        results.append(reached[reached != row])
+    return results
+
+
+def _path_chunk(task: Tuple[str, np.ndarray]) -> List[np.ndarray]:
+    """
+    Cherche un plus court chemin pour chaque couple de concepts d'une tâche.
+    """
+    key, pairs = task
+    indptr, indices = _WORKER[f"{key}_ptr"], _WORKER[f"{key}_idx"]
+    return [bfs_path(indptr, indices, src, tgt) for src, tgt in pairs.tolist()]
+
+
+def _search_chunk(task: Tuple[List[str], List[int], bool, bool]) -> List[np.ndarray]:
+    """
+    Cherche chaque terme d'une tâche dans les termes distincts publiés, puis renvoie les
+    concepts dont le PT ou un SYN contient le terme : ceux trouvés par leur PT puis par leurs
+    SYN, dans l'ordre des concepts, comme la table des descriptions de `search_in_desc`.
+    """
+    terms, columns, regex, case = task
+    store = _store_terms(case or regex)
+    kinds, codes = _WORKER["kinds"], _WORKER["codes"]
+    list_ptr, list_ids = _WORKER["list_ptr"], _WORKER["list_ids"]
+
+    results = []
+    for term in terms:
+        if regex:
+            pattern = re.compile(term, 0 if case else re.IGNORECASE)
+            found = [i for i, t in enumerate(store) if t and pattern.search(t)]
+        else:
+            term = term if case else term.upper()
+            found = [i for i, t in enumerate(store) if t and term in t]
+        matched = np.zeros(len(store), dtype=bool)
+        matched[found] = True
+
+        # Listes (SYN) contenant au moins un terme trouvé
+        hits = np.flatnonzero(matched[list_ids])
+        lists = np.zeros(len(list_ptr) - 1, dtype=bool)
+        lists[np.searchsorted(list_ptr, hits, side="right") - 1] = True
+
+        rows = []
+        for col in columns:
+            single, listed = term_rows(kinds, col)
+            rows.append(np.union1d(single[matched[codes[single, col]]],
+                                   listed[lists[codes[listed, col]]]))
+        results.append(pd.unique(np.concatenate(rows)))
+    return results
+
+
+def _store_terms(case: bool) -> List[str]:
+    """
+    Renvoie les termes distincts publiés, décodés au premier appel puis conservés par le
+    processus (en majuscules pour une recherche insensible à la casse, comme pandas).
+    """
+    key = "terms" if case else "upper_terms"
+    if key not in _WORKER:
+        buffer, offsets = _WORKER["buffer"], _WORKER["offsets"].tolist()
+        data = buffer.tobytes()
+        terms = [data[a:b].decode() for a, b in zip(offsets, offsets[1:])]
+        _WORKER[key] = terms if case else [t.upper() for t in terms]
+    return _WORKER[key]
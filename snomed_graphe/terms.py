@@ -0,0 +1,307 @@
+import numpy as np
+import pandas as pd
+
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Self, Tuple
+
+# Nature de la valeur d'un attribut dans `TermTable.kinds`
+_ABSENT, _TERM, _LIST, _EXTRA = 0, 1, 2, 3
+_MISSING = object()
+
+
+class TermStore():
+    """
+    Un stock de termes : les termes distincts sont concaténés dans un seul tampon UTF-8 et
+    retrouvés par leurs décalages, chaque terme n'étant stocké qu'une fois.
+    """
+    def __init__(self, buffer: bytes, offsets: np.ndarray) -> None:
+        """
+        Crée un stock de termes à partir d'un tampon déjà construit.
+
+        Args:
+            buffer: Termes encodés en UTF-8, concaténés.
+            offsets: Décalage du début de chaque terme dans le tampon (taille n + 1).
+        """
+        self.buffer = buffer
+        self.offsets = offsets
+        # Vue sur les décalages : lecture d'entiers Python, plus rapide que l'indexation NumPy
+        self._offsets = memoryview(np.ascontiguousarray(offsets, dtype=np.int64))
+
+    def __getitem__(self, i: int) -> str:
+        return self.buffer[self._offsets[i]:self._offsets[i + 1]].decode()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __repr__(self) -> str:
+        return f"TermStore({len(self)} termes, {self.nbytes} octets)"
+
+    @classmethod
+    def from_terms(cls, terms: List[str]) -> Tuple[Self, np.ndarray]:
+        """
+        Construit le stock des termes distincts d'une liste de termes.
+
+        Args:
+            terms: Termes à stocker, éventuellement répétés.
+
+        Returns:
+            Tuple contenant le stock et l'identifiant de chaque terme de `terms`.
+        """
+        ids, uniques = pd.factorize(pd.Series(terms, dtype=object))
+        encoded = [t.encode() for t in uniques]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in encoded], out=offsets[1:])
+        return cls(b"".join(encoded), offsets), ids.astype(np.int32)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer) + self.offsets.nbytes
+
+
+class TermTable():
+    """
+    Les attributs textuels des concepts (FSN, PT, SYN) stockés sous forme de tableaux : pour
+    chaque concept et chaque attribut, l'identifiant d'un terme de `store` ou d'une liste de
+    termes. Les valeurs d'un autre type et les attributs ajoutés après coup sont conservés tels
+    quels dans `extra`.
+    """
+    def __init__(self, store: TermStore, columns: List[str], kinds: np.ndarray,
+                 codes: np.ndarray, list_ptr: np.ndarray, list_ids: np.ndarray,
+                 extra: Dict[int, Dict[str, Any]]) -> None:
+        """
+        Crée une table de termes à partir de tableaux déjà construits.
+
+        Args:
+            store: Stock des termes.
+            columns: Noms des attributs.
+            kinds: Nature de chaque valeur (absente, terme, liste ou valeur de `extra`), de
+                taille (concepts, attributs).
+            codes: Identifiant du terme ou de la liste de chaque valeur.
+            list_ptr: Pointeurs de début de chaque liste dans `list_ids`.
+            list_ids: Identifiants des termes des listes, bout à bout.
+            extra: Valeurs conservées telles quelles, par ligne puis par attribut.
+        """
+        self.store = store
+        self.columns = {c: i for i, c in enumerate(columns)}
+        self.kinds = kinds
+        self.codes = codes
+        self.list_ptr = list_ptr
+        self.list_ids = list_ids
+        self.extra = extra
+        self._kinds = memoryview(kinds)
+        self._codes = memoryview(codes)
+        self._list_ptr = memoryview(list_ptr)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __repr__(self) -> str:
+        return f"TermTable({len(self)} concepts, {len(self.store)} termes, {self.nbytes} octets)"
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Dict[str, Any]],
+                   columns: Iterable[str] = ("fsn", "pt_en", "pt_lang", "syn_en", "syn_lang")
+                   ) -> Self:
+        """
+        Construit la table des attributs d'une suite de concepts.
+
+        Args:
+            nodes: Attributs de chaque concept, dans l'ordre des lignes.
+            columns: Attributs textuels à stocker dans la table, les autres allant dans `extra`.
+
+        Returns:
+            Un objet TermTable.
+        """
+        nodes = list(nodes)
+        columns = list(columns)
+        kinds = np.full((len(nodes), len(columns)), _ABSENT, dtype=np.int8)
+        codes = np.zeros((len(nodes), len(columns)), dtype=np.int32)
+
+        # Attributs hors colonnes, conservés tels quels
+        extra = {}
+        for row, data in enumerate(nodes):
+            others = data.keys() - columns
+            if others:
+                extra[row] = {k: data[k] for k in others}
+
+        singles, lists, lengths = [], [], []
+        for col, key in enumerate(columns):
+            values = [data.get(key, _MISSING) for data in nodes]
+            column = np.array([_kind(v) for v in values], dtype=np.int8)
+            kinds[:, col] = column
+
+            rows = np.flatnonzero(column == _TERM)
+            codes[rows, col] = np.arange(len(singles), len(singles) + len(rows))
+            singles.extend([values[r] for r in rows.tolist()])
+
+            rows = np.flatnonzero(column == _LIST)
+            codes[rows, col] = np.arange(len(lengths), len(lengths) + len(rows))
+            for r in rows.tolist():
+                lists.extend(values[r])
+                lengths.append(len(values[r]))
+
+            for r in np.flatnonzero(column == _EXTRA).tolist():
+                extra.setdefault(r, {})[key] = values[r]
+
+        # Les codes provisoires (rang parmi les termes seuls) deviennent des identifiants
+        store, ids = TermStore.from_terms(singles + lists)
+        codes[kinds == _TERM] = ids[codes[kinds == _TERM]]
+        list_ptr = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=list_ptr[1:])
+        return cls(store, columns, kinds, codes, list_ptr, ids[len(singles):], extra)
+
+    @property
+    def nbytes(self) -> int:
+        return (self.store.nbytes + self.kinds.nbytes + self.codes.nbytes + self.list_ptr.nbytes
+                + self.list_ids.nbytes)
+
+    def get(self, row: int, key: str) -> Any:
+        """
+        Renvoie la valeur d'un attribut d'un concept.
+
+        Args:
+            row: Ligne du concept.
+            key: Nom de l'attribut.
+
+        Returns:
+            Le terme, la liste de termes ou la valeur conservée telle quelle.
+        """
+        col = self.columns.get(key)
+        kind = _EXTRA if col is None else self._kinds[row, col]
+        if kind == _TERM:
+            return self.store[self._codes[row, col]]
+        if kind == _LIST:
+            code = self._codes[row, col]
+            store = self.store
+            return [store[i] for i in
+                    self.list_ids[self._list_ptr[code]:self._list_ptr[code + 1]].tolist()]
+        if kind == _EXTRA and key in self.extra.get(row, {}):
+            return self.extra[row][key]
+        raise KeyError(key)
+
+    def set(self, row: int, key: str, value: Any) -> None:
+        """
+        Modifie la valeur d'un attribut d'un concept, conservée telle quelle dans `extra`.
+
+        Args:
+            row: Ligne du concept.
+            key: Nom de l'attribut.
+            value: Nouvelle valeur.
+        """
+        self.extra.setdefault(row, {})[key] = value
+        if key in self.columns:
+            self.kinds[row, self.columns[key]] = _EXTRA
+
+    def delete(self, row: int, key: str) -> None:
+        """
+        Supprime un attribut d'un concept.
+
+        Args:
+            row: Ligne du concept.
+            key: Nom de l'attribut.
+        """
+        self.get(row, key)
+        self.extra.get(row, {}).pop(key, None)
+        if key in self.columns:
+            self.kinds[row, self.columns[key]] = _ABSENT
+
+    def keys(self, row: int) -> List[str]:
+        """
+        Renvoie les noms des attributs présents pour un concept.
+
+        Args:
+            row: Ligne du concept.
+
+        Returns:
+            Liste des noms des attributs.
+        """
+        kinds = self._kinds
+        keys = [c for c, i in self.columns.items() if kinds[row, i] != _ABSENT]
+        if row in self.extra:
+            keys += [k for k in self.extra[row] if k not in self.columns]
+        return keys
+
+
+class NodeTerms(MutableMapping):
+    """
+    Les attributs d'un concept lus dans une TermTable, utilisables à la place du dictionnaire
+    d'attributs d'un nœud NetworkX. Les termes sont décodés à chaque accès.
+    """
+    __slots__ = ("table", "row")
+
+    def __init__(self, table: TermTable, row: int) -> None:
+        self.table = table
+        self.row = row
+
+    def __getitem__(self, key: str) -> Any:
+        return self.table.get(self.row, key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.table.set(self.row, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        self.table.delete(self.row, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table.keys(self.row))
+
+    def __contains__(self, key: object) -> bool:
+        col = self.table.columns.get(key)
+        if col is not None and self.table._kinds[self.row, col] != _EXTRA:
+            return self.table._kinds[self.row, col] != _ABSENT
+        return key in self.table.extra.get(self.row, {})
+
+    def __len__(self) -> int:
+        return len(self.table.keys(self.row))
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self)
+
+
+def _kind(value: Any) -> int:
+    """
+    Renvoie la nature d'une valeur d'attribut : terme, liste de termes, valeur conservée telle
+    quelle ou absence de valeur.
+    """
+    if type(value) is str:
+        return _TERM
+    if type(value) is list and all(type(v) is str for v in value):
+        return _LIST
+    return _ABSENT if value is _MISSING else _EXTRA
+
+
+def compact_nodes(nodes: Dict[Hashable, Dict[str, Any]]) -> TermTable:
+    """
+    Remplace, sur place, les dictionnaires d'attributs des concepts par des vues sur une
+    TermTable commune.
+
+    Args:
+        nodes: Dictionnaire des attributs de chaque concept (`g._node` d'un graphe NetworkX).
+
+    Returns:
+        La TermTable construite.
+    """
+    sctids = list(nodes)
+    table = TermTable.from_nodes(nodes[n] for n in sctids)
+    for row, sctid in enumerate(sctids):
+        nodes[sctid] = NodeTerms(table, row)
+    return table
+
+
+def term_rows(kinds: np.ndarray, col: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Renvoie les lignes d'une colonne de `TermTable.kinds` dont la valeur est un terme seul,
+    puis celles dont la valeur est une liste de termes (SYN) : leurs codes (`TermTable.codes`)
+    désignent respectivement un terme du TermStore et une liste de `list_ptr`.
+
+    Args:
+        kinds: Nature de la valeur de chaque attribut (voir `TermTable.kinds`).
+        col: Indice de la colonne.
+
+    Returns:
+        Tuple contenant les lignes des termes seuls et celles des listes.
+    """
+    return np.flatnonzero(kinds[:, col] == _TERM), np.flatnonzero(kinds[:, col] == _LIST)
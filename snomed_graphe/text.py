@@ -0,0 +1,57 @@
+import re
+import unicodedata
+
+from typing import Iterator, List
+
+_WORDS = re.compile(r"\w+")
+
+
+def tokenize(term: str) -> List[str]:
+    """
+    Découpe un terme en mots en minuscules, la ponctuation servant de séparateur.
+
+    Args:
+        term: Terme à découper.
+
+    Returns:
+        Liste des mots du terme.
+    """
+    return _WORDS.findall(term.lower())
+
+
+def find_words(text: str) -> Iterator[re.Match]:
+    """
+    Repère les mots d'un texte, découpé comme par `tokenize`, avec leur position.
+
+    Args:
+        text: Texte à découper.
+
+    Returns:
+        Itérateur des correspondances de chaque mot (texte, début et fin).
+    """
+    return _WORDS.finditer(text)
+
+
+def fold(term: str, punctuation: bool = True, case: bool = False) -> str:
+    """
+    Normalise un terme pour une comparaison insensible à la casse et aux accents
+    ("Hémorragie" -> "hemorragie").
+
+    Args:
+        term: Terme à normaliser.
+        punctuation: Indique si la ponctuation est conservée ; sinon, les mots sont séparés par
+            une seule espace ("Sous-endocardique" -> "sous endocardique").
+        case: Indique si la casse est conservée (pour normaliser une regex, dont `\\W` ou `\\S`
+            changeraient de sens en minuscules).
+
+    Returns:
+        Le terme sans diacritiques et en minuscules.
+    """
+    if term.isascii():
+        folded = term
+    else:
+        decomposed = unicodedata.normalize("NFKD", term)
+        folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    if not case:
+        folded = folded.casefold()
+    return folded if punctuation else " ".join(_WORDS.findall(folded))
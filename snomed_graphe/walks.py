@@ -0,0 +1,224 @@
+import multiprocessing as mp
+import numpy as np
+
+from functools import partial
+from snomed_graphe.csr import CSRGraph
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
+
+# Tableaux partagés par les processus de génération (initialisés par `_init_worker`)
+_WORKER: Dict[str, Any] = {}
+
+
+class RandomWalker():
+    """
+    Un générateur de marches aléatoires (DeepWalk, node2vec) sur une représentation CSR, pour
+    l'apprentissage de plongements de concepts.
+    """
+    def __init__(self, csr: CSRGraph, walk_length: int = 40, walks_per_node: int = 10,
+                 p: float = 1.0, q: float = 1.0, attributes: Optional[Iterable] = None,
+                 direction: str = "both", seed: Optional[int] = None) -> None:
+        """
+        Crée un générateur de marches aléatoires.
+
+        Args:
+            csr: Représentation CSR du graphe.
+            walk_length: Nombre maximal de concepts par marche.
+            walks_per_node: Nombre de marches partant de chaque concept.
+            p: Paramètre de retour de node2vec (1 par défaut, soit DeepWalk).
+            q: Paramètre entrée-sortie de node2vec (1 par défaut, soit DeepWalk).
+            attributes: SCTID des attributs des relations empruntables (toutes par défaut,
+                ["116680003"] pour la seule hiérarchie).
+            direction: Sens des relations : sortantes ("out"), entrantes ("in") ou les deux
+                ("both", par défaut).
+            seed: Graine du générateur aléatoire, pour des marches reproductibles quel que soit
+                le nombre de processus.
+        """
+        if p <= 0 or q <= 0:
+            raise ValueError("Les paramètres p et q doivent être strictement positifs.")
+        self.csr = csr
+        self.walk_length = walk_length
+        self.walks_per_node = walks_per_node
+        self.p = p
+        self.q = q
+        self.seed = seed
+
+        # Adjacence triée par (ligne, colonne) pour tester en O(log d) si deux concepts sont
+        # voisins, ce qu'exige le biais de node2vec
+        indptr, indices, _ = csr.adjacency(direction, attributes)
+        rows = np.repeat(np.arange(len(csr), dtype=np.int64), np.diff(indptr))
+        keys = rows * len(csr) + indices
+        order = np.argsort(keys, kind="stable")
+        self.indptr = indptr
+        self.indices = indices[order].astype(np.int64)
+        self.keys = keys[order]
+
+    def walks(self, sctids: Optional[Iterable] = None, processes: int = 1,
+              chunk_size: int = 10000) -> Generator[List[Any], None, None]:
+        """
+        Génère les marches au fil de l'eau, sous forme de listes de SCTID.
+
+        Args:
+            sctids: SCTID des concepts de départ (tous par défaut).
+            processes: Nombre de processus de génération.
+            chunk_size: Nombre de marches générées par tâche.
+
+        Returns:
+            Générateur des marches.
+        """
+        for walks in self.walk_arrays(sctids, processes, chunk_size):
+            for walk in walks:
+                yield list(self.csr.sctids[walk[walk >= 0]])
+
+    def walk_arrays(self, sctids: Optional[Iterable] = None, processes: int = 1,
+                    chunk_size: int = 10000) -> Generator[np.ndarray, None, None]:
+        """
+        Génère les marches par blocs, sous forme de tableaux d'indices de concepts complétés
+        par -1 lorsqu'une marche atteint un concept sans voisin.
+
+        Args:
+            sctids: SCTID des concepts de départ (tous par défaut).
+            processes: Nombre de processus de génération.
+            chunk_size: Nombre de marches générées par tâche.
+
+        Returns:
+            Générateur de tableaux de taille (marches, `walk_length`).
+        """
+        tasks = self._tasks(sctids, chunk_size)
+        arrays = (self.indptr, self.indices, self.keys, len(self.csr), self.walk_length,
+                  self.p, self.q)
+        if processes == 1:
+            # Les tableaux sont propres au générateur : plusieurs marcheurs peuvent être
+            # parcourus en même temps
+            yield from map(partial(_walks, _state(*arrays)), tasks)
+            return
+
+        with mp.Pool(processes, initializer=_init_worker, initargs=arrays) as pool:
+            yield from pool.imap(_walk_chunk, tasks)
+
+    def save(self, path: str, sctids: Optional[Iterable] = None, processes: int = 1,
+             chunk_size: int = 10000) -> None:
+        """
+        Écrit les marches dans un fichier texte, une marche par ligne et des SCTID séparés par
+        des espaces (format attendu par gensim `LineSentence`).
+
+        Args:
+            path: Chemin du fichier de sortie.
+            sctids: SCTID des concepts de départ (tous par défaut).
+            processes: Nombre de processus de génération.
+            chunk_size: Nombre de marches générées par tâche.
+        """
+        labels = self.csr.sctids.astype(str)
+        with open(path, "w", encoding="UTF-8") as f:
+            for walks in self.walk_arrays(sctids, processes, chunk_size):
+                f.writelines(" ".join(labels[walk[walk >= 0]]) + "\n" for walk in walks)
+
+    def _tasks(self, sctids: Optional[Iterable],
+               chunk_size: int) -> Generator[Tuple[np.ndarray, np.random.SeedSequence], None,
+                                             None]:
+        """
+        Découpe les marches à générer en tâches : les concepts de départ sont mélangés à chaque
+        tour puis répartis en blocs, chacun doté de sa propre graine.
+
+        Args:
+            sctids: SCTID des concepts de départ (tous par défaut).
+            chunk_size: Nombre de marches par tâche.
+
+        Returns:
+            Générateur des tâches (concepts de départ, graine).
+        """
+        starts = (np.arange(len(self.csr)) if sctids is None
+                  else self.csr.index_of(sctids).astype(np.int64))
+        seeds = np.random.SeedSequence(self.seed)
+        rng = np.random.default_rng(seeds.spawn(1)[0])
+        for _ in range(self.walks_per_node):
+            starts = rng.permutation(starts)
+            for i in range(0, len(starts), chunk_size):
+                yield starts[i:i + chunk_size], seeds.spawn(1)[0]
+
+
+def _init_worker(indptr: np.ndarray, indices: np.ndarray, keys: np.ndarray, n: int,
+                 walk_length: int, p: float, q: float) -> None:
+    """
+    Initialise les tableaux d'un processus de génération, transmis une seule fois par processus.
+    """
+    _WORKER.update(_state(indptr, indices, keys, n, walk_length, p, q))
+
+
+def _state(indptr: np.ndarray, indices: np.ndarray, keys: np.ndarray, n: int,
+           walk_length: int, p: float, q: float) -> Dict[str, Any]:
+    """
+    Regroupe les tableaux et paramètres nécessaires à la génération des marches.
+    """
+    return dict(indptr=indptr, indices=indices, keys=keys, n=n, walk_length=walk_length,
+                p=p, q=q)
+
+
+def _walk_chunk(task: Tuple[np.ndarray, np.random.SeedSequence]) -> np.ndarray:
+    """
+    Génère un bloc de marches dans un processus de génération (voir `_walks`).
+    """
+    return _walks(_WORKER, task)
+
+
+def _walks(state: Dict[str, Any], task: Tuple[np.ndarray, np.random.SeedSequence]) -> np.ndarray:
+    """
+    Génère un bloc de marches, toutes avancées d'un pas à la fois.
+
+    Args:
+        state: Tableaux et paramètres de la génération (voir `_state`).
+        task: Concepts de départ et graine du bloc.
+
+    Returns:
+        Tableau de taille (marches, `walk_length`) complété par -1.
+    """
+    starts, seed = task
+    rng = np.random.default_rng(seed)
+    indptr, indices = state["indptr"], state["indices"]
+    p, q = state["p"], state["q"]
+
+    walks = np.full((len(starts), state["walk_length"]), -1, dtype=np.int64)
+    walks[:, 0] = starts
+    alive = np.arange(len(starts))
+    for step in range(1, walks.shape[1]):
+        cur = walks[alive, step - 1]
+        deg = indptr[cur + 1] - indptr[cur]
+        alive, cur, deg = alive[deg > 0], cur[deg > 0], deg[deg > 0]
+        if not len(alive):
+            break
+
+        if step == 1 or (p == 1 and q == 1):
+            nxt = indices[indptr[cur] + (rng.random(len(cur)) * deg).astype(np.int64)]
+        else:
+            # node2vec par rejet : proposition uniforme, acceptation selon le biais p/q
+            prev = walks[alive, step - 2]
+            nxt = np.empty(len(alive), dtype=np.int64)
+            pending = np.arange(len(alive))
+            max_w = max(1 / p, 1, 1 / q)
+            while len(pending):
+                x = indices[indptr[cur[pending]]
+                            + (rng.random(len(pending)) * deg[pending]).astype(np.int64)]
+                w = np.where(x == prev[pending], 1 / p,
+                             np.where(_connected(state, prev[pending], x), 1, 1 / q))
+                ok = rng.random(len(pending)) * max_w < w
+                nxt[pending[ok]] = x[ok]
+                pending = pending[~ok]
+        walks[alive, step] = nxt
+    return walks
+
+
+def _connected(state: Dict[str, Any], src: np.ndarray, tgt: np.ndarray) -> np.ndarray:
+    """
+    Indique pour chaque couple si `tgt` est voisin de `src` dans l'adjacence de la génération.
+
+    Args:
+        state: Tableaux et paramètres de la génération (voir `_state`).
+        src: Indices des concepts sources.
+        tgt: Indices des concepts cibles.
+
+    Returns:
+        Tableau de booléens.
+    """
+    keys = state["keys"]
+    k = src * state["n"] + tgt
+    pos = np.minimum(np.searchsorted(keys, k), len(keys) - 1)
+    return keys[pos] == k
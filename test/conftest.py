@@ -238,6 +238,35 @@ def sct() -> SnomedGraph:
     return SnomedGraph(g, lang="fr")
 
 
+@pytest.fixture
+def sct_int(sct: SnomedGraph) -> SnomedGraph:
+    # Même graphe avec des clés entières, comme produit par from_rf2 et from_serialized
+    g = sct.g.copy()
+    g.remove_node("test")
+    g = nx.relabel_nodes(g, int)
+    for _, _, d in g.edges(data=True):
+        d.update(src=int(d["src"]), tgt=int(d["tgt"]), group=int(d["group"]),
+                 attribute=int(d["attribute"]))
+
+    return SnomedGraph(g, lang="fr")
+
+
+@pytest.fixture
+def sct_attr() -> nx.DiGraph:
+    # Hiérarchie 5 -> 4 -> 3 -> 2 -> 1 et 5 -> 1, dont le concept 6 (enfant de 1) n'est relié à 2
+    # que par un attribut : il n'en est pas un descendant
+    isa = [("5", "4"), ("4", "3"), ("3", "2"), ("5", "1"), ("2", "1"), ("6", "1")]
+    g = nx.DiGraph()
+    g.add_edges_from((s, t, {"src": s, "tgt": t, "group": "0", "attribute": "116680003"})
+                     for s, t in isa)
+    g.add_edge("6", "2", src="6", tgt="2", group="1", attribute="363698007")
+    for sctid in ["1", "2", "3", "4", "5", "6", "116680003", "363698007"]:
+        g.add_node(sctid, fsn=f"Concept {sctid} (finding)", pt_en=f"Concept {sctid}",
+                   pt_lang=f"concept {sctid}", syn_en="", syn_lang="")
+
+    return g
+
+
 @pytest.fixture
 def in_rel() -> List[Tuple[str]]:
     return [('1163440003', '116680003', '129574000'),
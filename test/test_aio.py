@@ -0,0 +1,115 @@
+import asyncio
+import pickle
+import pytest
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from snomed_graphe.aio import AsyncSnomedGraph
+from snomed_graphe.graphe import SnomedGraph
+from typing import List
+
+
+def ids(concepts: List) -> List[str]:
+    return [c.sctid for c in concepts]
+
+
+def blocked_pool() -> tuple:
+    # Pool d'un seul thread, occupé jusqu'à `release.set()` : les requêtes y restent en attente
+    pool, release = ThreadPoolExecutor(1), threading.Event()
+    pool.submit(release.wait)
+    return pool, release
+
+
+def test_queries(sct: SnomedGraph) -> None:
+    async def main() -> tuple:
+        async with AsyncSnomedGraph(sct) as graph:
+            return (await graph.get_descendants("404684003"),
+                    await graph.hierarchical_path("test", "138875005"),
+                    await graph.search_in_desc("myocard", accept="PREF"),
+                    await graph.run("find_by_semtag", ("disorder",)),
+                    await graph.get_concept_details("74281007"))
+
+    descendants, path, found, disorders, details = asyncio.run(main())
+    assert ids(descendants) == ids(sct.get_descendants("404684003"))
+    assert ids(path) == ids(sct.hierarchical_path("test", "138875005"))
+    assert found == sct.search_in_desc("myocard", accept="PREF")
+    assert disorders == sct.find_by_semtag("disorder")
+    assert details is sct.get_concept_details("74281007")
+
+
+def test_single_flight(sct: SnomedGraph) -> None:
+    pool, release = blocked_pool()
+    graph = AsyncSnomedGraph(sct, pool)
+
+    async def main() -> list:
+        calls = [asyncio.create_task(graph.get_ancestors("311793000")) for _ in range(3)]
+        calls.append(asyncio.create_task(graph.get_ancestors("311793000", 1)))
+        await asyncio.sleep(0.01)
+        assert len(graph._flights) == 2
+        release.set()
+        return await asyncio.gather(*calls)
+
+    results = asyncio.run(main())
+    assert (graph.calls, graph.merged, graph._flights) == (4, 2, {})
+    assert [ids(r) for r in results[:3]] == [ids(sct.get_ancestors("311793000"))] * 3
+    assert ids(results[3]) == ids(sct.get_ancestors("311793000", 1))
+    pool.shutdown()
+
+
+def test_timeout_and_cancel(sct: SnomedGraph) -> None:
+    pool, release = blocked_pool()
+    graph = AsyncSnomedGraph(sct, pool, timeout=0.01)
+
+    async def main() -> None:
+        with pytest.raises(TimeoutError):
+            await graph.get_descendants("138875005")
+        assert graph._flights == {}
+
+        first = asyncio.create_task(graph.get_descendants("404684003", timeout=10))
+        second = asyncio.create_task(graph.get_descendants("404684003", timeout=10))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        await asyncio.sleep(0.01)
+        # Le second appel attend toujours l'exécution partagée
+        assert len(graph._flights) == 1
+        release.set()
+        assert ids(await second) == ids(sct.get_descendants("404684003"))
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(main())
+    pool.shutdown()
+
+
+def test_errors(sct: SnomedGraph) -> None:
+    async def main() -> None:
+        async with AsyncSnomedGraph(sct) as graph:
+            with pytest.raises(KeyError):
+                await graph.get_parents("absent")
+            with pytest.raises(ValueError):
+                await graph.run("_cached", ("csr",))
+
+    asyncio.run(main())
+    with pytest.raises(ValueError):
+        AsyncSnomedGraph(sct, "greenlet")
+
+
+def test_process_pool(sct: SnomedGraph) -> None:
+    async def main() -> tuple:
+        async with AsyncSnomedGraph(sct, "process", max_workers=1) as graph:
+            return await asyncio.gather(graph.get_ancestors("311793000"),
+                                        graph.ecl("<< 404684003"),
+                                        graph.get_full_concepts(["129574000"]))
+
+    ancestors, found, (concept,) = asyncio.run(main())
+    assert ids(ancestors) == ids(sct.get_ancestors("311793000"))
+    assert found == sct.ecl("<< 404684003")
+    assert ids(concept.parents) == ids(sct.get_parents("129574000"))
+
+
+def test_pickle(sct: SnomedGraph) -> None:
+    sct.search_tokens("infarctus")
+    copy = pickle.loads(pickle.dumps(sct))
+
+    assert copy.search_tokens("infarctus") == sct.search_tokens("infarctus")
+    assert copy._cache_lock is not sct._cache_lock
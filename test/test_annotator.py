@@ -0,0 +1,34 @@
+from snomed_graphe.annotator import Mention
+from snomed_graphe.graphe import SnomedGraph
+
+TEXT = "Infarctus myocardique sous-endocardique POSTOPÉRATOIRE, structure du myocarde."
+
+
+def test_annotate(sct: SnomedGraph) -> None:
+    mentions = sct.annotator.annotate(TEXT)
+
+    assert mentions == [
+        Mention(0, 54, "Infarctus myocardique sous-endocardique POSTOPÉRATOIRE",
+                [("311796008", "PREF")]),
+        Mention(56, 77, "structure du myocarde", [("74281007", "ACCEPT")])
+    ]
+
+
+def test_annotate_longest(sct: SnomedGraph) -> None:
+    # "myocarde" et "myocarde anterieur" sont deux descriptions : la plus longue l'emporte
+    assert [m.text for m in sct.annotator.annotate("le myocarde anterieur")] == \
+        ["myocarde anterieur"]
+    assert [m.text for m in sct.annotator.annotate("le myocarde inferieur")] == ["myocarde"]
+
+
+def test_annotate_none(sct: SnomedGraph) -> None:
+    assert sct.annotator.annotate("") == []
+    assert sct.annotator.annotate("aucun concept ici") == []
+
+
+def test_annotate_stream(sct: SnomedGraph) -> None:
+    texts = [TEXT, "rien", "myocarde"] * 3
+    expected = [sct.annotator.annotate(t) for t in texts]
+
+    assert list(sct.annotator.annotate_stream(iter(texts))) == expected
+    assert list(sct.annotator.annotate_stream(texts, processes=2, chunk_size=2)) == expected
@@ -0,0 +1,175 @@
+import networkx as nx
+import pandas as pd
+import pytest
+
+from snomed_graphe.backend import CSRBackend, NetworkXBackend
+from snomed_graphe.graphe import SnomedGraph
+from typing import Any, List
+
+
+@pytest.fixture(params=["networkx", "csr"])
+def graph(sct: SnomedGraph, request: pytest.FixtureRequest) -> SnomedGraph:
+    # Même graphe sur chacun des moteurs, comparé au graphe de référence `sct`
+    return SnomedGraph(sct.g.copy(), lang="fr", backend=request.param)
+
+
+def ids(concepts: List[Any]) -> List[str]:
+    return sorted(c.sctid for c in concepts)
+
+
+def rels(relationships: List[Any]) -> List[tuple]:
+    return sorted((r.src.sctid, r.tgt.sctid, r.group, r.attribute.sctid) for r in relationships)
+
+
+def test_backend_type(graph: SnomedGraph, request: pytest.FixtureRequest) -> None:
+    expected = {"networkx": NetworkXBackend, "csr": CSRBackend}[request.node.callspec.id]
+
+    assert isinstance(graph.backend, expected)
+    assert (len(graph), repr(graph)) == (24, "24 concepts et 40 relations.")
+    assert "129574000" in graph and 129574000 not in graph.backend and "absent" not in graph
+
+
+def test_backend_error(sct: SnomedGraph) -> None:
+    with pytest.raises(ValueError):
+        SnomedGraph(sct.g, backend="igraph")
+
+
+@pytest.mark.parametrize("sctid", ["129574000", "74281007", "116680003", "test"])
+def test_parity_concepts(graph: SnomedGraph, sct: SnomedGraph, sctid: str) -> None:
+    c, expected = graph.get_concept_details(sctid), sct.get_concept_details(sctid)
+    assert (c.sctid, c.fsn, c.pt_en, c.pt_lang, c.syn_en, c.syn_lang) == \
+        (expected.sctid, expected.fsn, expected.pt_en, expected.pt_lang, expected.syn_en,
+         expected.syn_lang)
+    assert rels(graph._in_relationships(sctid)) == rels(sct._in_relationships(sctid))
+    assert rels(graph._out_relationships(sctid)) == rels(sct._out_relationships(sctid))
+    assert rels(graph.get_ungrouped_relationships(sctid)) == \
+        rels(sct.get_ungrouped_relationships(sctid))
+
+    grouped, expected = graph.get_grouped_relationships(sctid), \
+        sct.get_grouped_relationships(sctid)
+    assert {k: rels(v) for k, v in grouped.items()} == {k: rels(v) for k, v in expected.items()}
+
+    c, = graph.get_full_concepts([sctid])
+    assert (ids(c.parents), ids(c.children)) == (ids(sct.get_parents(sctid)),
+                                                 ids(sct.get_children(sctid)))
+    assert {k: rels(v) for k, v in c.relationships.items()} == \
+        {k: rels(v) for k, v in expected.items()}
+
+
+@pytest.mark.parametrize("method", ["get_ancestors", "get_children", "get_descendants",
+                                    "get_neighbors", "get_parents"])
+@pytest.mark.parametrize("sctid", ["129574000", "404684003", "311793000", "138875005"])
+def test_parity_hierarchy(graph: SnomedGraph, sct: SnomedGraph, method: str,
+                          sctid: str) -> None:
+    assert ids(getattr(graph, method)(sctid)) == ids(getattr(sct, method)(sctid))
+
+
+@pytest.mark.parametrize("degree", [1, 2])
+def test_parity_degree(graph: SnomedGraph, sct: SnomedGraph, degree: int) -> None:
+    for method in ["get_ancestors", "get_descendants", "get_neighbors"]:
+        assert ids(getattr(graph, method)("311793000", degree)) == \
+            ids(getattr(sct, method)("311793000", degree))
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_parity_attribute_edges(sct_attr: nx.DiGraph, backend: str) -> None:
+    graph = SnomedGraph(sct_attr, root="1", backend=backend)
+
+    # Les relations d'attribut (6 -> 2) ne sont pas suivies par les parcours hiérarchiques
+    assert ids(graph.get_descendants("2")) == ["3", "4", "5"]
+    assert ids(graph.get_descendants("2", 2)) == ["3", "4"]
+    assert ids(graph.get_descendants("1", 1)) == ["2", "5", "6"]
+    assert ids(graph.get_descendants("1")) == ["2", "3", "4", "5", "6"]
+    assert ids(graph.get_ancestors("6")) == ["1"]
+    assert ids(graph.get_ancestors("5", 1)) == ["1", "4"]
+    assert ids(graph.get_children("2")) == ["3"]
+
+
+def test_parity_paths(graph: SnomedGraph, sct: SnomedGraph) -> None:
+    path = [c.sctid for c in graph.path("1163440003", "362981000")]
+    assert len(path) == len(sct.path("1163440003", "362981000"))
+    assert (path[0], path[-1]) == ("1163440003", "362981000")
+    assert all(sct.undir.has_edge(a, b) for a, b in zip(path, path[1:]))
+
+    assert [c.sctid for c in graph.hierarchical_path("test", "138875005")] == \
+        [c.sctid for c in sct.hierarchical_path("test", "138875005")]
+    assert [c.sctid for c in graph.hierarchical_path_to_root("test")] == \
+        [c.sctid for c in sct.hierarchical_path_to_root("test")]
+
+
+def test_parity_no_path(graph: SnomedGraph) -> None:
+    graph = graph.subgraph("129574000", down=False)
+    with pytest.raises(nx.NetworkXNoPath):
+        graph.hierarchical_path("129574000", "74281007")
+
+
+def test_parity_tables(graph: SnomedGraph, sct: SnomedGraph) -> None:
+    pd.testing.assert_frame_equal(graph.graph_to_pandas()[0], sct.graph_to_pandas()[0])
+    columns = ["source", "target", "src", "tgt", "group", "attribute"]
+    edges, expected = graph.graph_to_pandas()[1], sct.graph_to_pandas()[1]
+    assert sorted(map(tuple, edges.loc[:, columns].to_numpy())) == \
+        sorted(map(tuple, expected.loc[:, columns].to_numpy()))
+
+    for df, expected in zip(graph.graph_to_tables(), sct.graph_to_tables()):
+        pd.testing.assert_frame_equal(df, expected)
+    pd.testing.assert_frame_equal(graph.desc_to_pandas(), sct.desc_to_pandas())
+    pd.testing.assert_frame_equal(graph.node_features(), sct.node_features())
+
+
+def test_parity_queries(graph: SnomedGraph, sct: SnomedGraph) -> None:
+    assert graph.search_in_desc("myocard") == sct.search_in_desc("myocard")
+    assert graph.search_tokens("infarctus") == sct.search_tokens("infarctus")
+    assert graph.search_fuzzy("infarctis") == sct.search_fuzzy("infarctis")
+    assert graph.autocomplete("myo") == sct.autocomplete("myo")
+    assert graph.ecl("<< 404684003 : 363698007 = << 123037004") == \
+        sct.ecl("<< 404684003 : 363698007 = << 123037004")
+    assert graph.find_by_attribute("363698007", "74281007") == \
+        sct.find_by_attribute("363698007", "74281007")
+    assert graph.find_by_semtag("disorder") == sct.find_by_semtag("disorder")
+    assert ids(graph.attributes) == ids(sct.attributes)
+
+
+def test_parity_subgraph(graph: SnomedGraph, sct: SnomedGraph) -> None:
+    sub, expected = graph.subgraph("311793000", True, True), sct.subgraph("311793000", True, True)
+
+    assert type(sub.backend) is type(graph.backend)
+    assert sorted(sub.g.nodes) == sorted(expected.g.nodes)
+    assert sorted(sub.g.edges(data=True)) == sorted(expected.g.edges(data=True))
+    assert sub.root == "311793000"
+
+
+def test_to_networkx(graph: SnomedGraph, sct: SnomedGraph) -> None:
+    g = graph.backend.to_networkx()
+
+    assert list(g.nodes(data=True)) == list(sct.g.nodes(data=True))
+    assert sorted(g.edges(data=True)) == sorted(sct.g.edges(data=True))
+    assert graph.g is graph.g
+
+
+def test_csr_backend_from_frames(sct: SnomedGraph, nodes: pd.DataFrame,
+                                 rel: pd.DataFrame) -> None:
+    backend = CSRBackend.from_frames(nodes, rel.drop(columns="active"))
+    g = backend.to_networkx()
+
+    assert list(g.nodes) == ["1009", "2009", "4009"]
+    assert list(g.edges(data=True)) == [("1009", "2009", {"src": "1009", "tgt": "2009",
+                                                          "group": "0", "attribute": "4009"})]
+    assert g.nodes["2009"] == dict(nodes.loc["2009"])
+
+
+def test_csr_backend_compact(sct: SnomedGraph) -> None:
+    graph = SnomedGraph(sct.g, backend="csr")
+
+    assert graph.compact_terms() is graph.backend.terms
+    assert graph.backend.terms.nbytes < 10000
+    assert isinstance(SnomedGraph(graph.backend, backend="networkx").backend, NetworkXBackend)
+
+
+def test_csr_backend_int_keys(sct_int: SnomedGraph) -> None:
+    graph = SnomedGraph(sct_int.g, backend="csr")
+
+    assert list(graph.get_grouped_relationships("129574000")) == [1, 2]
+    assert ids(graph.get_descendants(404684003)) == ids(sct_int.get_descendants(404684003))
+    assert [c.sctid for c in graph.hierarchical_path("311793000", 138875005)] == \
+        [c.sctid for c in sct_int.hierarchical_path("311793000", 138875005)]
+    assert sorted(graph.g.edges(data=True)) == sorted(sct_int.g.edges(data=True))
@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+from pathlib import Path
+from snomed_graphe.graphe import SnomedGraph
+from typing import List
+
+
+def test_csr_edges(sct: SnomedGraph) -> None:
+    csr = sct.csr
+    edges = {(csr.sctids[s], csr.sctids[t], csr.attributes[a], str(g))
+             for s, t, a, g in zip(csr.sources, csr.indices, csr.edge_type, csr.group)}
+
+    assert edges == {(s, t, a["attribute"], a["group"]) for s, t, a in sct.g.edges(data=True)}
+
+
+def test_csr_in_edges(sct: SnomedGraph) -> None:
+    csr = sct.csr
+    i = csr.index_of(["129574000"])[0]
+    sources = csr.sctids[csr.in_indices[csr.in_indptr[i]:csr.in_indptr[i + 1]]]
+
+    assert sorted(sources) == sorted(s for s, _ in sct.g.in_edges("129574000"))
+
+
+def test_csr_adjacency_is_a(sct: SnomedGraph, parents: List[str]) -> None:
+    indptr, indices, _ = sct.csr.adjacency("out", ["116680003"])
+    i = sct.csr.index_of(["129574000"])[0]
+
+    assert list(sct.csr.sctids[indices[indptr[i]:indptr[i + 1]]]) == parents
+
+
+def test_csr_index_of_error(sct: SnomedGraph) -> None:
+    with pytest.raises(KeyError):
+        sct.csr.index_of(["129574000", "absent"])
+
+
+def test_csr_cached(sct: SnomedGraph) -> None:
+    csr = sct.csr
+    assert sct.csr is csr
+
+    sct.g.add_node("0")
+    assert sct.csr is not csr
+    assert len(sct.csr) == len(csr) + 1
+
+
+def test_edge_index(sct: SnomedGraph) -> None:
+    csr = sct.csr
+    src, tgt = csr.edge_index
+
+    assert sorted(zip(csr.sctids[src], csr.sctids[tgt])) == sorted(sct.g.edges)
+
+
+def test_split_by_attribute(sct: SnomedGraph) -> None:
+    split = sct.csr.split_by_attribute()
+    indptr, indices = split["116676008"]
+
+    assert set(split) == {"116676008", "116680003", "255234002", "263502005", "363698007"}
+    assert sum(len(i) for _, i in split.values()) == sct.g.number_of_edges()
+    assert set(sct.csr.sctids[indices]) == {"55641003", "55470003"}
+    assert indptr[-1] == 5
+
+
+def test_graph_to_arrays(tmp_path: Path, sct: SnomedGraph) -> None:
+    arrays = sct.graph_to_arrays(str(tmp_path / "graphe.npz"))
+    loaded = sct.graph_to_arrays(str(tmp_path / "graphe.npz"))
+    features = arrays.features.set_index("sctid")
+
+    assert features.loc["129574000", "semtag"] == "disorder"
+    assert features.loc["129574000", "children"] == 4
+    assert features.loc["74281007", "syn_lang"] == 3
+    assert list(loaded.sctids) == list(arrays.sctids)
+    assert (loaded.indptr == arrays.indptr).all() and (loaded.indices == arrays.indices).all()
+    assert (loaded.group == arrays.group).all()
+    pd.testing.assert_frame_equal(loaded.features, arrays.features)
+
+
+def test_graph_to_arrays_cache(tmp_path: Path, sct: SnomedGraph) -> None:
+    sct.graph_to_arrays(str(tmp_path / "graphe"))
+    mtime = (tmp_path / "graphe.npz").stat().st_mtime_ns
+    sct.graph_to_arrays(str(tmp_path / "graphe"))
+
+    # L'extension est ajoutée et le cache réutilisé tant qu'il correspond au graphe
+    assert [p.name for p in tmp_path.iterdir()] == ["graphe.npz"]
+    assert (tmp_path / "graphe.npz").stat().st_mtime_ns == mtime
+
+    sct.g.add_node("0", fsn="Zero (test)", pt_en="Zero", pt_lang="Zéro", syn_en="",
+                   syn_lang="")
+    arrays = sct.graph_to_arrays(str(tmp_path / "graphe"))
+
+    assert "0" in list(arrays.sctids)
+    assert "0" in list(sct.graph_to_arrays(str(tmp_path / "graphe.npz")).sctids)
+
+
+def test_traverse(sct: SnomedGraph, ancestors: List[str], children: List[str],
+                  descendants: List[str]) -> None:
+    csr = sct.csr
+    i = csr.index_of(["129574000"])
+
+    assert sorted(csr.sctids[csr.traverse(i, "out", ["116680003"])]) == ancestors
+    assert sorted(csr.sctids[csr.traverse(i, "in", ["116680003"])]) == descendants
+    assert sorted(csr.sctids[csr.traverse(i, "in", ["116680003"], degree=1)]) == children
+    assert "129574000" in csr.sctids[csr.traverse(i, "in", ["116680003"], True)]
@@ -0,0 +1,75 @@
+import pytest
+import re
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from snomed_graphe.graphe import SnomedGraph
+from typing import List
+
+
+def test_ecl_descendants(sct: SnomedGraph, descendants: List[str]) -> None:
+    assert sorted(sct.ecl("< 129574000")) == descendants
+    assert sorted(sct.ecl("<< 129574000")) == sorted(descendants + ["129574000"])
+
+
+def test_ecl_ancestors(sct: SnomedGraph, ancestors: List[str], parents: List[str]) -> None:
+    assert sorted(sct.ecl("> 129574000 |Postoperative myocardial infarction|")) == ancestors
+    assert sct.ecl(">! 129574000") == parents
+
+
+def test_ecl_children(sct: SnomedGraph, children: List[str]) -> None:
+    assert sorted(sct.ecl("<! 129574000")) == children
+
+
+def test_ecl_operators(sct: SnomedGraph) -> None:
+    s = sct.ecl("(<< 129574000 MINUS << 311793000) OR 138875005")
+    s.sort()
+
+    assert s == ["1163440003", "129574000", "138875005", "311792005", "311796008"]
+    assert sct.ecl("<< 129574000 AND << 311793000") == ["311793000", "test"]
+
+
+def test_ecl_refinement(sct: SnomedGraph) -> None:
+    s = sct.ecl("<< 404684003 : 363698007 = << 123037004")
+    s.sort()
+
+    assert s == ["1163440003", "129574000", "311792005", "311793000", "311796008"]
+    assert sct.ecl("<< 404684003 : 363698007 = 58148009") == ["311796008"]
+    assert sorted(sct.ecl("<< 404684003 : 363698007 != << 74281007")) == ["311792005",
+                                                                           "311796008"]
+
+
+def test_ecl_group(sct: SnomedGraph) -> None:
+    s = sct.ecl("<< 404684003 : { 363698007 = 74281007, 116676008 = 55641003 }")
+    s.sort()
+
+    assert s == ["129574000", "311793000"]
+    assert sct.ecl("<< 404684003 : { 363698007 = 74281007, 255234002 = 387713003 }") == []
+
+
+def test_explain_ecl(sct: SnomedGraph) -> None:
+    plan = sct.explain_ecl("<< 404684003 : 363698007 = 74281007").split("\n")
+
+    assert len(plan) == 4
+    assert plan[0].startswith("RAFFINEMENT") and plan[0].endswith("ms)")
+    assert "-> 3 concepts" in plan[0]
+
+
+def test_explain_ecl_concurrent(sct: SnomedGraph) -> None:
+    expressions = ["<< 404684003 : { 363698007 = 74281007, 116676008 = 55641003 }",
+                   "(<< 129574000 MINUS << 311793000) OR 138875005"]
+    expected = [sct.explain_ecl(e) for e in expressions]
+    with ThreadPoolExecutor(4) as pool:
+        plans = list(pool.map(sct.explain_ecl, expressions * 20))
+
+    strip = partial(re.sub, r"\(\d+\.\d+ ms\)", "")
+    assert list(map(strip, plans)) == list(map(strip, expected * 20))
+    # Les évaluations ne conservent aucune mesure dans le moteur, partagé par le graphe
+    assert vars(sct._ecl_engine).keys() == {"csr", "attribute_index"}
+
+
+@pytest.mark.parametrize("expression", ["<< 129574000 AND << 1 OR 2", "<<", "<< 129574000 :",
+                                        "<< 999", "<< 129574000 : 363698007 < 1"])
+def test_ecl_error(sct: SnomedGraph, expression: str) -> None:
+    with pytest.raises(ValueError):
+        sct.ecl(expression)
@@ -1,4 +1,6 @@
+import numpy as np
 import pandas as pd
+import pickle
 import pytest
 
 from snomed_graphe.graphe import SnomedGraph
@@ -48,6 +50,37 @@ def test_get_full_concept(sct: SnomedGraph, full: Dict[str, Union[str, Dict]]) -
     assert attributs == full
 
 
+def test_get_full_concept_lazy(sct: SnomedGraph) -> None:
+    c = sct.get_full_concept("129574000")
+
+    assert callable(c._parents) and callable(c._relationships)
+    assert c.fsn == "Postoperative myocardial infarction (disorder)"
+    assert c.parents is c.parents
+    assert not callable(c._parents) and callable(c._children)
+
+
+def test_get_full_concepts(sct: SnomedGraph) -> None:
+    sctids = ["129574000", "404684003", "74281007"]
+    bulk = sct.get_full_concepts(sctids)
+    lazy = [sct.get_full_concept(s) for s in sctids]
+
+    assert [c.sctid for c in bulk] == sctids
+    for b, c in zip(bulk, lazy):
+        assert not callable(b._parents) and not callable(b._relationships)
+        assert b.parents == c.parents
+        assert b.children == c.children
+        assert ({k: [(r.src, r.attribute, r.tgt) for r in v] for k, v in b.relationships.items()}
+                == {k: [(r.src, r.attribute, r.tgt) for r in v]
+                    for k, v in c.relationships.items()})
+
+    partial = sct.get_full_concepts(sctids, parts=["children"])[0]
+    assert callable(partial._parents) and not callable(partial._children)
+    assert partial.parents == lazy[0].parents
+
+    with pytest.raises(ValueError):
+        sct.get_full_concepts(sctids, parts=["ancestors"])
+
+
 def test_get_grouped_relationships(sct: SnomedGraph,
                                    grouped_rel: Dict[str, List[Tuple[str]]]) -> None:
     rel = {k: [(r.attribute.sctid, r.tgt.sctid) for r in v]
@@ -56,6 +89,35 @@ def test_get_grouped_relationships(sct: SnomedGraph,
     assert rel == grouped_rel
 
 
+def test_get_concept_details_interned(sct: SnomedGraph) -> None:
+    c = sct.get_concept_details("129574000")
+    attribute = [r.attribute for r in sct._out_relationships("129574000")]
+
+    assert sct.get_concept_details("129574000") is c
+    assert sct.get_parents("311796008")[0] is c
+    assert attribute[0] is sct.get_concept_details(attribute[0].sctid)
+
+    sct.intern = False
+    assert sct.get_concept_details("129574000") is not c
+    assert sct.get_concept_details("129574000") == c
+
+
+def test_components_immutable(sct: SnomedGraph) -> None:
+    c = sct.get_full_concept("129574000")
+    rel = c.relationships["1"][0]
+
+    for obj, attr in [(c.concept_details, "fsn"), (rel, "tgt"), (c, "parents")]:
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            setattr(obj, attr, None)
+    with pytest.raises(AttributeError):
+        del c.concept_details.sctid
+
+    copy = pickle.loads(pickle.dumps(rel))
+    assert (copy.src, copy.tgt, copy.group, copy.attribute) == (rel.src, rel.tgt, rel.group,
+                                                                rel.attribute)
+
+
 def test_get_ungrouped_relationships(sct: SnomedGraph, ungrouped_rel: List[Tuple[str]]) -> None:
     rel = [(r.attribute.sctid, r.tgt.sctid)
            for r in sct.get_ungrouped_relationships("129574000")]
@@ -102,6 +164,46 @@ def test_get_parents(sct: SnomedGraph, parents: List[str]) -> None:
     assert p == parents
 
 
+##########################################
+# Tests des méthodes de requête indexées #
+##########################################
+
+
+def test_find_by_attribute(sct: SnomedGraph) -> None:
+    s = sct.find_by_attribute("363698007", "74281007")
+    s.sort()
+
+    assert s == ["1163440003", "129574000", "311793000"]
+
+
+def test_find_by_attribute_value_descendants(sct: SnomedGraph) -> None:
+    s = sct.find_by_attribute("363698007", "123037004")
+    s.sort()
+
+    assert s == ["1163440003", "129574000", "311792005", "311793000", "311796008"]
+    assert sct.find_by_attribute("363698007", "123037004", value_descendants=False) == []
+
+
+def test_find_by_attribute_hierarchy(sct: SnomedGraph) -> None:
+    s = sct.find_by_attribute("116676008", hierarchy="311793000")
+
+    assert s == ["311793000"]
+
+
+def test_find_by_semtag(sct: SnomedGraph) -> None:
+    assert sorted(sct.find_by_semtag("morphologic abnormality")) == ["55470003", "55641003"]
+    assert sorted(sct.find_by_semtag(["procedure", "test"])) == ["387713003", "71388002", "test"]
+    assert sct.find_by_semtag("inconnu") == []
+
+
+def test_semtags(sct: SnomedGraph) -> None:
+    semtags = sct.semtags
+
+    assert sct.semtags is semtags
+    assert semtags[sct.csr.index_of(["129574000"])[0]] == \
+        sct.get_concept_details("129574000").semtag
+
+
 ############################################
 # Tests des méthodes de calcul des chemins #
 ############################################
@@ -140,6 +242,30 @@ def test_path_direction(sct: SnomedGraph) -> None:
     assert path_up == path_down[::-1]
 
 
+@pytest.mark.parametrize("sctid", ["129574000", 129574000])
+def test_int_keys(sct: SnomedGraph, sct_int: SnomedGraph, sctid: Union[str, int]) -> None:
+    def ids(concepts: List) -> List[int]:
+        # Le concept "test", absent de `sct_int`, est ignoré
+        sctids = [str(c.sctid if hasattr(c, "sctid") else c) for c in concepts]
+        return sorted(int(s) for s in sctids if s != "test")
+
+    assert sctid in sct_int and sctid in sct
+    assert sct_int.get_concept_details(sctid).sctid == 129574000
+    assert sct_int.root == 138875005
+    for method in ["get_parents", "get_children", "get_ancestors", "get_descendants"]:
+        assert ids(getattr(sct_int, method)(sctid)) == ids(getattr(sct, method)(sctid))
+    assert list(sct_int.get_grouped_relationships(sctid)) == [1, 2]
+    assert ids(sct_int.get_full_concept(sctid).children) == ids(sct.get_children(sctid))
+    assert ids(sct_int.ecl(f"<< {sctid}")) == ids(sct.ecl(f"<< {sctid}"))
+    assert ids(sct_int.find_by_attribute("363698007", "74281007", hierarchy=sctid)) == \
+        ids(sct.find_by_attribute("363698007", "74281007", hierarchy=sctid))
+    assert ids(sct_int.search_in_desc("myocard", hierarchy=sctid)) == \
+        ids(sct.search_in_desc("myocard", hierarchy=sctid))
+    assert ids(sct_int.hierarchical_path_to_root(sctid)) == \
+        ids(sct.hierarchical_path_to_root(sctid))
+    assert ids(sct_int.subgraph(sctid).g.nodes) == ids(sct.subgraph(sctid).g.nodes)
+
+
 ################################################################
 # Test des méthodes de manipulation & transformation du graphe #
 ################################################################
@@ -158,6 +284,30 @@ def test_graph_to_pandas_edges(sct: SnomedGraph, df_edges: pd.DataFrame) -> None
     pd.testing.assert_frame_equal(sct_edges, df_edges)
 
 
+def test_graph_to_tables(sct: SnomedGraph, df_nodes: pd.DataFrame,
+                         df_edges: pd.DataFrame) -> None:
+    nodes, edges = sct.graph_to_tables()
+
+    syn = ["syn_en", "syn_lang"]
+    pd.testing.assert_frame_equal(nodes.set_index("sctid").drop(columns=["semtag", *syn]),
+                                  df_nodes.drop(columns=syn))
+    # SYN toujours sous forme de listes, vides pour les concepts sans synonyme
+    assert nodes.loc[:, "syn_en"].map(type).eq(list).all()
+    assert list(nodes.loc[:, "syn_en"]) == [s if s else [] for s in df_nodes.loc[:, "syn_en"]]
+    assert nodes.loc[nodes.loc[:, "sctid"] == "test", "semtag"].item() == "test"
+    assert sorted(zip(edges.loc[:, "source"], edges.loc[:, "target"],
+                      edges.loc[:, "attribute"].astype(str), edges.loc[:, "group"])) == \
+        sorted(zip(df_edges.loc[:, "source"], df_edges.loc[:, "target"],
+                   df_edges.loc[:, "attribute"], df_edges.loc[:, "group"].astype(int)))
+
+
+def test_graph_to_tables_semtag(sct: SnomedGraph) -> None:
+    nodes, edges = sct.graph_to_tables(semtag="procedure")
+
+    assert list(nodes.loc[:, "sctid"]) == ["387713003", "71388002"]
+    assert list(edges.loc[:, "source"]) == ["387713003", "71388002"]
+
+
 def test_desc_to_pandas(sct: SnomedGraph, df_desc: pd.DataFrame) -> None:
     desc = sct.desc_to_pandas()
     desc.reset_index(drop=True, inplace=True)
@@ -165,6 +315,73 @@ def test_desc_to_pandas(sct: SnomedGraph, df_desc: pd.DataFrame) -> None:
     pd.testing.assert_frame_equal(desc, df_desc)
 
 
+def test_desc_table_cached(sct: SnomedGraph) -> None:
+    desc = sct._desc_table()
+
+    assert sct._desc_table() is desc
+    assert isinstance(desc.loc[:, "lang"].dtype, pd.CategoricalDtype)
+    assert isinstance(desc.loc[:, "acceptability"].dtype, pd.CategoricalDtype)
+
+    sct.g.add_node("0", fsn="Zero (test)", pt_en="Zero", pt_lang="zero", syn_en="", syn_lang="")
+    assert sct._desc_table() is not desc
+    assert sct.search_in_desc("zero") == ["0"]
+
+
+def test_details_to_pandas(sct: SnomedGraph) -> None:
+    sctids = pd.Series(["74281007", "absent", "129574000", None, "74281007"],
+                       index=[10, 11, 12, 13, 14])
+    df = sct.details_to_pandas(sctids)
+
+    assert list(df.columns) == ["sctid", "exists", "fsn", "pt_en", "pt_lang", "syn_en",
+                                "syn_lang", "semtag"]
+    assert list(df.index) == [10, 11, 12, 13, 14]
+    assert df.loc[:, "exists"].tolist() == [True, False, True, False, True]
+    assert df.loc[:, "sctid"].tolist() == sctids.tolist()
+    for i, sctid in zip([10, 12, 14], ["74281007", "129574000", "74281007"]):
+        c = sct.get_concept_details(sctid)
+        assert [df.loc[i, k] for k in ["fsn", "pt_en", "pt_lang", "syn_en", "syn_lang"]] == \
+            [c.fsn, c.pt_en, c.pt_lang, c.syn_en, c.syn_lang]
+        assert df.loc[i, "semtag"] == c.semtag
+    assert df.loc[[11, 13], ["fsn", "semtag"]].isna().all().all()
+    assert isinstance(df.loc[:, "semtag"].dtype, pd.CategoricalDtype)
+    assert sct.details_to_pandas([]).shape == (0, 8)
+
+
+def test_details_to_pandas_int_keys(sct_int: SnomedGraph) -> None:
+    expected = [True, True, False, False]
+    for sctids in [np.array([74281007, 129574000, 1, 2]),
+                   pd.Series([74281007.0, 129574000, np.nan, 1.5]),
+                   pd.Series(["74281007", " 129574000", "12a", None]),
+                   pd.array([74281007, 129574000, 1, None], dtype="Int64")]:
+        df = sct_int.details_to_pandas(sctids)
+        assert df.loc[:, "exists"].tolist() == expected
+        assert df.loc[:, "pt_lang"].tolist()[:2] == \
+            [sct_int.get_concept_details(74281007).pt_lang,
+             sct_int.get_concept_details(129574000).pt_lang]
+
+
+def test_desc_to_pandas_semtag(sct: SnomedGraph) -> None:
+    desc = sct.desc_to_pandas(semtag="body structure")
+
+    assert sorted(desc.loc[:, "conceptId"].unique()) == \
+        ["123037004", "58148009", "6975006", "74281007"]
+
+
+def test_graph_to_pandas_semtag(sct: SnomedGraph) -> None:
+    nodes, edges = sct.graph_to_pandas(semtag="procedure")
+
+    assert sorted(nodes.index) == ["387713003", "71388002"]
+    assert set(edges.loc[:, "source"]) == {"387713003", "71388002"}
+
+
+def test_subgraph_semtag(sct: SnomedGraph) -> None:
+    sub = sct.subgraph("404684003", semtag="disorder")
+
+    assert "404684003" in sub and "311793000" in sub
+    # Le concept "test", descendant sans le tag, est exclu
+    assert "test" not in sub
+
+
 def test_subgraph(sct: SnomedGraph, sub_sct: SnomedGraph) -> None:
     sub = sct.subgraph("311793000", True, True)
 
@@ -218,3 +435,135 @@ def test_search_in_desc_absent(sct: SnomedGraph, search_absent: List[str]) -> No
     s.sort()
 
     assert s == search_absent
+
+
+def test_search_in_desc_hierarchy(sct: SnomedGraph) -> None:
+    # Les valeurs d'attributs des concepts de la hiérarchie (55641003) sont exclues
+    s = sct.search_in_desc("infarctus", hierarchy="404684003")
+    s.sort()
+
+    assert s == ["1163440003", "129574000", "311792005", "311793000", "311796008"]
+
+
+def test_search_in_desc_hierarchies(sct: SnomedGraph) -> None:
+    s = sct.search_in_desc("infarctus", hierarchy=["311796008", "123037004"])
+    s.sort()
+
+    assert s == ["311796008", "55641003"]
+
+
+def test_search_in_desc_hierarchy_cache(sct: SnomedGraph) -> None:
+    sct.search_in_desc("infarctus", hierarchy=["404684003", "123037004"])
+    sct.search_in_desc("infarctus", hierarchy="311796008")
+    sct.search_in_desc("infarctus", hierarchy=["311796008", "404684003"])
+
+    # Seuls les masques des hiérarchies de premier niveau sont conservés
+    assert sorted(k for k in sct._cache if k.startswith("hierarchy_")) == \
+        ["hierarchy_123037004", "hierarchy_404684003"]
+
+
+def test_search_in_desc_fold(sct: SnomedGraph) -> None:
+    sct.g.add_node("0", fsn="Zero (test)", pt_en="Zero", pt_lang="Hémorragie cérébrale",
+                   syn_en="", syn_lang="")
+
+    assert sct.search_in_desc("hemorragie") == []
+    assert sct.search_in_desc("HEMORRAGIE", fold_term=True) == ["0"]
+    assert sct.search_in_desc("hémorragie", fold_term=True) == ["0"]
+    assert sct.search_in_desc("^Hémorragie c", fold_term=True, regex_term=True) == ["0"]
+
+
+def test_search_in_desc_strip_punct(sct: SnomedGraph) -> None:
+    assert sct.search_in_desc("sous endocardique", fold_term=True) == []
+    assert sct.search_in_desc("Sous endocardique", fold_term=True, strip_punct=True) == \
+        ["311796008", "58148009"]
+
+
+def test_search_in_desc_semtag(sct: SnomedGraph) -> None:
+    s = sct.search_in_desc("infarctus", semtag="morphologic abnormality")
+
+    assert s == ["55641003"]
+    assert sct.search_in_desc_batch(["infarctus"], semtag=["disorder"]) == \
+        {"infarctus": sct.search_in_desc("infarctus", semtag="disorder")}
+
+
+def test_search_in_desc_batch(sct: SnomedGraph) -> None:
+    terms = ["myo", "Infarctus", "absent"]
+    s = sct.search_in_desc_batch(terms, accept="PREF", hierarchy="404684003")
+
+    assert s == {t: sct.search_in_desc(t, accept="PREF", hierarchy="404684003") for t in terms}
+    assert s["absent"] == []
+
+
+def test_search_in_desc_batch_fold(sct: SnomedGraph) -> None:
+    terms = ["POSTOPÉRATOIRE", "sous endo"]
+    s = sct.search_in_desc_batch(terms, fold_term=True, strip_punct=True)
+
+    assert s == {t: sct.search_in_desc(t, fold_term=True, strip_punct=True) for t in terms}
+
+
+def test_search_in_desc_batch_regex(sct: SnomedGraph) -> None:
+    terms = ["^myo", "sous-endo"]
+    s = sct.search_in_desc_batch(terms, regex_term=True, case_term=True, processes=2,
+                                 chunk_size=10)
+
+    assert s == {t: sct.search_in_desc(t, regex_term=True, case_term=True) for t in terms}
+
+
+def test_autocomplete(sct: SnomedGraph) -> None:
+    assert sct.autocomplete("Myo") == [("74281007", "myocarde"), ("6975006", "myocarde anterieur"),
+                                       ("58148009", "myocarde sous-endocardique")]
+    assert sct.autocomplete("myo", k=1) == [("74281007", "myocarde")]
+    assert sct.autocomplete("absent") == []
+
+
+def test_autocomplete_pt_first(sct: SnomedGraph) -> None:
+    # "structure du myocarde" est un SYN : il suit les PT
+    assert [c for c, _ in sct.autocomplete("structure")] == \
+        ["123037004", "6975006", "58148009", "74281007"]
+
+
+def test_autocomplete_filters(sct: SnomedGraph) -> None:
+    assert sct.autocomplete("inf", semtag="morphologic abnormality") == [("55641003", "Infarct")]
+    assert [c for c, _ in sct.autocomplete("inf", hierarchy=["311796008", "311793000"])] == \
+        ["311796008", "311793000"]
+    assert sct.autocomplete("inf", semtag="inconnu") == []
+
+
+def test_search_tokens(sct: SnomedGraph) -> None:
+    s = sct.search_tokens("myocarde")
+    s.sort()
+
+    assert s == ["1163440003", "58148009", "6975006", "74281007"]
+
+
+def test_search_tokens_filters(sct: SnomedGraph) -> None:
+    assert sct.search_tokens("myocarde", accept="ACCEPT", hierarchy="123037004") == \
+        ["74281007", "6975006"]
+    assert sct.search_tokens("infarction", lang="en", fsn="acute") == ["1163440003"]
+    assert sct.search_tokens("disorder", accept="FSN", hierarchy="311793000") == ["311793000"]
+    assert sct.search_tokens("infarctus", hierarchy=["311796008", "123037004"]) == \
+        ["311796008", "55641003"]
+
+
+def test_search_tokens_error(sct: SnomedGraph) -> None:
+    with pytest.raises(ValueError):
+        sct.search_tokens("myocarde", accept="valeur incorrecte")
+
+
+def test_search_fuzzy(sct: SnomedGraph) -> None:
+    s = sct.search_fuzzy("myocard")
+
+    assert [c for c, _ in s] == ["74281007", "6975006", "58148009"]
+    assert [score for _, score in s] == sorted((score for _, score in s), reverse=True)
+
+
+def test_search_fuzzy_filters(sct: SnomedGraph) -> None:
+    assert [c for c, _ in sct.search_fuzzy("myocard", k=1)] == ["74281007"]
+    assert [c for c, _ in sct.search_fuzzy("myocarde", hierarchy="123037004")] == \
+        ["74281007", "6975006", "58148009"]
+    assert [c for c, _ in sct.search_fuzzy("myocarde", accept="FSN")] == ["74281007"]
+
+
+def test_search_fuzzy_error(sct: SnomedGraph) -> None:
+    with pytest.raises(ValueError):
+        sct.search_fuzzy("myocarde", accept="valeur incorrecte")
@@ -0,0 +1,31 @@
+import numpy as np
+
+from snomed_graphe.graphe import SnomedGraph
+
+
+def test_attribute_index_excludes_is_a(sct: SnomedGraph) -> None:
+    index = sct.attribute_index
+    isa = sct.csr.type_codes(["116680003"])[0]
+
+    assert len(index) == 16
+    assert (index.types != isa).all()
+
+
+def test_attribute_index_lookup(sct: SnomedGraph) -> None:
+    csr = sct.csr
+    sources, groups = sct.attribute_index.sources_of(["116676008"],
+                                                     csr.index_of(["55641003"]))
+
+    assert sorted(csr.sctids[sources]) == ["129574000", "311792005", "311793000", "311796008"]
+    assert (groups == 1).all()
+
+
+def test_attribute_index_lookup_all_values(sct: SnomedGraph) -> None:
+    sources, groups = sct.attribute_index.sources_of(["263502005"])
+
+    assert list(sct.csr.sctids[sources]) == ["1163440003"]
+    assert list(groups) == [3]
+
+
+def test_attribute_index_unknown(sct: SnomedGraph) -> None:
+    assert len(sct.attribute_index.lookup(["0"], np.array([0]))) == 0
@@ -1,7 +1,10 @@
+import networkx as nx
 import pandas as pd
+import pytest
 
 from pathlib import Path
 from snomed_graphe import io
+from snomed_graphe.graphe import SnomedGraph
 
 
 def test_rf2_paths(tmp_path: Path, concept_file: pd.DataFrame, desc_en_file: pd.DataFrame,
@@ -112,4 +115,99 @@ def test_from_rf2(tmp_path: Path, concept_file: pd.DataFrame, desc_en_file: pd.D
 
     sct = io.from_rf2(dir, "fr")
 
-    assert (list(sct.g.nodes), list(sct.g.edges)) == (["1009", "2009", "4009"], [("1009", "2009")])
+    assert (list(sct.g.nodes), list(sct.g.edges)) == ([1009, 2009, 4009], [(1009, 2009)])
+    assert sct.g.edges[(1009, 2009)] == {"src": 1009, "tgt": 2009, "group": 0, "attribute": 4009}
+    assert "1009" in sct
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_from_rf2_int_keys(tmp_path: Path, concept_file: pd.DataFrame,
+                           desc_en_file: pd.DataFrame, desc_fr_file: pd.DataFrame,
+                           en_accept_file: pd.DataFrame, fr_accept_file: pd.DataFrame,
+                           relationship_file: pd.DataFrame, backend: str) -> None:
+    # Fichiers nommés comme les attend `_rf2_paths` (préfixe "x" des éditions nationales)
+    dir = tmp_path / "SnomedCT_ManagedServiceFR_PRODUCTION_FR1000315_20240621T120000Z"
+    terminology = dir / "Snapshot" / "Terminology"
+    lang_refset = dir / "Snapshot" / "Refset" / "Language"
+    terminology.mkdir(parents=True)
+    lang_refset.mkdir(parents=True)
+    files = {terminology / "xsct2_Concept_Snapshot_FR1000315_20240621.txt": concept_file,
+             terminology / "xsct2_Description_Snapshot-en_FR1000315_20240621.txt": desc_en_file,
+             terminology / "xsct2_Description_Snapshot-fr_FR1000315_20240621.txt": desc_fr_file,
+             terminology / "xsct2_Relationship_Snapshot_FR1000315_20240621.txt":
+                 relationship_file,
+             lang_refset / "xder2_cRefset_LanguageSnapshot-en_FR1000315_20240621.txt":
+                 en_accept_file,
+             lang_refset / "xder2_cRefset_LanguageSnapshot-fr_FR1000315_20240621.txt":
+                 fr_accept_file}
+    for path, df in files.items():
+        df.to_csv(path, sep="\t", encoding="UTF-8", index=False)
+
+    sct = io.from_rf2(dir, "fr", backend=backend)
+
+    edges = sct.backend.edges_frame().loc[:, ["src", "tgt", "group", "attribute"]]
+
+    assert sorted(sct.backend.nodes()) == [1009, 2009, 4009]
+    assert all(type(n) is int for n in sct.backend.nodes())
+    assert edges.to_dict("records") == [{"src": 1009, "tgt": 2009, "group": 0, "attribute": 4009}]
+    assert all(type(v) is int for v in edges.astype(object).to_numpy().ravel())
+    assert sct.get_concept_details(1009) == sct.get_concept_details("1009")
+    assert "1009" in sct and 1009 in sct
+
+
+def test_save_token_index(tmp_path: Path, sct: SnomedGraph) -> None:
+    io.save(sct, tmp_path / "graphe.gml", token_index=True)
+    loaded = io.from_serialized(tmp_path / "graphe.gml")
+
+    assert "token_index" in loaded._cache
+    assert loaded.search_tokens("myocarde") == sct.search_tokens("myocarde")
+
+
+def test_save_token_index_stale(tmp_path: Path, sct: SnomedGraph) -> None:
+    io.save(sct, tmp_path / "graphe.gml", token_index=True)
+    sct.g.nodes["74281007"]["pt_lang"] = "Grippe"
+    sct.clear_cache()
+
+    # L'index sauvegardé auparavant n'est pas rechargé avec le graphe modifié
+    nx.write_gml(sct.g, tmp_path / "graphe.gml")
+    loaded = io.from_serialized(tmp_path / "graphe.gml")
+    assert "token_index" not in loaded._cache
+    assert loaded.search_tokens("grippe") == [74281007]
+
+    io.save(sct, tmp_path / "graphe.gml")
+    loaded = io.from_serialized(tmp_path / "graphe.gml")
+    assert not (tmp_path / "graphe.tokens.npz").exists()
+    assert loaded.search_tokens("grippe") == [74281007]
+
+
+def test_from_serialized_int_keys(tmp_path: Path, sct_int: SnomedGraph) -> None:
+    io.save(sct_int, tmp_path / "graphe.gml")
+    loaded = io.from_serialized(tmp_path / "graphe.gml")
+
+    assert list(loaded.g.nodes) == list(sct_int.g.nodes)
+    assert loaded.get_parents("129574000") == sct_int.get_parents(129574000)
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_export_tables(tmp_path: Path, sct: SnomedGraph, format: str) -> None:
+    pa = pytest.importorskip("pyarrow")
+    io.export_tables(sct, tmp_path / "export", format=format, chunk_size=10)
+
+    nodes, edges = sct.graph_to_tables()
+    if format == "parquet":
+        import pyarrow.parquet as pq
+        table = pq.read_table(tmp_path / "export" / "edges.parquet")
+        assert pq.ParquetFile(tmp_path / "export" / "edges.parquet").num_row_groups == 4
+    else:
+        reader = pa.ipc.open_file(tmp_path / "export" / "edges.arrow")
+        assert reader.num_record_batches == 4
+        table = reader.read_all()
+    assert table.num_rows == len(edges)
+    assert table.column("source").to_pylist() == list(edges.loc[:, "source"])
+
+
+def test_export_tables_error(tmp_path: Path, sct: SnomedGraph) -> None:
+    with pytest.raises(ValueError):
+        io.export_tables(sct, tmp_path, format="csv")
+    with pytest.raises(ValueError):
+        io.export_tables(sct, tmp_path, chunk_size=0)
@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from snomed_graphe.graphe import SnomedGraph
+from snomed_graphe.memory import deep_nbytes, graph_nbytes, report
+
+
+def test_memory_usage(sct: SnomedGraph) -> None:
+    usage = sct.memory_usage()
+
+    assert usage.index.names == ["component", "part"] and usage.name == "bytes"
+    assert list(usage.index.get_level_values(0).unique()) == ["nodes", "edges", "undirected",
+                                                              "caches"]
+    assert usage[("undirected", "view")] < 1000
+    assert (usage > 0).all()
+
+
+def test_memory_usage_sample(sct: SnomedGraph) -> None:
+    # Petit graphe : l'échantillon couvre toutes les collections
+    assert sct.memory_usage(sample=1000).equals(sct.memory_usage(sample=None))
+    assert sct.memory_usage(sample=5).sum() == pytest.approx(sct.memory_usage().sum(), rel=0.5)
+
+
+def test_memory_usage_indexes(sct: SnomedGraph) -> None:
+    sct.search_tokens("infarctus")
+    sct.compact_terms()
+    usage = sct.memory_usage()
+
+    assert ("indexes", "token_index") in usage.index
+    assert usage.index.get_loc(("indexes", "token_index")) < \
+        usage.index.get_loc(("caches", "details"))
+    assert ("nodes", "terms") in usage.index
+
+
+def test_memory_usage_csr(sct: SnomedGraph) -> None:
+    usage = SnomedGraph(sct.g, backend="csr").memory_usage()
+
+    assert list(usage.loc["nodes"].index) == ["terms", "index"]
+    assert "undirected" not in usage.index.get_level_values(0)
+    assert usage[("edges", "arrays")] > 0
+
+
+def test_graph_nbytes(sct: SnomedGraph) -> None:
+    sizes = graph_nbytes(sct.g, sample=None)
+
+    assert list(sizes) == ["nodes", "adjacency", "edges"]
+    assert graph_nbytes(sct.g, sample=5)["edges"] == pytest.approx(sizes["edges"], rel=0.5)
+
+
+def test_deep_nbytes() -> None:
+    values = np.arange(1000)
+    df = pd.DataFrame({"a": values.astype(object), "b": [f"terme {i}" for i in range(1000)],
+                       "c": pd.Categorical(["FSN", "SYN"] * 500)})
+
+    assert deep_nbytes(values) == values.nbytes
+    assert deep_nbytes(values[:10]) == values.nbytes
+    assert deep_nbytes([values, values]) == deep_nbytes([values]) + 8
+    assert deep_nbytes(df, sample=None) == pytest.approx(df.memory_usage(deep=True).sum(),
+                                                         rel=0.1)
+    # Les colonnes temporaires ne doivent pas masquer les suivantes
+    assert deep_nbytes(df, sample=10) == pytest.approx(deep_nbytes(df, sample=None), rel=0.1)
+
+
+def test_report() -> None:
+    usage = report({("nodes", "attributes"): 10, ("edges", "adjacency"): 5})
+
+    assert usage.sum() == 15 and usage.dtype == np.int64
+    assert usage.loc["nodes"].to_dict() == {"attributes": 10}
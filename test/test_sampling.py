@@ -0,0 +1,42 @@
+import numpy as np
+
+from snomed_graphe.graphe import SnomedGraph
+from typing import List
+
+
+def test_sample_fanout(sct: SnomedGraph) -> None:
+    blocks = sct.neighbor_sampler([2, 3], seed=0).sample(["129574000", "test"])
+
+    assert len(blocks) == 2
+    assert list(sct.csr.sctids[blocks[0].dst_nodes]) == ["129574000", "test"]
+    for block in blocks:
+        assert (np.diff(block.indptr) <= 3).all()
+        assert (block.src_nodes[:block.num_dst] == block.dst_nodes).all()
+        assert block.indices.max() < block.num_src
+
+
+def test_sample_neighbors(sct: SnomedGraph, children: List[str], parents: List[str]) -> None:
+    block = sct.neighbor_sampler([-1], ["116680003"], seed=0).sample(["129574000"])[0]
+    neighbors = sct.csr.sctids[block.src_nodes[block.indices]]
+
+    assert sorted(neighbors) == sorted(children + parents)
+
+
+def test_sample_direction(sct: SnomedGraph, parents: List[str]) -> None:
+    block = sct.neighbor_sampler([5], ["116680003"], "out", seed=0).sample(["129574000"])[0]
+
+    assert list(sct.csr.sctids[block.src_nodes[block.indices]]) == parents
+
+
+def test_sample_reproducible(sct: SnomedGraph) -> None:
+    a = sct.neighbor_sampler([2, 2], seed=42).sample(["129574000", "311793000"])
+    b = sct.neighbor_sampler([2, 2], seed=42).sample(["129574000", "311793000"])
+
+    assert all((x.src_nodes == y.src_nodes).all() and (x.indices == y.indices).all()
+               for x, y in zip(a, b))
+
+
+def test_sample_replace(sct: SnomedGraph) -> None:
+    block = sct.neighbor_sampler([10], replace=True, seed=0).sample(["129574000"])[0]
+
+    assert len(block.indices) == 10
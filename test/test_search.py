@@ -0,0 +1,95 @@
+from pathlib import Path
+from snomed_graphe.graphe import SnomedGraph
+from snomed_graphe.search import TermMatcher, TokenIndex
+from snomed_graphe.text import fold
+
+
+def test_token_index_and(sct: SnomedGraph) -> None:
+    index = sct.token_index
+    docs = index.search("myocarde anterieur")
+
+    assert sorted(set(index.concepts[docs])) == ["6975006"]
+
+
+def test_token_index_or(sct: SnomedGraph) -> None:
+    index = sct.token_index
+    docs = index.search("idm OR sous-endocardique")
+
+    assert sorted(set(index.concepts[docs])) == ["1163440003", "311796008", "58148009"]
+
+
+def test_token_index_phrase(sct: SnomedGraph) -> None:
+    index = sct.token_index
+
+    assert sorted(set(index.concepts[index.search('"structure du myocarde"')])) == \
+        ["6975006", "74281007"]
+    assert len(index.search('"myocarde du structure"')) == 0
+
+
+def test_token_index_unknown(sct: SnomedGraph) -> None:
+    assert len(sct.token_index.search("inconnu")) == 0
+    assert len(sct.token_index.search("")) == 0
+
+
+def test_token_index_save(tmp_path: Path, sct: SnomedGraph) -> None:
+    sct.token_index.save(tmp_path / "tokens.npz")
+    index = TokenIndex.load(tmp_path / "tokens.npz")
+
+    assert list(index.concepts[index.search("myocarde")]) == \
+        list(sct.token_index.concepts[sct.token_index.search("myocarde")])
+
+
+def test_fold() -> None:
+    assert fold("Hémorragie Cérébrale") == "hemorragie cerebrale"
+    assert fold("Myocarde sous-endocardique", punctuation=False) == "myocarde sous endocardique"
+    assert fold(r"^H\Wé", case=True) == r"^H\We"
+
+
+def test_trigram_index(sct: SnomedGraph) -> None:
+    index = sct.trigram_index
+    docs, scores = index.search("myocrade", min_similarity=0.3)
+
+    assert sorted(set(index.concepts[docs])) == ["58148009", "6975006", "74281007"]
+    assert ((scores >= 0.3) & (scores <= 1)).all()
+
+
+def test_trigram_index_accents(sct: SnomedGraph) -> None:
+    index = sct.trigram_index
+    docs, scores = index.search("MYOCARDE")
+
+    assert index.concepts[docs[scores.argmax()]] == "74281007"
+    assert scores.max() == 1
+
+
+def test_trigram_index_unknown(sct: SnomedGraph) -> None:
+    assert len(sct.trigram_index.search("xyz")[0]) == 0
+    assert len(sct.trigram_index.search("")[0]) == 0
+
+
+def test_term_matcher() -> None:
+    texts = ["Infarctus du myocarde", "myocarde", "cardiomyopathie", "rien"]
+    terms, rows = TermMatcher(["myo", "Myocarde", "infarctus", "zzz"]).match(texts)
+
+    assert list(zip(terms, rows)) == [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (2, 0)]
+
+
+def test_term_matcher_case() -> None:
+    terms, rows = TermMatcher(["myo", "Myocarde"], case=True).match(["Myocarde", "myocarde"])
+
+    assert list(zip(terms, rows)) == [(0, 1), (1, 0)]
+
+
+def test_term_matcher_regex() -> None:
+    texts = ["Infarctus du myocarde", "myocarde", "cardiomyopathie"]
+    terms, rows = TermMatcher(["^myo", "arde$"], regex=True).match(texts, processes=2,
+                                                                    chunk_size=1)
+
+    assert list(zip(terms, rows)) == [(0, 1), (1, 0), (1, 1)]
+
+
+def test_term_matcher_regex_rows() -> None:
+    texts = ["foo a", "b bar", "xy", "infarctus"]
+    terms, rows = TermMatcher([r"a\sb", r"[^z]{6}"], regex=True).match(texts)
+
+    # Aucune occurrence à cheval sur deux textes, ni masquant celle du texte suivant
+    assert list(zip(terms, rows)) == [(1, 3)]
@@ -0,0 +1,175 @@
+import http.client
+import pytest
+import socket
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from snomed_graphe.graphe import SnomedGraph
+from snomed_graphe.loadtest import Client, load_test, sample_queries
+from snomed_graphe.server import MAX_BODY, QueryService, SnomedServer, _Handler
+from typing import Generator, Optional
+
+
+@pytest.fixture
+def server(sct: SnomedGraph) -> Generator[SnomedServer, None, None]:
+    server = SnomedServer(sct, port=0, cache_size=100)
+    server.service.warm_up()
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(server: SnomedServer) -> Generator[Client, None, None]:
+    with Client(server.url) as client:
+        yield client
+
+
+def test_details(client: Client, sct: SnomedGraph) -> None:
+    response = client.get("details", sctid="74281007")
+
+    assert response["status"] == 200
+    assert response["result"] == {"sctid": "74281007", "fsn": sct.get_concept_details(
+        "74281007").fsn, **{k: getattr(sct.get_concept_details("74281007"), k)
+                            for k in ["pt_en", "pt_lang", "syn_en", "syn_lang"]}}
+
+
+@pytest.mark.parametrize("method", ["parents", "children", "ancestors", "descendants"])
+def test_hierarchy(client: Client, sct: SnomedGraph, method: str) -> None:
+    result = client.get(method, sctid="404684003")["result"]
+    assert [c["sctid"] for c in result] == \
+        [c.sctid for c in getattr(sct, f"get_{method}")("404684003")]
+
+
+def test_full(client: Client, sct: SnomedGraph) -> None:
+    result = client.get("full", sctid="129574000")["result"]
+
+    assert [c["sctid"] for c in result["parents"]] == \
+        [c.sctid for c in sct.get_parents("129574000")]
+    assert list(result["relationships"]) == \
+        [str(g) for g in sct.get_grouped_relationships("129574000")]
+
+
+def test_paths_and_search(client: Client, sct: SnomedGraph) -> None:
+    path = client.get("hierarchical_path", src="test", tgt="138875005")["result"]
+    assert [c["sctid"] for c in path] == \
+        [c.sctid for c in sct.hierarchical_path("test", "138875005")]
+    assert client.get("search", term="myocard")["result"] == sct.search_in_desc("myocard")
+    assert client.get("search", term="INFARCTUS", case_term="false")["result"] == \
+        sct.search_in_desc("INFARCTUS", case_term=False)
+
+
+def test_errors(client: Client) -> None:
+    assert client.get("details", sctid="absent")["status"] == 404
+    assert client.get("unknown", sctid="74281007")["status"] == 400
+    assert client.get("details", code="74281007")["status"] == 400
+    assert client.get("search", term="a", bad="1")["status"] == 400
+    assert client.request("POST", "/batch", {"method": "details"})["status"] == 400
+
+
+@pytest.mark.parametrize("length, status", [(None, 400), ("-1", 400), ("abc", 400),
+                                             (str(MAX_BODY + 1), 413)])
+def test_content_length(server: SnomedServer, length: Optional[str], status: int) -> None:
+    conn = http.client.HTTPConnection(*server.server_address[:2], timeout=5)
+    conn.putrequest("POST", "/details")
+    if length is not None:
+        conn.putheader("Content-Length", length)
+    conn.endheaders(b'{"sctid": "74281007"}')
+    response = conn.getresponse()
+
+    assert response.status == status
+    assert response.getheader("Connection") == "close"
+    conn.close()
+
+
+def test_truncated_body(server: SnomedServer, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_Handler, "timeout", 0.2)
+    with socket.create_connection(server.server_address[:2], timeout=5) as sock:
+        sock.sendall(b"POST /details HTTP/1.1\r\nContent-Length: 100\r\n\r\n{}")
+        # Le serveur ferme la connexion au bout du délai, sans réponse
+        assert sock.recv(1024) == b""
+
+
+def test_internal_error(server: SnomedServer, client: Client,
+                        monkeypatch: pytest.MonkeyPatch) -> None:
+    def fail(sctid: str) -> None:
+        raise KeyError("fsn")
+
+    # Seul un concept absent des paramètres donne un 404, une erreur interne un 500
+    monkeypatch.setattr(server.service.graph, "get_concept_details", fail)
+    assert client.get("details", sctid="74281007")["status"] == 500
+    assert client.get("details", sctid="absent")["status"] == 404
+    assert client.get("search", term="a", hierarchy="absent")["status"] == 404
+    assert client.request("POST", "/details", {"sctid": {"a": 1}})["status"] == 400
+
+
+def test_no_path(server: SnomedServer, client: Client) -> None:
+    server.service.graph = server.service.graph.subgraph("129574000", down=False)
+    assert client.get("hierarchical_path", src="129574000", tgt="74281007")["status"] == 404
+
+
+def test_batch_and_post(client: Client, sct: SnomedGraph) -> None:
+    results = client.batch([{"method": "details", "params": {"sctid": "74281007"}},
+                            {"method": "details", "params": {"sctid": "absent"}},
+                            {"method": "parents", "params": {"sctid": "404684003"}}])["results"]
+
+    assert results[0]["result"]["sctid"] == "74281007"
+    assert results[1]["status"] == 404 and "error" in results[1]
+    assert len(results[2]["result"]) == len(sct.get_parents("404684003"))
+    assert client.request("POST", "/details", {"sctid": "74281007"})["result"] == \
+        results[0]["result"]
+
+
+def test_keep_alive_and_cache(server: SnomedServer, client: Client) -> None:
+    client.get("details", sctid="74281007")
+    sock = client.conn.sock
+    for _ in range(3):
+        client.get("details", sctid="74281007")
+
+    assert client.conn.sock is sock
+    health = client.get("health")
+    assert (health["hits"], health["misses"], health["cached"]) == (3, 1, 1)
+    assert health["concepts"] == 24
+
+
+def test_warm_up_lang(sct: SnomedGraph) -> None:
+    graph = SnomedGraph(sct.g, lang="es")
+    service = QueryService(graph)
+    service.warm_up()
+    built = set(graph._cache)
+
+    # La recherche lit la table construite d'avance, dans la langue du graphe
+    assert service.query("search", {"term": "myocarde", "lang": "es"})
+    assert "desc_es" in built and set(graph._cache) == built
+
+
+def test_cache_size(sct: SnomedGraph) -> None:
+    service = QueryService(sct, cache_size=2)
+    for sctid in ["74281007", "404684003", "129574000", "74281007"]:
+        service.query("details", {"sctid": sctid})
+
+    assert (service.hits, service.misses, len(service._cache)) == (0, 4, 2)
+    with pytest.raises(ValueError):
+        QueryService(sct, cache_size=-1)
+
+
+def test_concurrent_queries(server: SnomedServer, sct: SnomedGraph) -> None:
+    def query(sctid: str) -> list:
+        with Client(server.url) as client:
+            return [c["sctid"] for c in client.get("ancestors", sctid=sctid)["result"]]
+
+    sctids = ["129574000", "404684003", "311793000", "74281007"] * 10
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(query, sctids))
+    assert results == [[c.sctid for c in sct.get_ancestors(s)] for s in sctids]
+
+
+@pytest.mark.parametrize("batch_size", [1, 5])
+def test_load_test(server: SnomedServer, batch_size: int) -> None:
+    queries = sample_queries(server.url, 50)
+    report = load_test(server.url, queries, concurrency=4, requests=100, batch_size=batch_size)
+
+    assert {q["method"] for q in queries} >= {"details", "path", "search"}
+    assert (report["requests"], report["errors"]) == (100, 0)
+    assert report["calls"] == 100 // batch_size
@@ -0,0 +1,105 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from multiprocessing.shared_memory import SharedMemory
+from snomed_graphe.graphe import SnomedGraph
+from snomed_graphe.shared import SharedArrays, SharedGraphPool
+from typing import Generator
+
+SCTIDS = ["129574000", "404684003", "311793000", "138875005", "test"]
+
+
+@pytest.fixture(params=["networkx", "csr"])
+def pool(sct: SnomedGraph, request: pytest.FixtureRequest
+         ) -> Generator[SharedGraphPool, None, None]:
+    graph = SnomedGraph(sct.g, backend=request.param)
+    with SharedGraphPool(graph, processes=2, chunk_size=2) as pool:
+        yield pool
+
+
+def test_traversals(pool: SharedGraphPool, sct: SnomedGraph) -> None:
+    assert [sorted(a) for a in pool.ancestors(SCTIDS)] == \
+        [sorted(c.sctid for c in sct.get_ancestors(s)) for s in SCTIDS]
+    assert [sorted(d) for d in pool.descendants(SCTIDS)] == \
+        [sorted(c.sctid for c in sct.get_descendants(s)) for s in SCTIDS]
+    assert [sorted(d) for d in pool.descendants(SCTIDS, degree=1)] == \
+        [sorted(c.sctid for c in sct.get_children(s)) for s in SCTIDS]
+    assert pool.ancestors([]) == []
+
+
+@pytest.mark.parametrize("backend", ["networkx", "csr"])
+def test_traversals_attribute_edges(sct_attr: nx.DiGraph, backend: str) -> None:
+    graph = SnomedGraph(sct_attr, root="1", backend=backend)
+    sctids = ["1", "2", "5", "6"]
+    with SharedGraphPool(graph, processes=1) as pool:
+        for degree in [None, 1, 2]:
+            kwargs = {} if degree is None else {"degree": degree}
+            assert [sorted(d) for d in pool.descendants(sctids, degree)] == \
+                [sorted(c.sctid for c in graph.get_descendants(s, **kwargs)) for s in sctids]
+            assert [sorted(a) for a in pool.ancestors(sctids, degree)] == \
+                [sorted(c.sctid for c in graph.get_ancestors(s, **kwargs)) for s in sctids]
+
+
+def test_paths(pool: SharedGraphPool, sct: SnomedGraph) -> None:
+    pairs = [("test", "138875005"), ("311793000", "138875005")]
+    assert pool.paths(pairs, hierarchical=True) == \
+        [[c.sctid for c in sct.hierarchical_path(s, t)] for s, t in pairs]
+
+    path, = pool.paths([("1163440003", "362981000")])
+    assert len(path) == len(sct.path("1163440003", "362981000"))
+    assert all(sct.undir.has_edge(a, b) for a, b in zip(path, path[1:]))
+
+
+def test_no_path(sct: SnomedGraph) -> None:
+    with SharedGraphPool(sct.subgraph("129574000", down=False), processes=1) as pool:
+        assert pool.paths([("129574000", "74281007"), ("129574000", "129574000")], True) == \
+            [None, ["129574000"]]
+
+
+@pytest.mark.parametrize("options", [{}, {"accept": "PREF"}, {"accept": "ACCEPT"},
+                                     {"case_term": True}, {"regex_term": True},
+                                     {"regex_term": True, "case_term": True}])
+def test_search(pool: SharedGraphPool, sct: SnomedGraph, options: dict) -> None:
+    terms = ["myocard", "INFARCTUS", "^inf", "du", "absent"]
+    assert pool.search(terms, **options) == [sct.search_in_desc(t, **options) for t in terms]
+
+
+def test_errors(pool: SharedGraphPool) -> None:
+    with pytest.raises(KeyError):
+        pool.ancestors(["129574000", "absent"])
+    with pytest.raises(ValueError):
+        pool.search(["infarctus"], accept="SYN")
+
+
+def test_close(sct: SnomedGraph) -> None:
+    pool = SharedGraphPool(sct, processes=1)
+    names = [spec[0] for spec in pool.arrays.specs.values()]
+    pool.close()
+    pool.close()
+
+    with pytest.raises(ValueError):
+        pool.ancestors(["129574000"])
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(names[0])
+
+
+def test_modified_terms(sct: SnomedGraph) -> None:
+    graph = SnomedGraph(sct.g.copy(), backend="csr")
+    graph.backend.node("74281007")["pt_lang"] = "Myocarde modifié"
+    graph.clear_cache()
+
+    with SharedGraphPool(graph, processes=1) as pool:
+        assert pool.search(["modifié"]) == [graph.search_in_desc("modifié")] == [["74281007"]]
+
+
+def test_shared_arrays() -> None:
+    arrays = SharedArrays({"a": np.arange(5), "empty": np.empty(0, dtype=np.int32)})
+    attached, segments = SharedArrays.attach(arrays.specs)
+
+    assert attached["a"].tolist() == [0, 1, 2, 3, 4] and attached["empty"].dtype == np.int32
+    del attached
+    for shm in segments:
+        shm.close()
+    arrays.close()
+    assert arrays.segments == []
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from snomed_graphe.graphe import SnomedGraph
+from snomed_graphe.terms import NodeTerms, TermStore, TermTable, term_rows
+
+
+def test_term_store() -> None:
+    store, ids = TermStore.from_terms(["cœur", "myocarde", "cœur"])
+
+    assert len(store) == 2
+    assert list(ids) == [0, 1, 0]
+    assert [store[i] for i in ids] == ["cœur", "myocarde", "cœur"]
+    assert store.buffer == "cœurmyocarde".encode()
+
+
+def test_term_table() -> None:
+    nodes = [{"fsn": "Heart (body structure)", "syn_en": ["Cor", "Heart"], "pt_en": np.nan},
+             {"fsn": "Heart (body structure)", "syn_en": [], "rank": 2}]
+    table = TermTable.from_nodes(nodes)
+    first, second = NodeTerms(table, 0), NodeTerms(table, 1)
+
+    assert len(table.store) == 3
+    assert first["syn_en"] == ["Cor", "Heart"]
+    assert np.isnan(first["pt_en"])
+    assert sorted(first) == ["fsn", "pt_en", "syn_en"]
+    assert dict(second) == nodes[1]
+    assert "pt_lang" not in first
+
+    second["fsn"] = "Cor (body structure)"
+    del first["syn_en"]
+    assert second["fsn"] == "Cor (body structure)"
+    assert first["fsn"] == "Heart (body structure)"
+    assert "syn_en" not in first
+    with pytest.raises(KeyError):
+        first["syn_en"]
+
+
+def test_term_rows() -> None:
+    nodes = [{"syn_en": ["Cor", "Heart"]}, {"syn_en": "Heart"}, {"syn_en": 2}, {}]
+    table = TermTable.from_nodes(nodes, columns=["syn_en"])
+    single, listed = term_rows(table.kinds, 0)
+
+    assert (list(single), list(listed)) == ([1], [0])
+    assert table.store[table.codes[1, 0]] == "Heart"
+    ptr = table.list_ptr[table.codes[0, 0]:table.codes[0, 0] + 2]
+    assert [table.store[i] for i in table.list_ids[ptr[0]:ptr[1]]] == ["Cor", "Heart"]
+
+
+def test_compact_terms(sct: SnomedGraph) -> None:
+    nodes, edges = sct.graph_to_pandas()
+    details = sct.get_concept_details("129574000")
+    found = sct.search_in_desc("myocarde")
+
+    table = sct.compact_terms()
+    assert len(table) == len(sct)
+    assert isinstance(sct.g.nodes["129574000"], NodeTerms)
+
+    pd.testing.assert_frame_equal(sct.graph_to_pandas()[0], nodes)
+    c = sct.get_concept_details("129574000")
+    assert (c.fsn, c.pt_lang, c.syn_en) == (details.fsn, details.pt_lang, details.syn_en)
+    sct.clear_cache()
+    assert sct.search_in_desc("myocarde") == found
+    assert isinstance(sct.subgraph("129574000").g.nodes["129574000"], dict)
@@ -0,0 +1,67 @@
+import pytest
+
+from pathlib import Path
+from snomed_graphe.graphe import SnomedGraph
+
+
+def test_walks_count(sct: SnomedGraph) -> None:
+    walks = list(sct.random_walker(walk_length=5, walks_per_node=3, seed=0).walks())
+
+    assert len(walks) == 3 * len(sct)
+    assert all(1 <= len(w) <= 5 for w in walks)
+
+
+def test_walks_follow_edges(sct: SnomedGraph) -> None:
+    walker = sct.random_walker(walk_length=10, walks_per_node=2, p=0.5, q=2, seed=0)
+
+    for walk in walker.walks():
+        assert all(sct.undir.has_edge(a, b) for a, b in zip(walk, walk[1:]))
+
+
+def test_walks_is_a_up(sct: SnomedGraph) -> None:
+    walker = sct.random_walker(walk_length=10, walks_per_node=1, attributes=["116680003"],
+                               direction="out", seed=0)
+    walk = next(walker.walks(["129574000"]))
+
+    assert walk == ["129574000", "404684003", "138875005"]
+
+
+def test_walks_reproducible(sct: SnomedGraph) -> None:
+    walker = sct.random_walker(walk_length=6, walks_per_node=2, q=0.5, seed=1)
+    inline = list(walker.walks(chunk_size=7))
+    parallel = list(walker.walks(processes=2, chunk_size=7))
+
+    assert inline == parallel
+
+
+def test_walks_save(tmp_path: Path, sct: SnomedGraph) -> None:
+    walker = sct.random_walker(walk_length=4, walks_per_node=1, seed=0)
+    walker.save(tmp_path / "walks.txt")
+
+    with open(tmp_path / "walks.txt", encoding="UTF-8") as f:
+        lines = [line.split() for line in f]
+
+    assert lines == list(walker.walks())
+
+
+def test_walks_error(sct: SnomedGraph) -> None:
+    with pytest.raises(ValueError):
+        sct.random_walker(p=0)
+
+
+def test_walks_interleaved(sct: SnomedGraph) -> None:
+    small = sct.subgraph("362981000")
+    walkers = [g.random_walker(walk_length=6, walks_per_node=2, q=0.5, seed=0)
+               for g in (sct, small)]
+    expected = [list(w.walks(chunk_size=3)) for w in walkers]
+
+    # Deux marcheurs parcourus en même temps, dont le second est abandonné en cours de route
+    first, second = (w.walks(chunk_size=3) for w in walkers)
+    walks = [[], [next(second)]]
+    for walk in first:
+        walks[0].append(walk)
+        if len(walks[1]) < 4:
+            walks[1].append(next(second))
+
+    assert walks[0] == expected[0]
+    assert walks[1] == expected[1][:4]